@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Event table benchmark for Yolo Terminal game.
+
+Times one day of event rolls with the original per-event loop (each event
+tried in order with ``randint(0, N) % freq == 0``), the compiled tables
+and the batched tables. The tables' firing probabilities are checked
+against the original loop in tests/test_events.py.
+
+Usage:
+    python benchmarks/bench_events.py --iterations 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.events import EventManager
+
+def legacy_pick(rng: random.Random, events, draw_range: int, eligible=None):
+    """Pick an event like the original handlers: roll each event in order."""
+    for index, event in enumerate(events):
+        if rng.randint(0, draw_range - 1) % event["freq"] == 0:
+            if eligible is not None and not eligible[index]:
+                continue
+            return index
+    return None
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    manager = EventManager(random.Random(args.seed))
+
+    # One day of market, health and money rolls
+    rng = random.Random(args.seed)
+    eligible = (True,) * len(manager.market_events)
+    iterations = args.iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        legacy_pick(rng, manager.market_events, manager.market_table.draw_range, eligible)
+        legacy_pick(rng, manager.health_events, manager.health_table.draw_range)
+        legacy_pick(rng, manager.money_events, manager.money_table.draw_range)
+    legacy_time = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        manager.market_table.pick(rng.random(), eligible)
+        manager.health_table.pick(rng.random())
+        manager.money_table.pick(rng.random())
+    table_time = (time.perf_counter() - start) / iterations
+
+    np_rng = np.random.default_rng(args.seed)
+    available = np.ones((iterations, 8), dtype=bool)
+    start = time.perf_counter()
+    manager.roll_batch(np_rng, iterations, available)
+    batch_time = (time.perf_counter() - start) / iterations
+
+    print(f"Original loop:   {legacy_time * 1e6:6.2f} us/game-day")
+    print(f"Compiled tables: {table_time * 1e6:6.2f} us/game-day ({legacy_time / table_time:.1f}x)")
+    print(f"Batched tables:  {batch_time * 1e6:6.2f} us/game-day ({legacy_time / batch_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
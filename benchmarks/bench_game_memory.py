@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Game memory benchmark for Yolo Terminal game.
+
+Creates games through create_new_game, as POST /api/new_game does, into
+an in-memory store, and measures:
+  * the memory allocated per game (tracemalloc), in total and by the
+    source file that allocated it;
+  * the size per game estimated by the store's eviction policy;
+  * the time to create a game (without tracemalloc).
+
+Usage:
+    python benchmarks/bench_game_memory.py --games 2000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import server.game_state as game_state_module
+from server.eviction import estimate_size
+from server.game_state import create_new_game
+from server.store import MemoryGameStore
+
+def fresh_store() -> MemoryGameStore:
+    """Use an empty in-memory store that never evicts."""
+    store = MemoryGameStore(idle_ttl=None, finished_ttl=None)
+    game_state_module.game_store = store
+    return store
+
+def measure_memory(num_games: int) -> None:
+    """Trace the allocations of num_games new games."""
+    fresh_store()
+    # Warm up: imports, caches and the shared catalogs are allocated once
+    create_new_game("Warmup", seed=0)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    games = [create_new_game(f"P{i}", seed=i) for i in range(num_games)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    total = sum(stat.size_diff for stat in stats)
+    print(f"Allocated per game: {total / num_games:8.0f} bytes")
+    for stat in sorted(stats, key=lambda stat: stat.size_diff, reverse=True)[:8]:
+        filename = stat.traceback[0].filename
+        if filename.startswith(ROOT):
+            filename = os.path.relpath(filename, ROOT)
+        print(f"  {stat.size_diff / num_games:8.0f} bytes  {filename}")
+
+    sizes = [estimate_size(game) for game in games[:100]]
+    print(f"Estimated size per game (eviction): {sum(sizes) / len(sizes):8.0f} bytes")
+
+def measure_time(num_games: int) -> None:
+    """Time the creation of num_games new games."""
+    fresh_store()
+    create_new_game("Warmup", seed=0)
+    start = time.perf_counter()
+    for i in range(num_games):
+        create_new_game(f"P{i}", seed=i)
+    elapsed = time.perf_counter() - start
+    print(f"Game creation: {elapsed / num_games * 1e6:8.1f} us per game")
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=2000)
+    args = parser.parse_args()
+
+    # Game logs are written under the working directory
+    workdir = tempfile.mkdtemp(prefix="yolo_memory_")
+    os.chdir(workdir)
+    try:
+        measure_memory(args.games)
+        measure_time(args.games)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Game ID and token benchmark for Yolo Terminal game.
+
+Allocates game IDs from several threads of several nodes (worker
+processes) at once and checks that no ID repeats, then times ID and
+token allocation and a token lookup. For comparison, counts how many of
+the same number of games would have collided with the original random
+5-digit IDs.
+
+Usage:
+    python benchmarks/bench_ids.py --games 1000000 --threads 8 --nodes 4
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.ids import GameIdAllocator, key_matches, new_token, split_key
+
+def allocate_concurrently(num_ids: int, threads: int, nodes: int) -> list:
+    """Allocate num_ids IDs from threads sharing one allocator per node."""
+    allocators = [GameIdAllocator(node) for node in range(nodes)]
+    results = [[] for _ in range(threads * nodes)]
+
+    def worker(allocator, out):
+        for _ in range(num_ids // (threads * nodes)):
+            out.append(allocator.next_id())
+
+    workers = [threading.Thread(target=worker, args=(allocators[i % nodes], results[i]))
+               for i in range(threads * nodes)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return [game_id for ids in results for game_id in ids]
+
+def legacy_collisions(num_games: int, seed: int) -> int:
+    """Count the games whose random 5-digit ID was already taken."""
+    rng = random.Random(seed)
+    taken = set()
+    collisions = 0
+    for _ in range(num_games):
+        game_id = rng.randint(10000, 99999)
+        collisions += game_id in taken
+        taken.add(game_id)
+    return collisions
+
+def main():
+    """Run the checks and the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=1000000)
+    parser.add_argument("--threads", type=int, default=8, help="Threads per node")
+    parser.add_argument("--nodes", type=int, default=4)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ids = allocate_concurrently(args.games, args.threads, args.nodes)
+    elapsed = time.perf_counter() - start
+    duplicates = len(ids) - len(set(ids))
+    print(f"Allocated {len(ids)} IDs from {args.nodes} nodes x {args.threads} threads in {elapsed:.2f}s, "
+          f"{duplicates} duplicates, largest ID {max(ids).bit_length()} bits")
+    if duplicates:
+        raise SystemExit("Game IDs collided")
+
+    for games in (1000, 10000, 100000):
+        if games <= args.games:
+            print(f"Random 5-digit IDs: {legacy_collisions(games, 1)} of {games} games overwrote another game")
+
+    allocator = GameIdAllocator()
+    iterations = 200000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        allocator.next_id()
+    id_time = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    tokens = [new_token(str(game_id)) for game_id in ids[:iterations]]
+    token_time = (time.perf_counter() - start) / iterations
+
+    letters_and_digits = string.ascii_letters + string.digits
+    start = time.perf_counter()
+    for _ in range(iterations):
+        ''.join(random.choice(letters_and_digits) for i in range(10))
+    legacy_token_time = (time.perf_counter() - start) / iterations
+
+    games = {str(game_id): token for game_id, token in zip(ids[:iterations], tokens)}
+    start = time.perf_counter()
+    for token in tokens:
+        game_id, _ = split_key(token)
+        key_matches(token, games[game_id])
+    lookup_time = (time.perf_counter() - start) / iterations
+
+    print(f"Game ID:        {id_time * 1e6:.2f} us")
+    print(f"Token (CSPRNG): {token_time * 1e6:.2f} us (original random.choice token: {legacy_token_time * 1e6:.2f} us)")
+    print(f"Token lookup:   {lookup_time * 1e6:.2f} us")
+
+if __name__ == "__main__":
+    main()
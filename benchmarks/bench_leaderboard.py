@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Leaderboard benchmark for Yolo Terminal game.
+
+Adds final scores to the leaderboard, then times adding a score, serving
+the first and a deep page of /api/high_scores and finding the rank of a
+score as the number of finished games grows. For comparison, times the
+original endpoint, which gathered and sorted the scores of every stored
+game on each request, and the linear scan of HighScores.get_rank over
+the same scores. Pages and ranks are checked against a full sort.
+
+Usage:
+    python benchmarks/bench_leaderboard.py --games 100 10000 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.leaderboard import Leaderboard
+
+def random_entry(rng: random.Random) -> dict:
+    """A plausible final score."""
+    return {"name": f"P{rng.randrange(100000)}", "score": int(rng.gauss(0, 200000)),
+            "health": rng.randrange(101), "fame": rng.randrange(101)}
+
+def time_per_call(function, iterations: int) -> float:
+    """Average time of a call, in seconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations
+
+def linear_rank(scores: list, score: int) -> int:
+    """Rank of a score by scanning the sorted scores, as HighScores.get_rank did."""
+    for i, entry in enumerate(scores):
+        if score >= entry["score"]:
+            return i + 1
+    return len(scores) + 1
+
+def run(num_games: int, seed: int) -> None:
+    """Fill a leaderboard with num_games scores and time it."""
+    rng = random.Random(seed)
+    entries = [random_entry(rng) for _ in range(num_games)]
+
+    leaderboard = Leaderboard()
+    start = time.perf_counter()
+    for entry in entries:
+        leaderboard.add_score(entry["name"], entry["score"], entry["health"], entry["fame"])
+    add_time = (time.perf_counter() - start) / num_games
+
+    # Pages and ranks must match a full sort
+    expected = sorted(entries, key=lambda entry: entry["score"], reverse=True)
+    middle = num_games // 2
+    for offset in (0, middle):
+        if [entry["score"] for entry in leaderboard.get_scores(offset=offset, limit=10)] != \
+                [entry["score"] for entry in expected[offset:offset + 10]]:
+            raise SystemExit("Leaderboard page differs from a full sort")
+    probes = [rng.choice(entries)["score"] + rng.randrange(-5, 6) for _ in range(100)]
+    if any(leaderboard.rank_of(score) != linear_rank(expected, score) for score in probes):
+        raise SystemExit("Leaderboard rank differs from a full sort")
+
+    first_page_time = time_per_call(leaderboard.response_bytes, 10000)
+    deep_page_time = time_per_call(lambda: leaderboard.get_scores(offset=middle, limit=10), 10000)
+    rank_time = time_per_call(lambda: leaderboard.rank_of(probes[0]), 10000)
+    # Original endpoint: gather, sort and encode every score per request
+    iterations = max(1, min(1000, 1000000 // num_games))
+    legacy_time = time_per_call(
+        lambda: json.dumps(sorted(entries, key=lambda x: x["score"], reverse=True)[:10]), iterations)
+    legacy_rank_time = time_per_call(lambda: linear_rank(expected, expected[middle]["score"]), iterations)
+
+    print(f"{num_games:>8} games: add {add_time * 1e6:5.2f} us, first page {first_page_time * 1e6:5.2f} us "
+          f"(original endpoint {legacy_time * 1e3:8.3f} ms), page at {middle} {deep_page_time * 1e6:5.2f} us, "
+          f"rank {rank_time * 1e6:5.2f} us (linear scan {legacy_rank_time * 1e3:8.3f} ms)")
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, nargs="+", default=[100, 10000, 1000000])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    for num_games in args.games:
+        run(num_games, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GameLogger soak benchmark for Yolo Terminal game.
+
+Creates many games in one process, each logging a short game's worth of
+events, and reports the per-event cost and the number of open file
+descriptors as the number of games grows. Both should stay flat.
+
+Usage:
+    python benchmarks/bench_logger.py --games 10000 --events 20
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.logger import GameLogger
+from game.player import Player
+
+def open_fds() -> int:
+    """Count open file descriptors of this process (Linux only, -1 elsewhere)."""
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return -1
+
+def main():
+    """Run the soak benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--events", type=int, default=20, help="Events logged per game")
+    parser.add_argument("--report-every", type=int, default=1000)
+    args = parser.parse_args()
+
+    # GameLogger writes to ./logs, keep the benchmark's files out of the repo
+    os.chdir(tempfile.mkdtemp(prefix="yolo_logger_bench_"))
+
+    player = Player(name="soak")
+    window_time = 0.0
+    window_events = 0
+    print(f"{'games':>8}  {'us/event':>9}  {'open fds':>8}")
+    for game in range(1, args.games + 1):
+        start = time.perf_counter()
+        logger = GameLogger(f"soak{game}")
+        for i in range(args.events):
+            logger.log_bank_transaction(player, "DEPOSIT", i)
+        window_time += time.perf_counter() - start
+        window_events += args.events + 1
+
+        # Finished games release their files, live games stay in the LRU pool
+        if game % 2 == 0:
+            logger.writer.close_file(logger.log_file)
+
+        if game % args.report_every == 0:
+            print(f"{game:8d}  {window_time / window_events * 1e6:9.2f}  {open_fds():8d}")
+            window_time = 0.0
+            window_events = 0
+
+    logger.writer.flush()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recovery benchmark for Yolo Terminal game.
+
+Fills a journal:// game store with live games through the game state
+functions used by the routes (new game, a few days of trades and bank
+actions), then measures:
+  * write throughput of the store (changes/sec, with fsync batching);
+  * the size of the log before and after compaction;
+  * startup time: reopening the store and restoring every game;
+  * first access latency of a restored game (deserialization and replay
+    of the actions logged after its snapshot);
+  * the time to bring every restored game into memory (--full-restore).
+
+Usage:
+    python benchmarks/bench_recovery.py --games 10000 100000 --days 5
+"""
+
+import argparse
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server.game_state as game_state_module
+from game.engine import GameError
+from server.game_state import create_new_game, get_game_engine, save_game_state
+from server.store import JournaledGameStore
+
+# No compaction while the benchmark writes, it is measured separately
+NEVER = 1 << 62
+
+def play(game_state, days: int) -> int:
+    """Play a few days of a game like a web client; returns the number of saved changes."""
+    engine = get_game_engine(game_state)
+    changes = 0
+    for day in range(days):
+        for stock_id, _, _, _ in engine.stock_manager.get_available_stocks()[:2]:
+            try:
+                engine.buy(stock_id, 2)
+            except GameError:
+                continue
+            save_game_state(game_state)
+            changes += 1
+        for stock_id in list(engine.player.portfolio)[:1]:
+            try:
+                engine.sell(stock_id, 1)
+            except GameError:
+                continue
+            save_game_state(game_state)
+            changes += 1
+        if engine.player.cash > 10:
+            engine.deposit(10)
+            save_game_state(game_state)
+            changes += 1
+        engine.advance_day()
+        save_game_state(game_state)
+        changes += 1
+    return changes
+
+def fill(directory: str, num_games: int, days: int, chunk: int) -> None:
+    """Write num_games played games to a store."""
+    changes = 0
+    elapsed = 0.0
+    for first in range(0, num_games, chunk):
+        # Reopen the store for every chunk, so that the games of earlier
+        # chunks stay serialized and memory stays bounded
+        store = JournaledGameStore(directory, compact_min_bytes=NEVER)
+        game_state_module.game_store = store
+        start = time.perf_counter()
+        for i in range(first, min(first + chunk, num_games)):
+            game_state = create_new_game(f"P{i % 1000}", seed=i)
+            changes += 1 + play(game_state, days)
+        store.flush()
+        elapsed += time.perf_counter() - start
+        store.close()
+        game_state_module.game_store = None
+
+    log_size = os.path.getsize(os.path.join(directory, JournaledGameStore.LOG_FILE))
+    print(f"{num_games} games, {changes} changes in {elapsed:.1f}s ({changes / elapsed:.0f} changes/s), "
+          f"log {log_size / 1e6:.1f} MB")
+
+def measure_recovery(directory: str, label: str, samples: int, full_restore: bool) -> JournaledGameStore:
+    """Reopen a store and time its recovery."""
+    start = time.perf_counter()
+    store = JournaledGameStore(directory, compact_min_bytes=NEVER)
+    elapsed = time.perf_counter() - start
+    print(f"  {label}: startup {elapsed:.2f}s for {store.recovered} games")
+
+    # First access of random games
+    game_ids = random.Random(1).sample(sorted(store._dormant), min(samples, store.recovered))
+    start = time.perf_counter()
+    for game_id in game_ids:
+        store.get(game_id)
+    if game_ids:
+        print(f"    first access: {(time.perf_counter() - start) / len(game_ids) * 1e6:.0f} us/game "
+              f"({len(game_ids)} games)")
+
+    if full_restore:
+        start = time.perf_counter()
+        restored = sum(1 for _ in store.values())
+        elapsed = time.perf_counter() - start
+        print(f"    full restore: {restored} games in {elapsed:.2f}s ({restored / elapsed:.0f} games/s)")
+    return store
+
+def run(num_games: int, days: int, directory: str, chunk: int, samples: int, full_restore: bool) -> None:
+    """Fill a store with live games, then time its recovery before and after compaction."""
+    fill(directory, num_games, days, chunk)
+    log_path = os.path.join(directory, JournaledGameStore.LOG_FILE)
+
+    store = measure_recovery(directory, "recovery", samples, False)
+    start = time.perf_counter()
+    store.compact()
+    print(f"  compaction: {time.perf_counter() - start:.2f}s, log {os.path.getsize(log_path) / 1e6:.1f} MB")
+    store.close()
+    del store
+
+    store = measure_recovery(directory, "recovery after compaction", samples, full_restore)
+    store.close()
+    del store
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--days", type=int, default=5, help="Days played by each game")
+    parser.add_argument("--chunk", type=int, default=5000, help="Games written per store session")
+    parser.add_argument("--samples", type=int, default=1000, help="Games accessed to time the first access")
+    parser.add_argument("--full-restore", action="store_true",
+                        help="Also bring every game into memory (about 100 KB per game)")
+    args = parser.parse_args()
+
+    # Game logs are written to the working directory
+    workdir = tempfile.mkdtemp(prefix="yolo_recovery_")
+    os.chdir(workdir)
+    try:
+        for num_games in args.games:
+            directory = os.path.join(workdir, f"store_{num_games}")
+            run(num_games, args.days, directory, args.chunk, args.samples, args.full_restore)
+            shutil.rmtree(directory)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"Peak memory: {peak:.0f} MB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON serialization microbenchmark for Yolo Terminal game.
+
+Encodes the game state response of a game in its last days, once with
+Flask's jsonify (the previous path) and once with the fragment serializer,
+checks that both produce the same document and reports the time per
+response of each.
+
+Usage:
+    python benchmarks/bench_serializer.py --days 35 --iterations 5000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def main():
+    """Run the serializer benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=35, help="Days played before encoding")
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    # GameLogger writes to ./logs, keep the benchmark's files out of the repo
+    os.chdir(tempfile.mkdtemp(prefix="yolo_bench_"))
+
+    from flask import jsonify
+    from server.app import create_app
+    from server.game_state import create_new_game, get_game_state_response
+    from server.serializer import JSON_BACKEND, encode_game_state_response
+
+    app = create_app()
+    game_state = create_new_game("Bench")
+    player = game_state['player']
+    stock_manager = game_state['stock_manager']
+    logger = game_state['logger']
+    for _ in range(args.days):
+        player.days_left -= 1
+        stock_manager.update_prices()
+        logger.log_player_status(player, stock_manager)
+
+    with app.app_context():
+        baseline = jsonify(get_game_state_response(game_state)).get_data()
+        fast = encode_game_state_response(get_game_state_response(game_state), game_state)
+        expected, actual = json.loads(baseline), json.loads(fast)
+        expected.pop('version'), actual.pop('version')
+        expected.pop('headline'), actual.pop('headline')
+        if expected != actual:
+            raise SystemExit("Serializer output differs from jsonify output")
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            jsonify(get_game_state_response(game_state)).get_data()
+        jsonify_time = (time.perf_counter() - start) / args.iterations
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            encode_game_state_response(get_game_state_response(game_state), game_state)
+        fast_time = (time.perf_counter() - start) / args.iterations
+
+    print(f"Payload: {len(fast)} bytes, {args.days} days of history, backend: {JSON_BACKEND}")
+    print(f"jsonify:    {jsonify_time * 1e6:8.1f} us/response")
+    print(f"serializer: {fast_time * 1e6:8.1f} us/response ({jsonify_time / fast_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
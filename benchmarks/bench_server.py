@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Server throughput benchmark for Yolo Terminal game.
+
+Starts the multi-process server with an increasing number of workers and
+measures requests/sec for a mix of /next_day and /buy requests issued by
+several client processes.
+
+Usage:
+    python benchmarks/bench_server.py --workers 1 2 4 --clients 8 --duration 10
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def free_port() -> int:
+    """Get a free TCP port on localhost."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def post(port: int, path: str, payload: dict = None) -> dict:
+    """Send a POST request and return the decoded JSON response."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.request("POST", path, body=json.dumps(payload or {}), headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return json.loads(data) if response.status == 200 else {}
+
+def client(port: int, duration: float, result_queue) -> None:
+    """Play games with a next_day + buy request mix until the duration is over."""
+    requests = 0
+    deadline = time.perf_counter() + duration
+    token = None
+    while time.perf_counter() < deadline:
+        if token is None:
+            token = post(port, "/api/new_game", {"player_name": "bench"})["token"]
+            requests += 1
+        state = post(port, f"/api/game/{token}/next_day")
+        requests += 1
+        if not state or state.get("game_over") or state["player"]["days_left"] <= 1:
+            token = None
+            continue
+        for stock in state["available_stocks"][:1]:
+            post(port, f"/api/game/{token}/buy", {"stock_id": stock["id"], "amount": 1})
+            requests += 1
+    result_queue.put(requests)
+
+def wait_until_ready(port: int, timeout: float = 20.0) -> None:
+    """Wait until the server accepts connections."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("Server did not start")
+
+def run(workers: int, clients: int, duration: float) -> float:
+    """Run the benchmark against a server with the given number of workers."""
+    port = free_port()
+    workdir = tempfile.mkdtemp(prefix="yolo_bench_")
+    store = f"sqlite:///{os.path.join(workdir, 'games.db')}?batch_size=1"
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "new_server.py"), "--workers", str(workers),
+         "--host", "127.0.0.1", "--port", str(port), "--store", store],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_ready(port)
+        result_queue = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=client, args=(port, duration, result_queue)) for _ in range(clients)]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        total = sum(result_queue.get() for _ in processes)
+        elapsed = time.perf_counter() - start
+        for process in processes:
+            process.join()
+        return total / elapsed
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    """Parse options and print requests/sec per worker count."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()}, clients: {args.clients}, duration: {args.duration}s")
+    baseline = None
+    for workers in args.workers:
+        rate = run(workers, args.clients, args.duration)
+        baseline = baseline or rate
+        print(f"workers={workers:3d}  {rate:9.1f} req/s  ({rate / baseline:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,16 @@ from typing import Dict, List, Optional, Tuple, Any
 class Bank:
     """
     Bank class to handle banking operations.
+    
+    Interest rates are class constants, and every game uses the BANK instance.
     """
     
-    def __init__(self):
-        """Initialize the bank."""
-        self.deposit_interest_rate = 0.01  # 1% interest on deposits
-        self.debt_interest_rate = 0.10  # 10% interest on debt
+    deposit_interest_rate = 0.01  # 1% interest on deposits
+    debt_interest_rate = 0.10  # 10% interest on debt
+    
+    def __reduce_ex__(self, protocol):
+        """Pickle BANK by reference, so a restored game gets the shared bank back."""
+        return "BANK" if self is BANK else super().__reduce_ex__(protocol)
     
     def update_interest(self, player) -> None:
         """
@@ -30,15 +34,18 @@ class Bank:
         # Update debt interest
         player.debt += int(player.debt * self.debt_interest_rate)
     
-    def visit(self, player, ui, logger=None) -> None:
+    def visit(self, engine, ui) -> None:
         """
-        Handle player's visit to the bank.
+        Handle player's visit to the bank. The transactions are made by the engine.
         
         Args:
-            player: Player object
+            engine: GameEngine of the game
             ui: UI object for user interaction
-            logger: GameLogger object for logging (optional)
         """
+        # Imported here, the engine module imports this one
+        from game.engine import GameError
+        
+        player = engine.player
         ui.clear_screen()
         ui.show_message("Welcome to the Bank!")
         
@@ -57,22 +64,26 @@ class Bank:
             
             if choice == 0:
                 break
-            elif choice == 1:
-                self._deposit(player, ui, logger)
-            elif choice == 2:
-                self._withdraw(player, ui, logger)
-            elif choice == 3:
-                self._repay_debt(player, ui, logger)
+            
+            try:
+                if choice == 1:
+                    self._deposit(engine, ui)
+                elif choice == 2:
+                    self._withdraw(engine, ui)
+                elif choice == 3:
+                    self._repay_debt(engine, ui)
+            except GameError as e:
+                ui.show_message(str(e))
     
-    def _deposit(self, player, ui, logger=None) -> None:
+    def _deposit(self, engine, ui) -> None:
         """
         Handle player's deposit to the bank.
         
         Args:
-            player: Player object
+            engine: GameEngine of the game
             ui: UI object for user interaction
-            logger: GameLogger object for logging (optional)
         """
+        player = engine.player
         if player.cash <= 0:
             ui.show_message("You don't have any cash to deposit.")
             return
@@ -83,24 +94,19 @@ class Bank:
         if amount <= 0:
             return
         
-        player.cash -= amount
-        player.bank_savings += amount
-        
-        # Log the transaction if logger is provided
-        if logger:
-            logger.log_bank_transaction(player, "DEPOSIT", amount)
+        amount = engine.deposit(amount)
         
         ui.show_message(f"You deposited ${amount}. New balance: ${player.bank_savings}")
     
-    def _withdraw(self, player, ui, logger=None) -> None:
+    def _withdraw(self, engine, ui) -> None:
         """
         Handle player's withdrawal from the bank.
         
         Args:
-            player: Player object
+            engine: GameEngine of the game
             ui: UI object for user interaction
-            logger: GameLogger object for logging (optional)
         """
+        player = engine.player
         if player.bank_savings <= 0:
             ui.show_message("You don't have any savings to withdraw.")
             return
@@ -111,24 +117,19 @@ class Bank:
         if amount <= 0:
             return
         
-        player.bank_savings -= amount
-        player.cash += amount
-        
-        # Log the transaction if logger is provided
-        if logger:
-            logger.log_bank_transaction(player, "WITHDRAW", amount)
+        amount = engine.withdraw(amount)
         
         ui.show_message(f"You withdrew ${amount}. New balance: ${player.bank_savings}")
     
-    def _repay_debt(self, player, ui, logger=None) -> None:
+    def _repay_debt(self, engine, ui) -> None:
         """
         Handle player's debt repayment.
         
         Args:
-            player: Player object
+            engine: GameEngine of the game
             ui: UI object for user interaction
-            logger: GameLogger object for logging (optional)
         """
+        player = engine.player
         if player.debt <= 0:
             ui.show_message("You don't have any student loan debt to repay.")
             return
@@ -144,11 +145,10 @@ class Bank:
         if amount <= 0:
             return
         
-        player.cash -= amount
-        player.debt -= amount
-        
-        # Log the transaction if logger is provided
-        if logger:
-            logger.log_bank_transaction(player, "REPAY", amount)
+        amount = engine.repay(amount)
         
         ui.show_message(f"You repaid ${amount} of your student loan. Remaining debt: ${player.debt}")
+
+
+# Bank shared by all games
+BANK = Bank()
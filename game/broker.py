@@ -8,23 +8,28 @@ Handles debt management.
 import random
 from typing import Dict, List, Optional, Tuple, Any
 
+from game.engine import GameError
+
 class Broker:
     """
     Broker class to handle debt management.
+    
+    Stateless, so games share the BROKER instance.
     """
     
-    def __init__(self):
-        """Initialize the broker."""
-        pass
+    def __reduce_ex__(self, protocol):
+        """Pickle BROKER by reference."""
+        return "BROKER" if self is BROKER else super().__reduce_ex__(protocol)
     
-    def visit(self, player, ui) -> None:
+    def visit(self, engine, ui) -> None:
         """
-        Handle player's visit to the broker.
+        Handle player's visit to the broker. Repayments and rebates are made by the engine.
         
         Args:
-            player: Player object
+            engine: GameEngine of the game
             ui: UI object for user interaction
         """
+        player = engine.player
         ui.clear_screen()
         ui.show_message("Welcome to your Student Loan Broker!")
         
@@ -33,8 +38,12 @@ class Broker:
             if player.cash + player.bank_savings < 1000:
                 ui.show_message("The broker laughs: You're broke, but at least you're debt-free!")
             elif player.cash + player.bank_savings < 100000:
-                ui.show_message("The broker nods: 'Good job on paying off your loans. Here's a $1000 rebate.'")
-                player.cash += 1000
+                try:
+                    rebate = engine.collect_broker_rebate()
+                except GameError:
+                    ui.show_message("The broker nods: 'Good job on paying off your loans.'")
+                else:
+                    ui.show_message(f"The broker nods: 'Good job on paying off your loans. Here's a ${rebate} rebate.'")
             elif player.cash + player.bank_savings < 10000000:
                 ui.show_message("The broker whispers into the phone: 'We've got a high-value client here...'")
             else:
@@ -87,11 +96,18 @@ class Broker:
             return
         
         # Process repayment
-        player.cash -= amount
-        player.debt -= amount
+        try:
+            amount = engine.repay(amount)
+        except GameError as e:
+            ui.show_message(f"The broker smirks while looking at their Rolex: {e}")
+            return
         
         ui.show_message(f"You paid ${amount} toward your student loans. Remaining debt: ${player.debt}")
         
         # Special message if debt is fully repaid
         if player.debt <= 0:
             ui.show_message("Congratulations! You've paid off all your student loans!")
+
+
+# Broker shared by all games
+BROKER = Broker()
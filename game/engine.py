@@ -0,0 +1,748 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Engine module for Yolo Terminal game.
+Implements the game rules as a headless API, with no terminal or web
+dependencies. The terminal game, the web server and batch simulations all
+drive the same GameEngine.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from game.player import COST_BASIS_METHODS, Player
+from game.stocks import StockManager
+from game.events import EventManager
+from game.bank import BANK, Bank
+from game.rng import GameRNG
+
+# Starting cash and student loan, used for the profit estimate
+STARTING_CASH = 2000
+STARTING_DEBT = 5000
+
+# Tax rate applied to the profit estimate
+TAX_RATE = 0.45
+
+# Actions of the legs of an order batch (see GameEngine.place_orders)
+ORDER_ACTIONS = ("buy", "sell")
+
+class GameError(Exception):
+    """Raised when an action is not allowed by the game rules. The message is shown to the player."""
+    pass
+
+
+class NotFoundError(GameError):
+    """Raised when an action refers to a stock that is not in the market or not in the portfolio."""
+    pass
+
+
+class DayResult:
+    """
+    DayResult class describing what happened when a day was advanced.
+    """
+
+    def __init__(self, news_reports: List[str], net_worth: int, portfolio_value: int,
+                 game_result: Optional["GameResult"] = None):
+        """
+        Initialize the day result.
+
+        Args:
+            news_reports: News reports of the day
+            net_worth: Net worth (cash + bank savings - debt) at the start of the day
+            portfolio_value: Market value of the portfolio at the start of the day
+            game_result: Result of the game if it ended with this day
+        """
+        self.news_reports = news_reports
+        self.net_worth = net_worth
+        self.portfolio_value = portfolio_value
+        self.total_assets = net_worth + portfolio_value
+        self.profit = estimate_profit(self.total_assets)
+        self.tax = estimate_tax(self.profit)
+        self.game_result = game_result
+
+
+class GameResult:
+    """
+    GameResult class describing how a game ended.
+    """
+
+    def __init__(self, reason: str, final_score: int, portfolio_value: int,
+                 sales: List[Tuple[int, str, int, int, bool]]):
+        """
+        Initialize the game result.
+
+        Args:
+            reason: Reason for game end ("DAYS_OVER" or "HEALTH_ZERO")
+            final_score: Final score (cash + bank savings - debt)
+            portfolio_value: Value of the stocks left in the portfolio
+            sales: Stocks sold when the game ended, as
+                (stock_id, ticker, quantity, price, tradable) tuples
+        """
+        self.reason = reason
+        self.final_score = final_score
+        self.portfolio_value = portfolio_value
+        self.total_assets = final_score + portfolio_value
+        self.profit = estimate_profit(self.total_assets)
+        self.tax = estimate_tax(self.profit)
+        self.sales = sales
+
+
+def estimate_profit(total_assets: int) -> int:
+    """
+    Estimate the profit of the player (simplified).
+
+    Args:
+        total_assets: Net worth plus portfolio value
+
+    Returns:
+        int: Estimated profit
+    """
+    return total_assets - STARTING_CASH + STARTING_DEBT
+
+def estimate_tax(profit: int) -> int:
+    """
+    Estimate the tax on a profit (only if the profit is positive).
+
+    Args:
+        profit: Estimated profit
+
+    Returns:
+        int: Estimated tax
+    """
+    return round(max(0, profit * TAX_RATE))
+
+
+class GameRules:
+    """
+    GameRules class holding the prices and limits of the locations a
+    player visits (hospital, trading app, darkweb and broker).
+
+    The web game, simulations and journal replays play by WEB_RULES; the
+    terminal game keeps its own economy, TERMINAL_RULES.
+    """
+
+    def __init__(self, hospital_fee: int = 200, health_point_cost: int = 10000, copay_percentage: int = 100,
+                 partial_treatment: bool = False, upgrade_cost: int = 30000, upgrade_slots: int = 10,
+                 max_capacity: Optional[int] = None, upgrade_cost_scales: bool = False,
+                 max_darkweb_visits: int = 3, darkweb_fee: int = 0, darkweb_reward: Tuple[int, int] = (50, 200),
+                 darkweb_health_cost: Optional[Tuple[int, int]] = (5, 15), broker_rebate: int = 0):
+        """
+        Initialize the rules.
+
+        Args:
+            hospital_fee: Fixed fee of a hospital visit (copay or insurance premium)
+            health_point_cost: Cost per restored health point
+            copay_percentage: Share of the health point cost paid by the player
+            partial_treatment: Whether the player may restore fewer health points than 100
+            upgrade_cost: Cost of a trade book upgrade
+            upgrade_slots: Capacity added by an upgrade
+            max_capacity: Capacity beyond which no upgrade is sold (no limit if None)
+            upgrade_cost_scales: Whether players with more than twice the
+                upgrade cost in cash pay half their cash instead
+            max_darkweb_visits: Darkweb visits per day
+            darkweb_fee: Cash paid to enter the darkweb
+            darkweb_reward: Range of the cash reward of a darkweb visit
+            darkweb_health_cost: Range of the health lost on the darkweb (none if None)
+            broker_rebate: Cash the broker gives debt-free players of modest means on each visit
+        """
+        self.hospital_fee = hospital_fee
+        self.health_point_cost = health_point_cost
+        self.copay_percentage = copay_percentage
+        self.partial_treatment = partial_treatment
+        self.upgrade_cost = upgrade_cost
+        self.upgrade_slots = upgrade_slots
+        self.max_capacity = max_capacity
+        self.upgrade_cost_scales = upgrade_cost_scales
+        self.max_darkweb_visits = max_darkweb_visits
+        self.darkweb_fee = darkweb_fee
+        self.darkweb_reward = darkweb_reward
+        self.darkweb_health_cost = darkweb_health_cost
+        self.broker_rebate = broker_rebate
+
+
+# Rules of the web game: full treatments, flat upgrades, risky darkweb
+WEB_RULES = GameRules()
+
+# Rules of the terminal game: insured partial treatments, upgrades priced
+# by wealth, a paid darkweb entry with small rewards and a broker rebate
+TERMINAL_RULES = GameRules(hospital_fee=500, health_point_cost=3500, copay_percentage=20, partial_treatment=True,
+                           max_capacity=140, upgrade_cost_scales=True, darkweb_fee=15, darkweb_reward=(1, 10),
+                           darkweb_health_cost=None, broker_rebate=1000)
+
+
+class GameEngine:
+    """
+    GameEngine class applying the game rules to one game.
+
+    Actions validate their input and raise GameError when a rule forbids
+    them, without changing the game. Logging and high scores are optional,
+    so batch simulations can run without touching the disk.
+    """
+
+    def __init__(self, player: Optional[Player] = None, stock_manager: Optional[StockManager] = None,
+                 event_manager: Optional[EventManager] = None, bank: Optional[Bank] = None,
+                 logger=None, high_scores=None, rng: Optional[GameRNG] = None, journal=None,
+                 rules: Optional[GameRules] = None):
+        """
+        Initialize the engine. Missing components are created for a new game,
+        drawing from the game's random streams.
+
+        Args:
+            player: Player object
+            stock_manager: StockManager object
+            event_manager: EventManager object
+            bank: Bank object
+            logger: GameLogger object for logging (optional)
+            high_scores: HighScores or leaderboard recording final scores with add_score (optional)
+            rng: Random streams of the game (fresh ones are created if omitted)
+            journal: ActionJournal recording the actions for replay (optional)
+            rules: Prices and limits of the locations (WEB_RULES if omitted)
+        """
+        self.rng = rng if rng is not None else GameRNG()
+        self.player = player if player is not None else Player()
+        self.stock_manager = stock_manager if stock_manager is not None else StockManager(self.rng.prices)
+        self.event_manager = event_manager if event_manager is not None else EventManager(self.rng.events)
+        self.bank = bank if bank is not None else BANK
+        self.logger = logger
+        self.high_scores = high_scores
+        self.journal = journal
+        self.rules = rules if rules is not None else WEB_RULES
+        self.result: Optional[GameResult] = None
+
+        # Keep the portfolio valued at today's prices as prices and trades change it
+        self.stock_manager.track(self.player.portfolio)
+
+    @property
+    def day(self) -> int:
+        """Current day number."""
+        return self.player.day
+
+    def get_net_worth(self) -> int:
+        """Net worth of the player (cash + bank savings - debt)."""
+        return self.player.get_net_worth()
+
+    def get_portfolio_value(self) -> int:
+        """Market value of the player's portfolio (stocks not tradable today count as 0)."""
+        return self.player.portfolio.value
+
+    def get_total_assets(self) -> int:
+        """Net worth plus the market value of the portfolio."""
+        return self.player.get_net_worth() + self.player.portfolio.value
+
+    def game_over_reason(self) -> Optional[str]:
+        """
+        Check whether the game is over.
+
+        Returns:
+            str: "DAYS_OVER" or "HEALTH_ZERO" if the game is over, None otherwise
+        """
+        if self.player.days_left <= 0:
+            return "DAYS_OVER"
+        if self.player.health <= 0:
+            return "HEALTH_ZERO"
+        return None
+
+    def advance_day(self) -> DayResult:
+        """
+        Advance to the next day: roll prices and random events, apply
+        interest and end the game if it is over.
+
+        Returns:
+            DayResult: News reports and summary of the new day
+        """
+        player = self.player
+        stock_manager = self.stock_manager
+        logger = self.logger
+
+        player.days_left -= 1
+        self._record("N")
+        if logger:
+            logger.log_next_day(player, stock_manager)
+
+        # Update stock prices
+        stock_manager.update_prices()
+
+        # Handle random events
+        news_reports = self.event_manager.handle_events(player, stock_manager)
+        if logger:
+            for report in news_reports:
+                logger.log_random_event("Random Event", report, {})
+
+        # Add debt collector visit in the last 10 days if player has debt
+        if player.days_left <= 10 and player.debt > 0:
+            debt_collector_report = "A debt collector visits you, demanding payment. The stress affects your mental health. (-10 health)"
+            player.health = max(0, player.health - 10)
+            news_reports.append(debt_collector_report)
+            if logger:
+                logger.log_random_event("Debt Collector", debt_collector_report, {})
+
+        # Update bank interest and debt
+        self.bank.update_interest(player)
+
+        result = DayResult(news_reports, self.get_net_worth(), self.get_portfolio_value())
+
+        # Log player status after next day
+        if logger:
+            logger.log_player_status(player, stock_manager)
+
+        reason = self.game_over_reason()
+        if reason:
+            result.game_result = self.end_game(reason)
+        return result
+
+    def end_game(self, reason: str) -> GameResult:
+        """
+        End the game. When the days are over, the remaining stocks are sold
+        and the score is recorded. Calling it again on the same engine
+        returns the same result; engines built again for a stored game (as
+        the web server does on every request) do not know the game ended,
+        so the caller must not end it twice.
+
+        Args:
+            reason: Reason for game end ("DAYS_OVER" or "HEALTH_ZERO")
+
+        Returns:
+            GameResult: Final score and stocks sold
+        """
+        if self.result is not None:
+            return self.result
+        self._record("E", reason)
+
+        player = self.player
+        sales = []
+        if reason == "DAYS_OVER":
+            sales = self.sell_all()
+
+        final_score = player.get_net_worth()
+        self.result = GameResult(reason, final_score, self.get_portfolio_value(), sales)
+
+        if reason == "DAYS_OVER" and self.high_scores is not None:
+            self.high_scores.add_score(player.name, final_score, player.health, player.fame)
+        if self.logger:
+            if self.journal is not None:
+                self.logger.save_journal(self.journal)
+            self.logger.log_game_end(player, reason, final_score, self.stock_manager)
+        return self.result
+
+    def max_buy(self, stock_id: int) -> int:
+        """
+        Get the maximum number of shares of a stock the player can buy.
+
+        Args:
+            stock_id: ID of the stock
+
+        Returns:
+            int: Maximum number of shares (0 if the stock is not tradable)
+        """
+        quote = self.stock_manager.get_quote(stock_id)
+        if quote is None:
+            return 0
+        space = self.player.portfolio_capacity - self.player.portfolio_used
+        price = quote[2]
+        if price <= 0:
+            return max(0, space)
+        return max(0, min(self.player.cash // price, space))
+
+    def buy(self, stock_id: int, amount: int) -> Tuple[str, int, int]:
+        """
+        Buy shares of a stock at today's price. The amount is capped at the
+        maximum the player can afford and hold.
+
+        Args:
+            stock_id: ID of the stock
+            amount: Number of shares to buy
+
+        Returns:
+            Tuple (ticker, quantity bought, total cost)
+        """
+        quote = self.stock_manager.get_quote(stock_id)
+        if quote is None:
+            raise NotFoundError("Stock not found")
+        if amount < 1:
+            raise GameError("Please enter a positive number of shares.")
+
+        ticker, name, price = quote
+        player = self.player
+
+        # Check if player has enough money
+        if player.cash < price:
+            raise GameError("You don't have enough cash to buy even one share of this stock.")
+
+        max_buy = self.max_buy(stock_id)
+        if max_buy <= 0:
+            raise GameError("You don't have enough space in your trade book or cash to buy this stock.")
+        amount = min(amount, max_buy)
+
+        # Process purchase
+        player.cash -= price * amount
+        player.add_to_portfolio(stock_id, ticker, name, amount, price)
+        self._record("B", stock_id, amount)
+
+        if self.logger:
+            self.logger.log_buy(player, stock_id, ticker, name, amount, price)
+        return ticker, amount, price * amount
+
+    def sell(self, stock_id: int, amount: int) -> Tuple[str, int, int, int]:
+        """
+        Sell shares of a stock at today's price. The amount is capped at the
+        number of shares held.
+
+        Args:
+            stock_id: ID of the stock
+            amount: Number of shares to sell
+
+        Returns:
+            Tuple (ticker, quantity sold, price per share, cost basis of the shares sold)
+        """
+        player = self.player
+        if stock_id not in player.portfolio:
+            raise NotFoundError("Stock not found in portfolio")
+        if amount < 1:
+            raise GameError("Please enter a positive number of shares.")
+
+        stock_info = player.portfolio[stock_id]
+        ticker = stock_info['ticker']
+
+        # Check if the stock is available in the market
+        if not self.stock_manager.is_available(stock_id):
+            raise GameError(f"${ticker} is not currently tradable in the market.")
+
+        market_price = self.stock_manager.get_market_price(stock_id)
+        amount = min(amount, stock_info['quantity'])
+
+        # Process sale
+        player.cash += market_price * amount
+        cost = player.sell_from_portfolio(stock_id, amount, market_price)
+        self._record("S", stock_id, amount)
+
+        if self.logger:
+            self.logger.log_sell(player, stock_id, ticker, stock_info['name'], amount, market_price, cost)
+        return ticker, amount, market_price, cost
+
+    def sell_all(self) -> List[Tuple[int, str, int, int, bool]]:
+        """
+        Sell every stock in the portfolio, e.g. at the end of the game.
+        Stocks that are not tradable today are sold at their purchase price.
+
+        Returns:
+            List of (stock_id, ticker, quantity, price, tradable) tuples
+        """
+        player = self.player
+        sales = []
+        total_earned = 0
+        for stock_id, stock_info in list(player.portfolio.items()):
+            ticker = stock_info['ticker']
+            quantity = stock_info['quantity']
+            tradable = self.stock_manager.is_available(stock_id)
+            price = self.stock_manager.get_market_price(stock_id) if tradable else stock_info['price']
+
+            total_earned += price * quantity
+            cost = player.sell_from_portfolio(stock_id, quantity, price)
+            if self.logger:
+                self.logger.log_sell(player, stock_id, ticker, stock_info['name'], quantity, price, cost)
+            sales.append((stock_id, ticker, quantity, price, tradable))
+
+        player.cash += total_earned
+        return sales
+
+    def place_orders(self, orders: List[Tuple[str, int, int]]) -> List[Tuple[str, int, str, int, int, int]]:
+        """
+        Buy and sell several stocks at today's prices, all or nothing.
+
+        The legs are checked in order against the cash, the trade book
+        space and the shares held as the earlier legs leave them, so sales
+        can pay for later purchases. If any leg cannot be filled in full,
+        nothing is traded. Otherwise the legs are applied in order, as
+        separate buys and sells.
+
+        Args:
+            orders: Legs (action, stock_id, amount), action being "buy" or "sell"
+
+        Returns:
+            List of (action, stock_id, ticker, quantity, price per share,
+            total paid for a buy or cost basis of the shares sold) tuples
+        """
+        player = self.player
+        cash = player.cash
+        space = player.portfolio_capacity - player.portfolio_used
+        held: Dict[int, int] = {}
+        for number, (action, stock_id, amount) in enumerate(orders, 1):
+            if action not in ORDER_ACTIONS:
+                raise GameError(f"Order {number}: unknown action {action} (use {' or '.join(ORDER_ACTIONS)}).")
+            if amount < 1:
+                raise GameError(f"Order {number}: please enter a positive number of shares.")
+            quote = self.stock_manager.get_quote(stock_id)
+            if quote is None:
+                raise GameError(f"Order {number}: stock {stock_id} is not tradable today.")
+            ticker, _, price = quote
+            quantity = held.get(stock_id, player.portfolio.quantity(stock_id))
+
+            if action == "buy":
+                if price * amount > cash:
+                    raise GameError(f"Order {number}: {amount} shares of ${ticker} cost ${price * amount}, "
+                                    f"you would only have ${cash}.")
+                if amount > space:
+                    raise GameError(f"Order {number}: your trade book would only have space for {space} more shares.")
+                cash -= price * amount
+                space -= amount
+                held[stock_id] = quantity + amount
+            else:
+                if amount > quantity:
+                    raise GameError(f"Order {number}: you would only hold {quantity} shares of ${ticker}.")
+                cash += price * amount
+                space += amount
+                held[stock_id] = quantity - amount
+
+        # Every leg fits: apply them, each logged and journaled like a single trade
+        results = []
+        for action, stock_id, amount in orders:
+            if action == "buy":
+                ticker, quantity, total = self.buy(stock_id, amount)
+                results.append((action, stock_id, ticker, quantity, total // quantity, total))
+            else:
+                ticker, quantity, price, cost = self.sell(stock_id, amount)
+                results.append((action, stock_id, ticker, quantity, price, cost))
+        return results
+
+    def set_cost_basis(self, method: str) -> str:
+        """
+        Choose which lots sales take their shares from.
+
+        Args:
+            method: Cost basis method: "fifo" (oldest lots first), "lifo"
+                (newest lots first) or "average" (average cost)
+
+        Returns:
+            str: Method chosen
+        """
+        if not isinstance(method, str) or method not in COST_BASIS_METHODS:
+            raise GameError(f"Unknown cost basis method: {method} (use {', '.join(COST_BASIS_METHODS)}).")
+        self.player.cost_basis = method
+        self._record("M", method)
+        return method
+
+    def deposit(self, amount: int) -> int:
+        """
+        Deposit cash into the bank.
+
+        Args:
+            amount: Amount to deposit
+
+        Returns:
+            int: Amount deposited
+        """
+        player = self.player
+        self._check_amount(amount)
+        if amount > player.cash:
+            raise GameError("You don't have enough cash.")
+
+        player.cash -= amount
+        player.bank_savings += amount
+        self._record("D", amount)
+        if self.logger:
+            self.logger.log_bank_transaction(player, "DEPOSIT", amount)
+        return amount
+
+    def withdraw(self, amount: int) -> int:
+        """
+        Withdraw savings from the bank.
+
+        Args:
+            amount: Amount to withdraw
+
+        Returns:
+            int: Amount withdrawn
+        """
+        player = self.player
+        self._check_amount(amount)
+        if amount > player.bank_savings:
+            raise GameError("You don't have enough savings.")
+
+        player.bank_savings -= amount
+        player.cash += amount
+        self._record("W", amount)
+        if self.logger:
+            self.logger.log_bank_transaction(player, "WITHDRAW", amount)
+        return amount
+
+    def repay(self, amount: int) -> int:
+        """
+        Repay student loan debt. The amount is capped at the remaining debt.
+
+        Args:
+            amount: Amount to repay
+
+        Returns:
+            int: Amount repaid
+        """
+        player = self.player
+        self._check_amount(amount)
+        if amount > player.cash:
+            raise GameError("You don't have enough cash.")
+        amount = min(amount, player.debt)
+
+        player.cash -= amount
+        player.debt -= amount
+        self._record("R", amount)
+        if self.logger:
+            self.logger.log_bank_transaction(player, "REPAY", amount)
+        return amount
+
+    def hospital_cost(self, points: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Get the cost of a hospital treatment.
+
+        Args:
+            points: Health points to restore (up to 100 health if omitted)
+
+        Returns:
+            Tuple (fee, treatment cost)
+        """
+        rules = self.rules
+        if points is None:
+            points = 100 - self.player.health
+        return rules.hospital_fee, points * rules.health_point_cost * rules.copay_percentage // 100
+
+    def visit_hospital(self, points: Optional[int] = None) -> int:
+        """
+        Restore the player's health, to 100 or by some points if the rules
+        allow partial treatments.
+
+        Args:
+            points: Health points to restore (up to 100 health if omitted)
+
+        Returns:
+            int: Total cost of the visit
+        """
+        player = self.player
+        if points is not None:
+            if not self.rules.partial_treatment:
+                raise GameError("The hospital only offers full treatments.")
+            if not 1 <= points <= 100 - player.health:
+                raise GameError(f"You can recover between 1 and {100 - player.health} health points.")
+
+        copay, health_cost = self.hospital_cost(points)
+        if player.cash < copay:
+            raise GameError(f"You need ${copay} for the hospital copay, but you only have ${player.cash}.")
+
+        total_cost = copay + health_cost
+        if player.cash < total_cost:
+            raise GameError(f"You need ${total_cost} to fully restore your health (${copay} copay + ${health_cost} treatment cost due to your health insurance), but you only have ${player.cash}."
+                            if points is None else
+                            f"You need ${total_cost} for this treatment, but you only have ${player.cash}.")
+
+        player.cash -= total_cost
+        if points is None:
+            player.health = 100
+            self._record("H")
+        else:
+            player.health += points
+            self._record("T", points)
+        return total_cost
+
+    def upgrade_cost(self) -> int:
+        """
+        Get the cost of the next trade book upgrade.
+
+        Returns:
+            int: Cost of the upgrade
+        """
+        rules = self.rules
+        cash = self.player.cash
+        if rules.upgrade_cost_scales and cash > rules.upgrade_cost * 2:
+            return cash // 2  # Rich players are charged more
+        return rules.upgrade_cost
+
+    def upgrade_trade_book(self) -> int:
+        """
+        Buy more trade book capacity through the trading app.
+
+        Returns:
+            int: Cost of the upgrade
+        """
+        player = self.player
+        rules = self.rules
+        if rules.max_capacity is not None and player.portfolio_capacity >= rules.max_capacity:
+            raise GameError("You already have the maximum trade book size. No further upgrades are offered.")
+        cost = self.upgrade_cost()
+        if player.cash < cost:
+            raise GameError(f"You need ${cost} to upgrade your trade book capacity, but you only have ${player.cash}.")
+
+        player.cash -= cost
+        player.portfolio_capacity += rules.upgrade_slots
+        self._record("U")
+        return cost
+
+    def visit_darkweb(self) -> Tuple[int, int]:
+        """
+        Visit the darkweb for a random reward, at the cost of an entry fee
+        and some health if the rules say so.
+
+        Returns:
+            Tuple (cash reward, health lost)
+        """
+        player = self.player
+        rules = self.rules
+        if player.darkweb_visits >= rules.max_darkweb_visits:
+            raise GameError("You've visited the darkweb too many times today. Try again tomorrow.")
+        if player.cash < rules.darkweb_fee:
+            raise GameError(f"Access costs ${rules.darkweb_fee}, and you don't have enough cash.")
+
+        player.cash -= rules.darkweb_fee
+        player.darkweb_visits += 1
+        self._record("X")
+        reward = self.rng.darkweb.randint(*rules.darkweb_reward)
+        player.cash += reward
+        health_penalty = 0
+        if rules.darkweb_health_cost is not None:
+            health_penalty = self.rng.darkweb.randint(*rules.darkweb_health_cost)
+            player.health = max(0, player.health - health_penalty)
+        return reward, health_penalty
+
+    def collect_broker_rebate(self) -> int:
+        """
+        Collect the broker's rebate for paying off the student loan, given
+        to debt-free players with $1000 to $100000 in cash and savings.
+
+        Returns:
+            int: Rebate received
+        """
+        player = self.player
+        rebate = self.rules.broker_rebate
+        if rebate <= 0 or player.debt > 0 or not 1000 <= player.cash + player.bank_savings < 100000:
+            raise GameError("The broker has no rebate for you.")
+
+        player.cash += rebate
+        self._record("G")
+        return rebate
+
+    def enable_hacker_actions(self) -> None:
+        """
+        Let hacker events change the player's bank savings, for better or worse.
+        """
+        player = self.player
+        if player.hacker_actions_enabled:
+            raise GameError("Hacking operations are already enabled.")
+
+        player.hacker_actions_enabled = True
+        self._record("K")
+
+    def _record(self, code: str, *args) -> None:
+        """
+        Record an applied action in the journal, if the game has one.
+
+        Args:
+            code: Action code (see game.journal.ACTIONS)
+            *args: Arguments of the action
+        """
+        if self.journal is not None:
+            self.journal.record(code, *args)
+
+    def _check_amount(self, amount: int) -> None:
+        """
+        Reject negative amounts of money.
+
+        Args:
+            amount: Amount of money
+        """
+        if amount < 0:
+            raise GameError("Please enter a positive amount.")
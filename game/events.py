@@ -5,309 +5,451 @@ Events module for Yolo Terminal game.
 Handles random events that can occur during the game.
 """
 
+import bisect
 import random
-from typing import Dict, List, Optional, Tuple, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Any
+import numpy as np
+
+# Each event category rolls randint(0, N) per event, i.e. N + 1 possible values
+MARKET_DRAW_RANGE = 951
+HEALTH_DRAW_RANGE = 1001
+MONEY_DRAW_RANGE = 1001
+HACKER_DRAW_RANGE = 1001
+HACKER_FREQ = 25
+
+class EventTable:
+    """
+    EventTable class compiling an ordered list of events into cumulative
+    probability tables, so that one uniform draw decides which event fires.
+    
+    The events of a category are tried in order: event i fires when a draw
+    from ``range(draw_range)`` is a multiple of its frequency and it is
+    eligible (e.g. its stock is tradable today), and the first event that
+    fires wins. Event i is therefore picked with probability
+    ``q_i * prod(1 - q_j for j < i)``, where ``q_i`` is its firing
+    probability (0 when not eligible). The table holds the cumulative sums
+    ``1 - prod(1 - q_j for j <= i)``; a uniform draw below the first
+    cumulative value that exceeds it picks that event.
+    """
+    
+    def __init__(self, freqs: Sequence[int], draw_range: int):
+        """
+        Compile the table.
+        
+        Args:
+            freqs: Frequency of each event, in the order the events are tried
+            draw_range: Number of possible values of each draw
+        """
+        self.freqs = tuple(freqs)
+        self.draw_range = draw_range
+        # Number of multiples of freq in range(draw_range), zero included
+        counts = np.array([(draw_range - 1) // freq + 1 for freq in self.freqs], dtype=np.float64)
+        self.probabilities = counts / draw_range
+        # Cumulative tables per eligibility mask (None: all events eligible)
+        self._cumulative: Dict[Optional[Tuple[bool, ...]], List[float]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.freqs)
+    
+    def cumulative(self, mask: Optional[Tuple[bool, ...]] = None) -> List[float]:
+        """
+        Get the cumulative table for an eligibility mask.
+        
+        Args:
+            mask: Eligibility of each event (all eligible if omitted)
+        
+        Returns:
+            List of cumulative probabilities, one per event
+        """
+        table = self._cumulative.get(mask)
+        if table is None:
+            q = self.probabilities if mask is None else self.probabilities * np.asarray(mask, dtype=bool)
+            table = (1.0 - np.cumprod(1.0 - q)).tolist()
+            self._cumulative[mask] = table
+        return table
+    
+    def event_probabilities(self, mask: Optional[Tuple[bool, ...]] = None) -> np.ndarray:
+        """
+        Get the probability of each event being picked.
+        
+        Args:
+            mask: Eligibility of each event (all eligible if omitted)
+        
+        Returns:
+            Array of probabilities, one per event (the rest is "no event")
+        """
+        return np.diff(self.cumulative(mask), prepend=0.0)
+    
+    def pick(self, u: float, mask: Optional[Tuple[bool, ...]] = None) -> Optional[int]:
+        """
+        Pick the event of one game.
+        
+        Args:
+            u: Uniform draw in [0, 1)
+            mask: Eligibility of each event (all eligible if omitted)
+        
+        Returns:
+            int: Index of the event that fires, None if no event fires
+        """
+        index = bisect.bisect_right(self.cumulative(mask), u)
+        return index if index < len(self.freqs) else None
+    
+    def pick_batch(self, u: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Pick the events of a batch of games.
+        
+        Args:
+            u: Uniform draws in [0, 1), one per game
+            mask: Eligibility array of shape (num_games, num_events) (all eligible if omitted)
+        
+        Returns:
+            Array with the index of the event that fires in each game, -1 if none
+        """
+        q = self.probabilities if mask is None else self.probabilities * mask
+        cumulative = 1.0 - np.cumprod(1.0 - q, axis=-1)
+        index = np.sum(cumulative <= u[:, None], axis=1)
+        return np.where(index < len(self.freqs), index, -1)
+
+
+@lru_cache(maxsize=None)
+def compile_event_table(freqs: Tuple[int, ...], draw_range: int) -> EventTable:
+    """
+    Get the compiled table of a list of event frequencies, shared by all games.
+    
+    Args:
+        freqs: Frequency of each event, in the order the events are tried
+        draw_range: Number of possible values of each draw
+    
+    Returns:
+        EventTable: Compiled table
+    """
+    return EventTable(freqs, draw_range)
+
+def _freeze(events: List[Dict[str, Any]]) -> Tuple[Mapping[str, Any], ...]:
+    """Make an event catalog read-only, so games can share it."""
+    return tuple(MappingProxyType(event) for event in events)
+
+# Event catalogs, shared by every game. Events are tried in order, see EventTable
+
+# Market events that affect stock prices and quantities
+MARKET_EVENTS = _freeze([
+    {
+        "freq": 170,
+        "msg": "Analyst report: Tezla ($TZLA) electric vehicles are in high demand, with supply shortages reported!",
+        "stock_id": 5,  # Tezla
+        "multiply": 2,
+        "divide": 0,
+        "add": 0
+    },
+    {
+        "freq": 139,
+        "msg": "FDA investigation: nWidia ($NWDA) chips found to cause overheating in devices, consumers advised to avoid!",
+        "stock_id": 3,  # nWidia
+        "multiply": 3,
+        "divide": 0,
+        "add": 0
+    },
+    {
+        "freq": 100,
+        "msg": "Wall Street Journal reports: SBY500 ($SBY) index fund performance 'exceptional' this quarter!",
+        "stock_id": 4,  # SBY500
+        "multiply": 5,
+        "divide": 0,
+        "add": 0
+    },
+    {
+        "freq": 41,
+        "msg": "Famous investor Warren Buffer says: 'All 2025 Nobel Prize winners use Cato Coin ($CATO) for transactions!'",
+        "stock_id": 2,  # Cato Coin
+        "multiply": 4,
+        "divide": 0,
+        "add": 0
+    },
+    {
+        "freq": 37,
+        "msg": "SEC announces crackdown on Pitcoin ($PITCOIN) exchanges, citing market manipulation concerns!",
+        "stock_id": 1,  # Pitcoin
+        "multiply": 3,
+        "divide": 0,
+        "add": 0
+    },
+    {
+        "freq": 23,
+        "msg": "Tech blogs report: Plantir ($PLTI) data analytics software being adopted by major corporations worldwide!",
+        "stock_id": 7,  # Plantir
+        "multiply": 4,
+        "divide": 0,
+        "add": 0
+    },
+    {
+        "freq": 37,
+        "msg": "CNBC.com reports: SBY500 ($SBY) outperforming all other index funds, investors flocking to buy!",
+        "stock_id": 4,  # SBY500
+        "multiply": 8,
+        "divide": 0,
+        "add": 0
+    },
+    {
+        "freq": 15,
+        "msg": "Celebrity endorsement: 'I use Plantir ($PLTI) for all my data needs!' says tech influencer Elan Mush.",
+        "stock_id": 7,  # Plantir
+        "multiply": 7,
+        "divide": 0,
+        "add": 0
+    },
+    {
+        "freq": 40,
+        "msg": "nWidia ($NWDA) announces new AI chip that outperforms competitors by 300%, stock soaring!",
+        "stock_id": 3,  # nWidia
+        "multiply": 7,
+        "divide": 0,
+        "add": 0
+    },
+    {
+        "freq": 29,
+        "msg": "College students worldwide adopting PinTuoTuo ($PTT) smartphones, sales skyrocketing! The Chinese e-commerce giant's US business Teniu is gaining popularity.",
+        "stock_id": 6,  # PinTuoTuo
+        "multiply": 7,
+        "divide": 0,
+        "add": 0
+    },
+    {
+        "freq": 45,
+        "msg": "PinTuoTuo ($PTT), the Chinese e-commerce company, reports record sales through its US business Teniu, which specializes in Chinese high tech products!",
+        "stock_id": 6,  # PinTuoTuo
+        "multiply": 5,
+        "divide": 0,
+        "add": 0
+    },
+    {
+        "freq": 35,
+        "msg": "Housing market boom driving Pitcoin ($PITCOIN) prices to new heights!",
+        "stock_id": 1,  # Pitcoin
+        "multiply": 8,
+        "divide": 0,
+        "add": 0
+    },
+    {
+        "freq": 17,
+        "msg": "Major security flaw discovered in Super Nicron ($SNCI) software, prices plummeting!",
+        "stock_id": 0,  # Super Nicron
+        "multiply": 0,
+        "divide": 8,
+        "add": 0
+    },
+    {
+        "freq": 24,
+        "msg": "Tezla ($TZLA) recalls thousands of vehicles due to battery issues, stock taking a hit!",
+        "stock_id": 5,  # Tezla
+        "multiply": 0,
+        "divide": 5,
+        "add": 0
+    },
+    {
+        "freq": 18,
+        "msg": "Government crackdown on Cato Coin ($CATO) mining operations, prices in free fall!",
+        "stock_id": 2,  # Cato Coin
+        "multiply": 0,
+        "divide": 8,
+        "add": 0
+    },
+    {
+        "freq": 160,
+        "msg": "Your college roommate gifted you two shares of Pitcoin ($PITCOIN), thanks to them!",
+        "stock_id": 1,  # Pitcoin
+        "multiply": 0,
+        "divide": 0,
+        "add": 2
+    },
+    {
+        "freq": 45,
+        "msg": "A class action lawsuit recovered your lost Super Nicron ($SNCI) shares.",
+        "stock_id": 0,  # Super Nicron
+        "multiply": 0,
+        "divide": 0,
+        "add": 6
+    },
+    {
+        "freq": 35,
+        "msg": "You received some nWidia ($NWDA) shares as part of a customer loyalty program!",
+        "stock_id": 3,  # nWidia
+        "multiply": 0,
+        "divide": 0,
+        "add": 4
+    },
+    {
+        "freq": 140,
+        "msg": "Media reports: PinTuoTuo ($PTT) phones sold through their US business Teniu have excellent quality! You bought one for $2500, but also received a free share of stock.",
+        "stock_id": 6,  # PinTuoTuo
+        "multiply": 0,
+        "divide": 0,
+        "add": 1
+    },
+    {
+        "freq": 75,
+        "msg": "US-China trade tensions ease, boosting PinTuoTuo's ($PTT) Teniu business which sells Chinese high tech products to US consumers!",
+        "stock_id": 6,  # PinTuoTuo
+        "multiply": 6,
+        "divide": 0,
+        "add": 0
+    }
+])
+
+# Health events that affect player health
+HEALTH_EVENTS = _freeze([
+    {
+        "freq": 117,
+        "msg": "You were scammed by a fake investment advisor!",
+        "damage": 3,
+        "sound": "kill.wav"
+    },
+    {
+        "freq": 157,
+        "msg": "You stayed up all night watching stock charts and suffered a panic attack!",
+        "damage": 20,
+        "sound": "death.wav"
+    },
+    {
+        "freq": 21,
+        "msg": "A market crash caused you extreme stress, affecting your health.",
+        "damage": 1,
+        "sound": "dog.wav"
+    },
+    {
+        "freq": 100,
+        "msg": "Trading platform outage prevented you from selling at the peak, causing anxiety!",
+        "damage": 1,
+        "sound": "harley.wav"
+    },
+    {
+        "freq": 35,
+        "msg": "A hacker stole your trading password, causing you stress!",
+        "damage": 1,
+        "sound": "hit.wav"
+    },
+    {
+        "freq": 313,
+        "msg": "A group of angry investors blamed you for bad stock tips!",
+        "damage": 10,
+        "sound": "flee.wav"
+    },
+    {
+        "freq": 120,
+        "msg": "You and your friend lost money on a hot stock tip that turned out to be a scam!",
+        "damage": 5,
+        "sound": "death.wav"
+    },
+    {
+        "freq": 29,
+        "msg": "You were threatened by someone who lost money following your advice!",
+        "damage": 3,
+        "sound": "el.wav"
+    },
+    {
+        "freq": 43,
+        "msg": "You ate cheap fast food while trading and got food poisoning!",
+        "damage": 1,
+        "sound": "vomit.wav"
+    },
+    {
+        "freq": 45,
+        "msg": "Your terrible stock pick was mocked on social media, damaging your reputation!",
+        "damage": 1,
+        "sound": "level.wav"
+    },
+    {
+        "freq": 48,
+        "msg": "You were fined $40 for illegal parking while rushing to make a trade!",
+        "damage": 1,
+        "sound": "lan.wav"
+    },
+    {
+        "freq": 33,
+        "msg": "You spilled coffee on your laptop while checking stock prices!",
+        "damage": 1,
+        "sound": "breath.wav"
+    }
+])
+
+# Money events that affect player cash
+MONEY_EVENTS = _freeze([
+    {
+        "freq": 60,
+        "msg": "A fake investment advisor scammed you out of some money!",
+        "ratio": 10
+    },
+    {
+        "freq": 125,
+        "msg": "A hacker gained access to your trading account and stole funds!",
+        "ratio": 10
+    },
+    {
+        "freq": 100,
+        "msg": "The IRS audited your trading activity and imposed a penalty!",
+        "ratio": 40
+    },
+    {
+        "freq": 65,
+        "msg": "Your trading platform charged unexpected fees for inactivity!",
+        "ratio": 20
+    },
+    {
+        "freq": 35,
+        "msg": "Your phone company charged extra for market data usage!",
+        "ratio": 15
+    },
+    {
+        "freq": 27,
+        "msg": "A regulatory fine for pattern day trading without sufficient funds!",
+        "ratio": 10
+    },
+    {
+        "freq": 40,
+        "msg": "You developed carpal tunnel syndrome from too much trading, requiring medical treatment...",
+        "ratio": 5
+    }
+])
+
 
 class EventManager:
     """
     EventManager class to manage all random events in the game.
+    
+    The event catalogs and their compiled probability tables are class
+    attributes shared by every game, so an instance only holds the game's
+    random generator.
     """
     
-    def __init__(self):
-        """Initialize the event manager with all event types."""
-        # Market events that affect stock prices and quantities
-        self.market_events = []
-        self._init_market_events()
-        
-        # Health events that affect player health
-        self.health_events = []
-        self._init_health_events()
-        
-        # Money events that affect player cash
-        self.money_events = []
-        self._init_money_events()
+    market_events = MARKET_EVENTS
+    health_events = HEALTH_EVENTS
+    money_events = MONEY_EVENTS
+    
+    # Compiled probability tables, one uniform draw per category decides
+    # which event fires
+    market_table = compile_event_table(tuple(e["freq"] for e in MARKET_EVENTS), MARKET_DRAW_RANGE)
+    health_table = compile_event_table(tuple(e["freq"] for e in HEALTH_EVENTS), HEALTH_DRAW_RANGE)
+    money_table = compile_event_table(tuple(e["freq"] for e in MONEY_EVENTS), MONEY_DRAW_RANGE)
+    hacker_table = compile_event_table((HACKER_FREQ,), HACKER_DRAW_RANGE)
+    _market_stock_ids = [e["stock_id"] for e in MARKET_EVENTS]
     
-    def _init_market_events(self):
-        """Initialize market events."""
-        self.market_events = [
-            {
-                "freq": 170,
-                "msg": "Analyst report: Tezla ($TZLA) electric vehicles are in high demand, with supply shortages reported!",
-                "stock_id": 5,  # Tezla
-                "multiply": 2,
-                "divide": 0,
-                "add": 0
-            },
-            {
-                "freq": 139,
-                "msg": "FDA investigation: nWidia ($NWDA) chips found to cause overheating in devices, consumers advised to avoid!",
-                "stock_id": 3,  # nWidia
-                "multiply": 3,
-                "divide": 0,
-                "add": 0
-            },
-            {
-                "freq": 100,
-                "msg": "Wall Street Journal reports: SBY500 ($SBY) index fund performance 'exceptional' this quarter!",
-                "stock_id": 4,  # SBY500
-                "multiply": 5,
-                "divide": 0,
-                "add": 0
-            },
-            {
-                "freq": 41,
-                "msg": "Famous investor Warren Buffer says: 'All 2025 Nobel Prize winners use Cato Coin ($CATO) for transactions!'",
-                "stock_id": 2,  # Cato Coin
-                "multiply": 4,
-                "divide": 0,
-                "add": 0
-            },
-            {
-                "freq": 37,
-                "msg": "SEC announces crackdown on Pitcoin ($PITCOIN) exchanges, citing market manipulation concerns!",
-                "stock_id": 1,  # Pitcoin
-                "multiply": 3,
-                "divide": 0,
-                "add": 0
-            },
-            {
-                "freq": 23,
-                "msg": "Tech blogs report: Plantir ($PLTI) data analytics software being adopted by major corporations worldwide!",
-                "stock_id": 7,  # Plantir
-                "multiply": 4,
-                "divide": 0,
-                "add": 0
-            },
-            {
-                "freq": 37,
-                "msg": "CNBC.com reports: SBY500 ($SBY) outperforming all other index funds, investors flocking to buy!",
-                "stock_id": 4,  # SBY500
-                "multiply": 8,
-                "divide": 0,
-                "add": 0
-            },
-            {
-                "freq": 15,
-                "msg": "Celebrity endorsement: 'I use Plantir ($PLTI) for all my data needs!' says tech influencer Elan Mush.",
-                "stock_id": 7,  # Plantir
-                "multiply": 7,
-                "divide": 0,
-                "add": 0
-            },
-            {
-                "freq": 40,
-                "msg": "nWidia ($NWDA) announces new AI chip that outperforms competitors by 300%, stock soaring!",
-                "stock_id": 3,  # nWidia
-                "multiply": 7,
-                "divide": 0,
-                "add": 0
-            },
-            {
-                "freq": 29,
-                "msg": "College students worldwide adopting PinTuoTuo ($PTT) smartphones, sales skyrocketing! The Chinese e-commerce giant's US business Teniu is gaining popularity.",
-                "stock_id": 6,  # PinTuoTuo
-                "multiply": 7,
-                "divide": 0,
-                "add": 0
-            },
-            {
-                "freq": 45,
-                "msg": "PinTuoTuo ($PTT), the Chinese e-commerce company, reports record sales through its US business Teniu, which specializes in Chinese high tech products!",
-                "stock_id": 6,  # PinTuoTuo
-                "multiply": 5,
-                "divide": 0,
-                "add": 0
-            },
-            {
-                "freq": 35,
-                "msg": "Housing market boom driving Pitcoin ($PITCOIN) prices to new heights!",
-                "stock_id": 1,  # Pitcoin
-                "multiply": 8,
-                "divide": 0,
-                "add": 0
-            },
-            {
-                "freq": 17,
-                "msg": "Major security flaw discovered in Super Nicron ($SNCI) software, prices plummeting!",
-                "stock_id": 0,  # Super Nicron
-                "multiply": 0,
-                "divide": 8,
-                "add": 0
-            },
-            {
-                "freq": 24,
-                "msg": "Tezla ($TZLA) recalls thousands of vehicles due to battery issues, stock taking a hit!",
-                "stock_id": 5,  # Tezla
-                "multiply": 0,
-                "divide": 5,
-                "add": 0
-            },
-            {
-                "freq": 18,
-                "msg": "Government crackdown on Cato Coin ($CATO) mining operations, prices in free fall!",
-                "stock_id": 2,  # Cato Coin
-                "multiply": 0,
-                "divide": 8,
-                "add": 0
-            },
-            {
-                "freq": 160,
-                "msg": "Your college roommate gifted you two shares of Pitcoin ($PITCOIN), thanks to them!",
-                "stock_id": 1,  # Pitcoin
-                "multiply": 0,
-                "divide": 0,
-                "add": 2
-            },
-            {
-                "freq": 45,
-                "msg": "A class action lawsuit recovered your lost Super Nicron ($SNCI) shares.",
-                "stock_id": 0,  # Super Nicron
-                "multiply": 0,
-                "divide": 0,
-                "add": 6
-            },
-            {
-                "freq": 35,
-                "msg": "You received some nWidia ($NWDA) shares as part of a customer loyalty program!",
-                "stock_id": 3,  # nWidia
-                "multiply": 0,
-                "divide": 0,
-                "add": 4
-            },
-            {
-                "freq": 140,
-                "msg": "Media reports: PinTuoTuo ($PTT) phones sold through their US business Teniu have excellent quality! You bought one for $2500, but also received a free share of stock.",
-                "stock_id": 6,  # PinTuoTuo
-                "multiply": 0,
-                "divide": 0,
-                "add": 1
-            },
-            {
-                "freq": 75,
-                "msg": "US-China trade tensions ease, boosting PinTuoTuo's ($PTT) Teniu business which sells Chinese high tech products to US consumers!",
-                "stock_id": 6,  # PinTuoTuo
-                "multiply": 6,
-                "divide": 0,
-                "add": 0
-            }
-        ]
+    def __init__(self, rng: Optional[random.Random] = None):
+        """
+        Initialize the event manager of a game.
+        
+        Args:
+            rng: Random generator for events (a fresh one is created if omitted)
+        """
+        self.rng = rng if rng is not None else random.Random()
     
-    def _init_health_events(self):
-        """Initialize health events."""
-        self.health_events = [
-            {
-                "freq": 117,
-                "msg": "You were scammed by a fake investment advisor!",
-                "damage": 3,
-                "sound": "kill.wav"
-            },
-            {
-                "freq": 157,
-                "msg": "You stayed up all night watching stock charts and suffered a panic attack!",
-                "damage": 20,
-                "sound": "death.wav"
-            },
-            {
-                "freq": 21,
-                "msg": "A market crash caused you extreme stress, affecting your health.",
-                "damage": 1,
-                "sound": "dog.wav"
-            },
-            {
-                "freq": 100,
-                "msg": "Trading platform outage prevented you from selling at the peak, causing anxiety!",
-                "damage": 1,
-                "sound": "harley.wav"
-            },
-            {
-                "freq": 35,
-                "msg": "A hacker stole your trading password, causing you stress!",
-                "damage": 1,
-                "sound": "hit.wav"
-            },
-            {
-                "freq": 313,
-                "msg": "A group of angry investors blamed you for bad stock tips!",
-                "damage": 10,
-                "sound": "flee.wav"
-            },
-            {
-                "freq": 120,
-                "msg": "You and your friend lost money on a hot stock tip that turned out to be a scam!",
-                "damage": 5,
-                "sound": "death.wav"
-            },
-            {
-                "freq": 29,
-                "msg": "You were threatened by someone who lost money following your advice!",
-                "damage": 3,
-                "sound": "el.wav"
-            },
-            {
-                "freq": 43,
-                "msg": "You ate cheap fast food while trading and got food poisoning!",
-                "damage": 1,
-                "sound": "vomit.wav"
-            },
-            {
-                "freq": 45,
-                "msg": "Your terrible stock pick was mocked on social media, damaging your reputation!",
-                "damage": 1,
-                "sound": "level.wav"
-            },
-            {
-                "freq": 48,
-                "msg": "You were fined $40 for illegal parking while rushing to make a trade!",
-                "damage": 1,
-                "sound": "lan.wav"
-            },
-            {
-                "freq": 33,
-                "msg": "You spilled coffee on your laptop while checking stock prices!",
-                "damage": 1,
-                "sound": "breath.wav"
-            }
-        ]
+    def __getstate__(self) -> Dict[str, Any]:
+        """The event catalogs are shared, so only the random generator is pickled."""
+        return {'rng': self.rng}
     
-    def _init_money_events(self):
-        """Initialize money events."""
-        self.money_events = [
-            {
-                "freq": 60,
-                "msg": "A fake investment advisor scammed you out of some money!",
-                "ratio": 10
-            },
-            {
-                "freq": 125,
-                "msg": "A hacker gained access to your trading account and stole funds!",
-                "ratio": 10
-            },
-            {
-                "freq": 100,
-                "msg": "The IRS audited your trading activity and imposed a penalty!",
-                "ratio": 40
-            },
-            {
-                "freq": 65,
-                "msg": "Your trading platform charged unexpected fees for inactivity!",
-                "ratio": 20
-            },
-            {
-                "freq": 35,
-                "msg": "Your phone company charged extra for market data usage!",
-                "ratio": 15
-            },
-            {
-                "freq": 27,
-                "msg": "A regulatory fine for pattern day trading without sufficient funds!",
-                "ratio": 10
-            },
-            {
-                "freq": 40,
-                "msg": "You developed carpal tunnel syndrome from too much trading, requiring medical treatment...",
-                "ratio": 5
-            }
-        ]
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the random generator after unpickling."""
+        self.__init__(state.get('rng'))
     
     def handle_events(self, player, stock_manager) -> List[str]:
         """
@@ -345,6 +487,31 @@ class EventManager:
         
         return news_reports
     
+    def roll_batch(self, rng: np.random.Generator, num_games: int,
+                   available: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Decide which event of each category fires for a batch of games, with
+        one batched draw per category.
+        
+        Args:
+            rng: NumPy random generator
+            num_games: Number of games
+            available: Stock availability of shape (num_games, num_stocks), e.g.
+                PriceEngine.available (all stocks tradable if omitted)
+        
+        Returns:
+            dict: Category ("market", "health", "money", "hacker") -> array with
+            the index of the event that fires in each game, -1 if none
+        """
+        market_mask = None if available is None else available[:, self._market_stock_ids]
+        u = rng.random((4, num_games))
+        return {
+            "market": self.market_table.pick_batch(u[0], market_mask),
+            "health": self.health_table.pick_batch(u[1]),
+            "money": self.money_table.pick_batch(u[2]),
+            "hacker": self.hacker_table.pick_batch(u[3])
+        }
+    
     def _handle_market_events(self, player, stock_manager) -> str:
         """
         Handle market events that affect stock prices and quantities.
@@ -356,44 +523,43 @@ class EventManager:
         Returns:
             str: Event message if an event occurred, None otherwise
         """
-        for event in self.market_events:
-            if random.randint(0, 950) % event["freq"] == 0:
-                stock_id = event["stock_id"]
-                
-                # Skip if stock not available
-                if not stock_manager.available_stocks.get(stock_id, False):
-                    continue
-                
-                # Get stock
-                stock = stock_manager.stock_types[stock_id]
-                
-                # Apply event effects
-                if event["multiply"] > 0:
-                    stock.multiply_price(event["multiply"])
-                
-                if event["divide"] > 0:
-                    stock.divide_price(event["divide"])
-                
-                if event["add"] > 0:
-                    # Special case for the last event (adds debt)
-                    if event == self.market_events[-1]:
-                        player.debt += 2500
-                    
-                    # Add stock to portfolio if player has space
-                    add_count = min(event["add"], player.portfolio_capacity - player.portfolio_used)
-                    if add_count > 0:
-                        player.add_to_portfolio(
-                            stock_id,
-                            stock.ticker,
-                            stock.name,
-                            add_count,
-                            0  # Free stocks
-                        )
-                
-                # Return the event message
-                return event["msg"]
+        # Market events only fire for stocks that are tradable today
+        mask = tuple(stock_manager.is_available(stock_id) for stock_id in self._market_stock_ids)
+        index = self.market_table.pick(self.rng.random(), mask)
+        if index is None:
+            return None
         
-        return None
+        event = self.market_events[index]
+        stock_id = event["stock_id"]
+        
+        # Get stock
+        stock = stock_manager.stock(stock_id)
+        
+        # Apply event effects
+        if event["multiply"] > 0:
+            stock.multiply_price(event["multiply"])
+        
+        if event["divide"] > 0:
+            stock.divide_price(event["divide"])
+        
+        if event["add"] > 0:
+            # Special case for the last event (adds debt)
+            if index == len(self.market_events) - 1:
+                player.debt += 2500
+            
+            # Add stock to portfolio if player has space
+            add_count = min(event["add"], player.portfolio_capacity - player.portfolio_used)
+            if add_count > 0:
+                player.add_to_portfolio(
+                    stock_id,
+                    stock.ticker,
+                    stock.name,
+                    add_count,
+                    0  # Free stocks
+                )
+        
+        # Return the event message
+        return event["msg"]
     
     def _handle_health_events(self, player) -> str:
         """
@@ -405,39 +571,41 @@ class EventManager:
         Returns:
             str: Event message if an event occurred, None otherwise
         """
-        for event in self.health_events:
-            if random.randint(0, 1000) % event["freq"] == 0:
-                # Apply health damage
-                player.health -= event["damage"]
-                
-                # Check if player needs medical care
-                if player.health < 85 and player.days_left > 3:
-                    # Player needs medical care
-                    delay_days = 1 + random.randint(0, 1)
-                    
-                    # Calculate medical cost
-                    medical_cost = delay_days * (1000 + random.randint(0, 8500))
-                    
-                    # Add to debt
-                    player.debt += medical_cost
-                    
-                    # Increase health
-                    player.health += 10
-                    if player.health > 100:
-                        player.health = 100
-                    
-                    # Decrease days left
-                    player.days_left -= delay_days
-                    
-                    # Return the event message
-                    return f"Your health deteriorated and you were rushed to the hospital. The doctor says you need {delay_days} days of rest.\n" \
-                           f"While unconscious, you received IV fluids and treatment.\n" \
-                           f"Your insurance has a high deductible, so you now owe ${medical_cost} in medical bills."
-                
-                # Return the event message
-                return f"{event['msg']}\nYour health decreased by {event['damage']} points."
+        index = self.health_table.pick(self.rng.random())
+        if index is None:
+            return None
         
-        return None
+        event = self.health_events[index]
+        
+        # Apply health damage
+        player.health -= event["damage"]
+        
+        # Check if player needs medical care
+        if player.health < 85 and player.days_left > 3:
+            # Player needs medical care
+            delay_days = 1 + self.rng.randint(0, 1)
+            
+            # Calculate medical cost
+            medical_cost = delay_days * (1000 + self.rng.randint(0, 8500))
+            
+            # Add to debt
+            player.debt += medical_cost
+            
+            # Increase health
+            player.health += 10
+            if player.health > 100:
+                player.health = 100
+            
+            # Decrease days left
+            player.days_left -= delay_days
+            
+            # Return the event message
+            return f"Your health deteriorated and you were rushed to the hospital. The doctor says you need {delay_days} days of rest.\n" \
+                   f"While unconscious, you received IV fluids and treatment.\n" \
+                   f"Your insurance has a high deductible, so you now owe ${medical_cost} in medical bills."
+        
+        # Return the event message
+        return f"{event['msg']}\nYour health decreased by {event['damage']} points."
     
     def _handle_money_events(self, player) -> str:
         """
@@ -449,20 +617,22 @@ class EventManager:
         Returns:
             str: Event message if an event occurred, None otherwise
         """
-        for event in self.money_events:
-            if random.randint(0, 1000) % event["freq"] == 0:
-                # Calculate money loss
-                money_loss = (player.cash * event["ratio"]) // 100
-                
-                # Apply money loss
-                player.cash -= money_loss
-                if player.cash < 0:
-                    player.cash = 0
-                
-                # Return the event message
-                return f"{event['msg']}\nYou lost {event['ratio']}% of your cash."
+        index = self.money_table.pick(self.rng.random())
+        if index is None:
+            return None
         
-        return None
+        event = self.money_events[index]
+        
+        # Calculate money loss
+        money_loss = (player.cash * event["ratio"]) // 100
+        
+        # Apply money loss
+        player.cash -= money_loss
+        if player.cash < 0:
+            player.cash = 0
+        
+        # Return the event message
+        return f"{event['msg']}\nYou lost {event['ratio']}% of your cash."
     
     def _handle_hacker_events(self, player) -> str:
         """
@@ -474,15 +644,15 @@ class EventManager:
         Returns:
             str: Event message if an event occurred, None otherwise
         """
-        if random.randint(0, 1000) % 25 == 0:
+        if self.hacker_table.pick(self.rng.random()) is not None:
             if player.bank_savings < 1000:
                 return None
             
             if player.bank_savings > 100000:
                 # Large savings, can lose or gain money
-                amount = player.bank_savings // (2 + random.randint(0, 19))
+                amount = player.bank_savings // (2 + self.rng.randint(0, 19))
                 
-                if random.randint(0, 20) % 3 != 0:
+                if self.rng.randint(0, 20) % 3 != 0:
                     # Lose money
                     player.bank_savings -= amount
                     return f"Hackers breached your bank's network and modified the database. Your savings decreased by ${amount}."
@@ -492,7 +662,7 @@ class EventManager:
                     return f"Hackers breached your bank's network and modified the database. Your savings increased by ${amount}!"
             else:
                 # Smaller savings, always gain money
-                amount = player.bank_savings // (1 + random.randint(0, 14))
+                amount = player.bank_savings // (1 + self.rng.randint(0, 14))
                 player.bank_savings += amount
                 return f"Hackers breached your bank's network and modified the database. Your savings increased by ${amount}!"
         
@@ -6,6 +6,7 @@ Contains a collection of hilarious news headlines to display at the bottom of th
 """
 
 import random
+from typing import Optional
 from colorama import Fore
 
 # Collection of hilarious news headlines (each within 70 chars)
@@ -179,13 +180,17 @@ NEWS_AGENCIES = [
     {"acronym": "CBS", "color": Fore.YELLOW}
 ]
 
-def get_random_headline() -> tuple:
+def get_random_headline(rng: Optional[random.Random] = None) -> tuple:
     """
     Get a random headline from the collection along with a random news agency.
     
+    Args:
+        rng: Random generator to draw from (the global random module if omitted)
+    
     Returns:
         tuple: (headline, agency_acronym, agency_color)
     """
-    headline = random.choice(HEADLINES)
-    agency = random.choice(NEWS_AGENCIES)
+    rng = rng or random
+    headline = rng.choice(HEADLINES)
+    agency = rng.choice(NEWS_AGENCIES)
     return headline, agency["acronym"], agency["color"]
@@ -2,54 +2,349 @@
 # -*- coding: utf-8 -*-
 """
 High Scores module for Yolo Terminal game.
-Handles tracking high scores.
+Handles tracking high scores, and storing them safely when several games
+or processes add scores at once.
 """
 
+import atexit
 import os
 import json
-from typing import Dict, List, Optional, Tuple, Any
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Any
 
-class HighScores:
+try:
+    import fcntl
+except ImportError:  # Windows: scores are not locked against other processes
+    fcntl = None
+
+from game.ranking import RankedScores
+
+# Version of the scores file format
+SCORES_FORMAT = 1
+
+def _file_id(fd: int) -> Tuple[int, int]:
+    """Identify the contents of an open file: its inode and modification time."""
+    stat = os.fstat(fd)
+    return stat.st_ino, stat.st_mtime_ns
+
+def _parse_lines(data: bytes) -> Tuple[List[Dict[str, Any]], int]:
     """
-    HighScores class to handle tracking high scores.
+    Parse the complete JSON lines of a log chunk.
+    
+    Args:
+        data: Log bytes
+    
+    Returns:
+        Tuple (entries, length of the complete lines). A last line without
+        a newline is an interrupted write and is left out.
+    """
+    end = data.rfind(b"\n") + 1
+    entries = []
+    for line in data[:end].splitlines():
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    return entries, end
+
+
+class ScoreLog:
     """
+    ScoreLog class storing score entries in a snapshot file and an
+    append-only log next to it, shared safely by threads and processes.
     
-    def __init__(self, scores_file: str = "scores.json"):
+    New scores are buffered and appended to the log in one write and fsync
+    every flush_interval seconds, by a background thread. When the log
+    grows past compact_bytes and past the size of the snapshot, the thread
+    compacts it: the snapshot is rewritten with the entries chosen by
+    `keep` and the log is started over, so rewriting a snapshot of all
+    scores costs O(1) per score over time. Files are replaced atomically (written to a temporary file,
+    fsynced and renamed), so a crash leaves either the old or the new
+    version. Writers hold an exclusive lock on a lock file, readers a
+    shared one.
+    
+    The snapshot records a generation number, and the log starts with the
+    generation it follows, so a log left over by a crash during compaction
+    is recognized and ignored instead of being counted twice.
+    """
+    
+    def __init__(self, path: str, keep: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = None,
+                 flush_interval: float = 0.5, compact_bytes: int = 256 * 1024):
         """
-        Initialize the high scores.
+        Initialize the score log.
         
         Args:
-            scores_file: Path to the scores file
+            path: Snapshot file (the log and lock files are created next to it)
+            keep: Chooses the entries kept when the log is compacted (all if omitted)
+            flush_interval: Maximum time (seconds) a new score stays buffered
+            compact_bytes: Compact when the log grows past this size
         """
-        self.scores_file = scores_file
-        self.scores = self._load_scores()
+        self.path = path
+        self.log_path = path + ".log"
+        self.lock_path = path + ".lock"
+        self.keep = keep
+        self.flush_interval = flush_interval
+        self.compact_bytes = compact_bytes
+        
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        # Position in the files: snapshot generation and identity, log inode and offset read up to
+        self._generation = 0
+        self._snapshot_id: Optional[Tuple[int, int]] = None
+        self._snapshot_bytes = 0
+        self._log_id: Optional[int] = None
+        self._offset = 0
+        # Entries added by other processes, read while appending ours
+        self._unseen: List[Dict[str, Any]] = []
+        self._reload_needed = False
+        
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+    
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        """Hold the lock file, exclusively to write or shared to read."""
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            os.close(fd)
+    
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Read every entry: the snapshot, the log, then the entries not written yet.
+        
+        Returns:
+            List of entries
+        """
+        with self._io_lock:
+            with self._locked(False):
+                entries = self._read_all()
+            with self._lock:
+                return entries + self._pending
     
-    def _load_scores(self) -> List[Dict[str, Any]]:
+    def read_new(self) -> Optional[List[Dict[str, Any]]]:
         """
-        Load high scores from file.
+        Read the entries added by other processes since the last read.
         
         Returns:
-            List of high score entries
+            List of new entries, or None if the files were compacted since
+            and everything must be read again with load()
         """
-        if os.path.exists(self.scores_file):
+        with self._io_lock:
+            if self._reload_needed or self._snapshot_changed():
+                return None
+            entries, self._unseen = self._unseen, []
             try:
-                with open(self.scores_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                # If file is corrupted or can't be read, return empty list
-                return []
-        else:
-            # If file doesn't exist, return empty list
-            return []
+                stat = os.stat(self.log_path)
+            except OSError:
+                return entries
+            if stat.st_ino != self._log_id:
+                return None
+            if stat.st_size > self._offset:
+                with self._locked(False):
+                    entries.extend(self._read_log_tail())
+            return entries
     
-    def _save_scores(self) -> None:
-        """Save high scores to file."""
+    def append(self, entry: Dict[str, Any]) -> None:
+        """
+        Store a new entry. It is written within flush_interval seconds.
+        
+        Args:
+            entry: Score entry
+        """
+        with self._lock:
+            self._pending.append(entry)
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="score-log-flusher", daemon=True)
+                self._flusher.start()
+                # Write buffered scores when the process exits
+                atexit.register(self.close)
+    
+    def flush(self) -> None:
+        """Append the buffered entries to the log with one write and fsync."""
+        # Entries leave the buffer under the I/O lock, so load() finds them in one or the other
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in pending).encode("utf-8")
+            with self._locked(True):
+                self._append(data)
+    
+    def _append(self, data: bytes) -> None:
+        """Append encoded entries to the log (the I/O lock and the exclusive file lock must be held)."""
+        self._catch_up()
+        if self._log_id is None:
+            self._start_log()
+        fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND)
         try:
-            with open(self.scores_file, "w", encoding="utf-8") as f:
-                json.dump(self.scores, f, ensure_ascii=False, indent=2)
-        except IOError:
-            # If file can't be written, just ignore
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self._offset += len(data)
+    
+    def compact(self) -> None:
+        """Rewrite the snapshot with the entries to keep and start the log over."""
+        self.flush()
+        with self._io_lock, self._locked(True):
+            # Entries other processes added meanwhile are still returned by read_new()
+            self._catch_up()
+            unseen = self._unseen
+            # Only entries dropped by `keep` require the owner to read everything again
+            reload_needed = self._reload_needed or self.keep is not None
+            entries = self._read_all()
+            if self.keep is not None:
+                entries = self.keep(entries)
+            generation = self._generation + 1
+            data = json.dumps({"format": SCORES_FORMAT, "generation": generation, "scores": entries},
+                              ensure_ascii=False).encode("utf-8")
+            self._replace(self.path, data)
+            self._generation = generation
+            self._snapshot_bytes = len(data)
+            with open(self.path, "rb") as f:
+                self._snapshot_id = _file_id(f.fileno())
+            self._start_log()
+            self._unseen = unseen
+            self._reload_needed = reload_needed
+    
+    def close(self) -> None:
+        """Write the buffered entries and stop the background thread."""
+        self._closed.set()
+        self.flush()
+    
+    def _flush_loop(self) -> None:
+        """Flush buffered entries every flush_interval seconds and compact the log when it has grown."""
+        while not self._closed.wait(self.flush_interval):
+            if self._pending:
+                self.flush()
+            if self._offset > max(self.compact_bytes, self._snapshot_bytes):
+                self.compact()
+    
+    def _read_all(self) -> List[Dict[str, Any]]:
+        """Read the snapshot and the log, and remember the position (the file lock must be held)."""
+        entries = self._read_snapshot()
+        self._log_id = None
+        self._offset = 0
+        try:
+            with open(self.log_path, "rb") as f:
+                log_id = os.fstat(f.fileno()).st_ino
+                header = f.readline()
+                # A log of another generation was left by an interrupted compaction
+                if header.endswith(b"\n") and json.loads(header).get("generation") == self._generation:
+                    new_entries, end = _parse_lines(f.read())
+                    entries.extend(new_entries)
+                    self._log_id = log_id
+                    self._offset = len(header) + end
+        except (OSError, ValueError):
             pass
+        self._unseen = []
+        self._reload_needed = False
+        return entries
+    
+    def _read_snapshot(self) -> List[Dict[str, Any]]:
+        """Read the snapshot and its generation (the file lock must be held)."""
+        self._generation = 0
+        self._snapshot_id = None
+        self._snapshot_bytes = 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._snapshot_id = _file_id(f.fileno())
+                self._snapshot_bytes = os.fstat(f.fileno()).st_size
+                data = json.load(f)
+        except (OSError, ValueError):
+            # If the file is missing or corrupted, start from no scores
+            return []
+        if isinstance(data, list):
+            # Scores file written before the log existed
+            return data
+        self._generation = data.get("generation", 0)
+        return list(data.get("scores", []))
+    
+    def _read_log_tail(self) -> List[Dict[str, Any]]:
+        """Read the log entries after the current offset (the file lock must be held)."""
+        with open(self.log_path, "rb") as f:
+            f.seek(self._offset)
+            entries, end = _parse_lines(f.read())
+        self._offset += end
+        return entries
+    
+    def _snapshot_changed(self) -> bool:
+        """Check whether another process compacted the files."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return self._snapshot_id is not None
+        return (stat.st_ino, stat.st_mtime_ns) != self._snapshot_id
+    
+    def _catch_up(self) -> None:
+        """Read what other processes wrote before appending (the exclusive lock must be held)."""
+        try:
+            log_id = os.stat(self.log_path).st_ino
+        except OSError:
+            log_id = None
+        if self._snapshot_changed() or log_id != self._log_id:
+            # Compacted by another process: find the new position, the owner reloads
+            self._read_all()
+            self._reload_needed = True
+        elif log_id is not None:
+            self._unseen.extend(self._read_log_tail())
+    
+    def _start_log(self) -> None:
+        """Start an empty log for the current generation (the exclusive lock must be held)."""
+        header = (json.dumps({"generation": self._generation}) + "\n").encode("utf-8")
+        self._replace(self.log_path, header)
+        self._log_id = os.stat(self.log_path).st_ino
+        self._offset = len(header)
+    
+    def _replace(self, path: str, data: bytes) -> None:
+        """Replace a file atomically and durably."""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+
+class HighScores:
+    """
+    HighScores class to handle tracking high scores.
+    
+    Every score is kept in a ranked index (see game.ranking), so the rank
+    of a score is found in O(log n) among all the scores ever logged.
+    """
+    
+    def __init__(self, scores_file: str = "scores.json", size: int = 10):
+        """
+        Initialize the high scores.
+        
+        Args:
+            scores_file: Path to the scores file
+            size: Number of scores shown
+        """
+        self.scores_file = scores_file
+        self.size = size
+        self.log = ScoreLog(scores_file)
+        self.ranking = RankedScores()
+        for entry in self.log.load():
+            self.ranking.add(entry)
+        self.scores = self.ranking.top(self.size)
     
     def add_score(self, name: str, score: int, health: int, fame: int) -> bool:
         """
@@ -69,24 +364,16 @@ class HighScores:
             "name": name,
             "score": score,
             "health": health,
-            "fame": fame
+            "fame": fame,
+            "time": int(time.time())
         }
         
-        # Add score to list
-        self.scores.append(new_score)
-        
-        # Sort scores by score (descending)
-        self.scores.sort(key=lambda x: x["score"], reverse=True)
-        
-        # Keep only top 10 scores
-        if len(self.scores) > 10:
-            self.scores = self.scores[:10]
-            # Check if new score is in top 10
-            return any(s["name"] == name and s["score"] == score for s in self.scores)
-        else:
-            # If less than 10 scores, new score is definitely in top 10
-            self._save_scores()
-            return True
+        # Every score is logged and ranked, the top ones are shown
+        self.log.append(new_score)
+        position = self.ranking.add(new_score)
+        if position < self.size:
+            self.scores = self.ranking.top(self.size)
+        return position < self.size
     
     def get_rank(self, score: int) -> int:
         """
@@ -98,14 +385,8 @@ class HighScores:
         Returns:
             int: Rank (1-10) or 0 if not in top 10
         """
-        for i, s in enumerate(self.scores):
-            if score >= s["score"]:
-                return i + 1
-        
-        if len(self.scores) < 10:
-            return len(self.scores) + 1
-        else:
-            return 0
+        rank = self.ranking.rank_of(score)
+        return rank if rank <= self.size else 0
     
     def show(self, ui) -> None:
         """
@@ -2,30 +2,34 @@
 # -*- coding: utf-8 -*-
 """
 Hospital module for Yolo Terminal game.
-Handles health management with insurance premiums and copays.
+Handles health management with insurance premiums and copays; treatment
+prices are game rules (see game.engine.GameRules).
 """
 
 from typing import Dict, List, Optional, Tuple, Any
 
+from game.engine import GameError
+
 class Hospital:
     """
     Hospital class to handle health management.
+    
+    Stateless, so games share the HOSPITAL instance.
     """
     
-    def __init__(self):
-        """Initialize the hospital."""
-        self.treatment_cost_per_point = 3500  # Base cost per health point
-        self.insurance_premium = 500  # Insurance premium per visit
-        self.copay_percentage = 20  # Copay percentage (20%)
+    def __reduce_ex__(self, protocol):
+        """Pickle HOSPITAL by reference instead of copying it into every game."""
+        return "HOSPITAL" if self is HOSPITAL else super().__reduce_ex__(protocol)
     
-    def visit(self, player, ui) -> None:
+    def visit(self, engine, ui) -> None:
         """
         Handle player's visit to the hospital.
         
         Args:
-            player: Player object
+            engine: GameEngine of the game
             ui: UI object for user interaction
         """
+        player = engine.player
         ui.clear_screen()
         ui.show_message("Welcome to the Hospital!")
         
@@ -33,22 +37,21 @@ class Hospital:
             ui.show_message("The doctor says: You're in perfect health, no treatment needed.")
             return
         
-        # Calculate treatment options
+        # Treatment plans: health points restored, copay and total cost.
+        # With partial treatments the plans go in steps of 5 points.
+        rules = engine.rules
         max_treatment = 100 - player.health
-        
-        # Calculate costs with insurance
-        premium_cost = self.insurance_premium
+        if rules.partial_treatment:
+            points = [i for i in range(1, max_treatment + 1) if i % 5 == 0 or i == max_treatment]
+        else:
+            points = [max_treatment]
         treatment_costs = []
-        
-        for i in range(1, max_treatment + 1):
-            if i % 5 == 0 or i == max_treatment:
-                base_cost = i * self.treatment_cost_per_point
-                copay_cost = int(base_cost * (self.copay_percentage / 100))
-                total_cost = premium_cost + copay_cost
-                treatment_costs.append((i, copay_cost, total_cost))
+        for health_points in points:
+            premium_cost, copay_cost = engine.hospital_cost(health_points)
+            treatment_costs.append((health_points, copay_cost, premium_cost + copay_cost))
         
         # Check if player can afford any treatment
-        if not treatment_costs or player.cash < treatment_costs[0][2]:
+        if player.cash < treatment_costs[0][2]:
             ui.show_message("The doctor says: You can't afford any treatment with your current insurance plan!")
             return
         
@@ -56,8 +59,8 @@ class Hospital:
         ui.clear_screen()
         print(f"Your Health: {player.health}/100")
         print(f"Your Cash: ${player.cash}")
-        print(f"Insurance Premium: ${premium_cost}")
-        print(f"Copay: {self.copay_percentage}% of treatment cost")
+        print(f"Insurance Premium: ${rules.hospital_fee}")
+        print(f"Copay: {rules.copay_percentage}% of treatment cost")
         print("\nTreatment Options:")
         
         options = []
@@ -66,10 +69,6 @@ class Hospital:
                 options.append((health_points, copay, total_cost))
                 print(f"  {i}. Recover {health_points} health points - Copay: ${copay} - Total: ${total_cost}")
         
-        if not options:
-            ui.show_message("The doctor says: You can't afford any treatment with your current insurance plan!")
-            return
-        
         print("  0. Exit")
         
         choice = ui.get_input("Select a treatment plan: ", input_type=int, default=0, min_value=0, max_value=len(options))
@@ -83,7 +82,17 @@ class Hospital:
         if not ui.ask_yes_no(f"Confirm spending ${total_cost} to recover {health_points} health points?"):
             return
         
-        player.cash -= total_cost
-        player.health += health_points
+        try:
+            if rules.partial_treatment:
+                engine.visit_hospital(health_points)
+            else:
+                engine.visit_hospital()
+        except GameError as e:
+            ui.show_message(f"The doctor says: {e}")
+            return
         
         ui.show_message(f"Treatment complete! Your health is now {player.health}/100")
+
+
+# Hospital shared by all games
+HOSPITAL = Hospital()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journal module for Yolo Terminal game.
+Records a game as its seed plus the ordered player actions, and replays
+a journal through the headless engine to rebuild the game's state at any
+day. Every random draw comes from the game's seeded streams, so a replay
+reproduces the game exactly.
+
+Usage:
+    python -m game.journal logs/20250101_120000_Trader_journal.jsonl --day 12
+    python -m game.journal --game-id 12345
+"""
+
+import argparse
+import json
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+from game.engine import GameEngine, GameError
+from game.player import Player
+from game.rng import GameRNG
+
+# Version of the journal format, stored in the header line
+JOURNAL_FORMAT = 1
+
+# Action codes: engine method and argument count
+ACTIONS = {
+    "N": ("advance_day", 0),
+    "B": ("buy", 2),
+    "S": ("sell", 2),
+    "D": ("deposit", 1),
+    "W": ("withdraw", 1),
+    "R": ("repay", 1),
+    "H": ("visit_hospital", 0),
+    "T": ("visit_hospital", 1),
+    "U": ("upgrade_trade_book", 0),
+    "X": ("visit_darkweb", 0),
+    "E": ("end_game", 1),
+    "M": ("set_cost_basis", 1),
+    "K": ("enable_hacker_actions", 0),
+    "G": ("collect_broker_rebate", 0),
+}
+
+class ReplayError(Exception):
+    """Raised when a journal cannot be replayed, e.g. an action is refused by the game rules."""
+    pass
+
+
+class ActionJournal:
+    """
+    ActionJournal class recording one game as its seed plus the ordered
+    actions of the player.
+
+    The journal is append-only: the engine records each action after it
+    succeeded, with the amounts actually applied. Refused actions do not
+    change the game and are not recorded. Entries carry no timestamps, so
+    the same game always produces the same journal.
+    """
+
+    def __init__(self, seed: int, player_name: str = "Trader", spawn_key: Tuple[int, ...] = ()):
+        """
+        Initialize an empty journal.
+
+        Args:
+            seed: Root seed of the game's random streams (GameRNG.seed)
+            player_name: Name of the player
+            spawn_key: Spawn key of the game's seed sequence, for games whose
+                streams were spawned from another seed (e.g. simulations)
+        """
+        self.seed = seed
+        self.player_name = player_name
+        self.spawn_key = tuple(spawn_key)
+        self.actions: List[Tuple[Any, ...]] = []
+
+    @classmethod
+    def for_game(cls, rng: GameRNG, player_name: str = "Trader") -> "ActionJournal":
+        """
+        Create the journal of a new game.
+
+        Args:
+            rng: Random streams of the game
+            player_name: Name of the player
+
+        Returns:
+            ActionJournal: Empty journal recording the game's seed
+        """
+        return cls(rng.seed, player_name, rng.seed_sequence.spawn_key)
+
+    def new_rng(self) -> GameRNG:
+        """Recreate the random streams of the game, as they were on day 1."""
+        return GameRNG(np.random.SeedSequence(self.seed, spawn_key=self.spawn_key))
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def record(self, code: str, *args: Any) -> None:
+        """
+        Append an action to the journal.
+
+        Args:
+            code: Action code (see ACTIONS)
+            *args: Arguments of the action
+        """
+        self.actions.append((code,) + args)
+
+    def header(self) -> Dict[str, Any]:
+        """Header of the journal: format version, seed and player name."""
+        header = {"format": JOURNAL_FORMAT, "seed": self.seed, "player": self.player_name}
+        if self.spawn_key:
+            header["spawn_key"] = list(self.spawn_key)
+        return header
+
+    def encode(self) -> str:
+        """
+        Encode the journal as JSON lines: the header, then one compact
+        line per action (e.g. ``["B",3,100]``).
+
+        Returns:
+            str: Encoded journal
+        """
+        lines = [json.dumps(self.header(), separators=(",", ":"))]
+        lines.extend(json.dumps(action, separators=(",", ":")) for action in self.actions)
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def decode(cls, text: str) -> "ActionJournal":
+        """
+        Decode a journal produced by encode. Every line after the header
+        must be an action with a known code.
+
+        Args:
+            text: Encoded journal
+
+        Returns:
+            ActionJournal: Decoded journal
+        """
+        lines = [line for line in text.splitlines() if line.strip()]
+        if not lines:
+            raise ReplayError("Empty journal")
+        header = json.loads(lines[0])
+        if header.get("format") != JOURNAL_FORMAT:
+            raise ReplayError(f"Unsupported journal format: {header.get('format')}")
+
+        journal = cls(header["seed"], header["player"], header.get("spawn_key", ()))
+        for number, line in enumerate(lines[1:], 2):
+            try:
+                action = json.loads(line)
+            except ValueError:
+                raise ReplayError(f"Line {number} is not JSON") from None
+            # Only actions follow the header, e.g. not the header of another game appended to the file
+            if not isinstance(action, list) or not action or action[0] not in ACTIONS:
+                raise ReplayError(f"Line {number} is not a journal action: {line[:80]}")
+            journal.record(*action)
+        return journal
+
+    @classmethod
+    def load(cls, path: str) -> "ActionJournal":
+        """
+        Load a journal from a file.
+
+        Args:
+            path: Path of the journal file
+
+        Returns:
+            ActionJournal: Loaded journal
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.decode(f.read())
+
+
+def new_engine(journal: ActionJournal) -> GameEngine:
+    """
+    Create the engine of a journal's game as it was on day 1.
+
+    Args:
+        journal: Journal of the game
+
+    Returns:
+        GameEngine: Engine of the new game, without logger or high scores
+    """
+    return GameEngine(player=Player(name=journal.player_name), rng=journal.new_rng())
+
+def apply_action(engine: GameEngine, action: Tuple[Any, ...]) -> Any:
+    """
+    Apply one journal action to an engine.
+
+    Args:
+        engine: GameEngine of the game
+        action: Journal action (code followed by its arguments)
+
+    Returns:
+        Result of the engine method
+    """
+    code, args = action[0], action[1:]
+    if code not in ACTIONS:
+        raise ReplayError(f"Unknown action code: {code}")
+    method, arg_count = ACTIONS[code]
+    if len(args) != arg_count:
+        raise ReplayError(f"Action {code} takes {arg_count} arguments, got {len(args)}")
+    return getattr(engine, method)(*args)
+
+def replay(journal: ActionJournal, day: Optional[int] = None, actions: Optional[int] = None) -> GameEngine:
+    """
+    Rebuild a game by fast-forwarding a new engine through the journal.
+
+    Args:
+        journal: Journal of the game
+        day: Stop at the end of this day, before advancing to the next
+            one (replays the whole journal if omitted)
+        actions: Stop after this many actions (optional)
+
+    Returns:
+        GameEngine: Engine holding the rebuilt game
+    """
+    engine = new_engine(journal)
+    entries = journal.actions if actions is None else journal.actions[:actions]
+    for index, action in enumerate(entries):
+        if day is not None and action[0] == "N" and engine.day >= day:
+            break
+        try:
+            apply_action(engine, action)
+        except GameError as e:
+            raise ReplayError(f"Action {index} {list(action)} was refused on day {engine.day}: {e}") from e
+    return engine
+
+def describe(engine: GameEngine) -> List[str]:
+    """
+    Describe a rebuilt game's state, for debugging.
+
+    Args:
+        engine: GameEngine of the game
+
+    Returns:
+        List of text lines
+    """
+    player = engine.player
+    lines = [
+        f"Player:    {player.name}",
+        f"Day:       {engine.day} ({player.days_left} days left)",
+        f"Cash:      ${player.cash}",
+        f"Savings:   ${player.bank_savings}",
+        f"Debt:      ${player.debt}",
+        f"Health:    {player.health}",
+        f"Trade book: {player.portfolio_used}/{player.portfolio_capacity}",
+        f"Net worth: ${engine.get_net_worth()} (portfolio ${engine.get_portfolio_value()})",
+        f"Realized:  ${player.portfolio.realized_pnl()} ({player.cost_basis})",
+    ]
+    for stock_id, stock_info in player.portfolio.items():
+        lines.append(f"  ${stock_info['ticker']}: {stock_info['quantity']} @ ${stock_info['price']}"
+                     f" (market ${engine.stock_manager.get_market_price(stock_id)})")
+        for lot in player.portfolio.get_lots(stock_id):
+            lines.append(f"    day {lot['day']}: {lot['quantity']} @ ${lot['price']}")
+    lines.append("Market:    " + ", ".join(
+        f"${ticker} ${price}" for _, ticker, _, price in engine.stock_manager.get_available_stocks()))
+    if engine.result is not None:
+        lines.append(f"Game over: {engine.result.reason}, final score ${engine.result.final_score}")
+    return lines
+
+def main():
+    """Replay a journal from the command line."""
+    parser = argparse.ArgumentParser(description="Rebuild a Yolo Terminal game from its action journal.")
+    parser.add_argument("journal", nargs="?", help="Journal file")
+    parser.add_argument("--game-id", help="Replay the journal of a game in the configured game store instead")
+    parser.add_argument("--day", type=int, default=None, help="Stop at the end of this day")
+    parser.add_argument("--actions", type=int, default=None, help="Stop after this many actions")
+    args = parser.parse_args()
+
+    if args.game_id:
+        from server.game_state import get_game_state
+        game_state = get_game_state(args.game_id)
+        if not game_state or 'journal' not in game_state:
+            parser.error(f"No journal for game {args.game_id}")
+        journal = game_state['journal']
+    elif args.journal:
+        journal = ActionJournal.load(args.journal)
+    else:
+        parser.error("Give a journal file or --game-id")
+
+    engine = replay(journal, args.day, args.actions)
+    print(f"Journal of {len(journal)} actions, seed {journal.seed}")
+    print("\n".join(describe(engine)))
+
+if __name__ == "__main__":
+    main()
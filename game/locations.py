@@ -6,16 +6,17 @@ Simplified to just handle days instead of locations.
 """
 
 from typing import Dict, List, Optional, Tuple
-import questionary
 
 class DayManager:
     """
     DayManager class to manage days in the game.
+    
+    Stateless, so games share the DAY_MANAGER instance.
     """
     
-    def __init__(self):
-        """Initialize the day manager."""
-        pass
+    def __reduce_ex__(self, protocol):
+        """Pickle DAY_MANAGER by reference."""
+        return "DAY_MANAGER" if self is DAY_MANAGER else super().__reduce_ex__(protocol)
     
     def get_current_day(self, player) -> int:
         """
@@ -53,3 +54,7 @@ class DayManager:
             return f"Day {day} - Final stretch"
         else:
             return f"Day {day} - Last day of trading"
+
+
+# Day manager shared by all games
+DAY_MANAGER = DayManager()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log writer module for Yolo Terminal game.
+Writes game log lines from a background thread in batches, so that logging
+a game event does not wait for disk I/O.
+"""
+
+import atexit
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from typing import IO, Dict, List, Optional
+
+class _CloseFile:
+    """Queue marker asking the writer thread to close a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+
+class LogWriter:
+    """
+    LogWriter class owning a bounded queue of log lines and a flush thread.
+
+    Lines are grouped per file and appended in batches. When the queue is
+    full, submit blocks until the writer catches up (backpressure). Each
+    game writes only to its own file; open files are kept in a bounded LRU
+    pool, so the number of file descriptors does not grow with the number
+    of games.
+    
+    A batch that fails to write is reported on stderr and dropped, and the
+    thread goes on with the next one. Should the thread stop anyway, submit
+    and flush write the queued lines themselves instead of waiting for it.
+    """
+
+    def __init__(self, max_pending: int = 10000, batch_size: int = 512, flush_interval: float = 0.2,
+                 max_open_files: int = 128):
+        """
+        Initialize the log writer and start its flush thread.
+
+        Args:
+            max_pending: Maximum number of queued lines before submit blocks
+            batch_size: Maximum number of lines written per batch
+            flush_interval: Maximum time (seconds) the thread waits for more lines
+            max_open_files: Maximum number of log files kept open at once
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_open_files = max_open_files
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        # Open files in least recently used order, only touched by the writer
+        # thread (or by callers holding _sync_lock once the thread is gone)
+        self._files: "OrderedDict[str, IO[str]]" = OrderedDict()
+        self._sync_lock = threading.Lock()
+        # Number of batches or files that failed to write
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name="game-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: str, text: str, timestamp: Optional[float] = None) -> None:
+        """
+        Queue text to be appended to a file.
+
+        Args:
+            path: Path of the file
+            text: Text to append (a newline is added)
+            timestamp: Time of the record, prefixed in the log format if given
+        """
+        self._put((path, text, timestamp))
+
+    def close_file(self, path: str) -> None:
+        """
+        Close a file once the lines submitted before this call are written.
+        Used when a game ends, so its file leaves the open file pool early.
+
+        Args:
+            path: Path of the file
+        """
+        self._put(_CloseFile(path))
+
+    @property
+    def open_files(self) -> int:
+        """Number of log files currently open."""
+        return len(self._files)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every line submitted so far has been written.
+
+        Args:
+            timeout: Maximum time (seconds) to wait, None waits indefinitely
+
+        Returns:
+            bool: True if everything was written, False on timeout
+        """
+        done = threading.Event()
+        self._put(done)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.flush_interval
+            if deadline is not None:
+                wait = max(0.0, min(wait, deadline - time.monotonic()))
+            if done.wait(wait):
+                return True
+            if not self._thread.is_alive():
+                # The thread stopped before reaching our marker, write the rest here
+                self._write_directly([])
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def _put(self, item) -> None:
+        """
+        Queue an item for the writer thread, waiting while the queue is full.
+        If the thread is gone, write the queued items and this one directly.
+
+        Args:
+            item: (path, text, timestamp) tuple, file close or flush event
+        """
+        while self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=self.flush_interval)
+                return
+            except queue.Full:
+                continue
+        self._write_directly([item])
+
+    def _write_directly(self, items: List) -> None:
+        """
+        Write the items left in the queue, then more items, in the calling thread.
+
+        Args:
+            items: Items to write after the queued ones
+        """
+        with self._sync_lock:
+            batch = []
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_safely(batch + items)
+
+    def _run(self) -> None:
+        """Collect queued lines into batches and write them."""
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and not isinstance(item, threading.Event):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+            self._write_safely(batch)
+
+    def _write_safely(self, batch: List) -> None:
+        """
+        Write a batch, reporting and dropping it if it fails, so that a bad
+        line never stops the writer or leaves flush waiting.
+
+        Args:
+            batch: Queued items
+        """
+        try:
+            self._write_batch(batch)
+        except Exception:
+            self.errors += 1
+            _report_error(f"Game log writer dropped a batch of {len(batch)} items")
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _write_batch(self, batch: List) -> None:
+        """
+        Append a batch of lines, one write per file, then release flush waiters.
+
+        Args:
+            batch: Queued (path, text, timestamp) tuples and flush events
+        """
+        lines: Dict[str, List[str]] = {}
+        closes = []
+        waiters = []
+        for item in batch:
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                continue
+            if isinstance(item, _CloseFile):
+                closes.append(item.path)
+                continue
+            path, text, timestamp = item
+            if timestamp is not None:
+                text = f"{format_timestamp(timestamp)} - INFO - {text}"
+            lines.setdefault(path, []).append(text)
+
+        for path, path_lines in lines.items():
+            try:
+                f = self._get_file(path)
+                f.write("\n".join(path_lines) + "\n")
+                f.flush()
+            except Exception:
+                # Logging must never break the game: report it and drop the lines
+                self.errors += 1
+                _report_error(f"Game log writer could not write {len(path_lines)} lines to {path}")
+                self._close(path)
+
+        for path in closes:
+            self._close(path)
+
+        for waiter in waiters:
+            waiter.set()
+
+    def _get_file(self, path: str) -> IO[str]:
+        """
+        Get an open file from the pool, evicting the least recently used one if full.
+
+        Args:
+            path: Path of the file
+
+        Returns:
+            File opened for appending
+        """
+        f = self._files.get(path)
+        if f is not None:
+            self._files.move_to_end(path)
+            return f
+
+        while len(self._files) >= self.max_open_files:
+            _, oldest = self._files.popitem(last=False)
+            oldest.close()
+
+        f = open(path, "a", encoding="utf-8")
+        self._files[path] = f
+        return f
+
+    def _close(self, path: str) -> None:
+        """
+        Close a file of the pool if it is open.
+
+        Args:
+            path: Path of the file
+        """
+        f = self._files.pop(path, None)
+        if f is not None:
+            try:
+                f.close()
+            except OSError:
+                pass
+
+
+def _report_error(message: str) -> None:
+    """
+    Report a failure of the log writer, with the exception being handled, on stderr.
+
+    Args:
+        message: What was lost
+    """
+    print(f"{message}:\n{traceback.format_exc()}", file=sys.stderr, end="")
+
+def format_timestamp(timestamp: float) -> str:
+    """
+    Format a timestamp like the logging module's default asctime.
+
+    Args:
+        timestamp: Seconds since the epoch
+
+    Returns:
+        str: Timestamp formatted as "YYYY-MM-DD HH:MM:SS,mmm"
+    """
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp)) + f",{int(timestamp % 1 * 1000):03d}"
+
+
+# Shared writer of this process, created on first use
+_log_writer: Optional[LogWriter] = None
+_log_writer_lock = threading.Lock()
+
+def get_log_writer() -> LogWriter:
+    """
+    Get the process-wide log writer, starting it on first use.
+
+    Returns:
+        LogWriter: Shared log writer
+    """
+    global _log_writer
+    if _log_writer is None:
+        with _log_writer_lock:
+            if _log_writer is None:
+                _log_writer = LogWriter()
+                atexit.register(_log_writer.flush, 5.0)
+    return _log_writer
+
+def _reset_after_fork() -> None:
+    """A forked child does not inherit the writer thread, so it starts its own."""
+    global _log_writer, _log_writer_lock
+    _log_writer = None
+    _log_writer_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -6,16 +6,21 @@ Handles logging game events to a file and tracking player stats over time.
 """
 
 import os
-import logging
+import time
 import datetime
 import json
 from typing import Dict, Any, Optional, List
 
+from game.log_writer import get_log_writer
+
 class GameLogger:
     """
     GameLogger class to handle logging game events and tracking player stats over time.
     """
     
+    # Number of days in a game
+    GAME_DAYS = 40
+    
     def __init__(self, player_name: str = "Unknown"):
         """
         Initialize the logger.
@@ -30,31 +35,36 @@ class GameLogger:
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         log_file = f"logs/{timestamp}_{player_name}.log"
         
-        # Configure logger
-        self.logger = logging.getLogger("yolo_terminal")
-        self.logger.setLevel(logging.INFO)
-        
-        # Create file handler
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
-        
-        # Create formatter
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        
-        # Add handler to logger
-        self.logger.addHandler(file_handler)
-        
         # Store the log file path
         self.log_file = log_file
         
-        # Initialize daily stats tracking
-        self.daily_stats = []
-        self.actions_log = []
+        # Log lines are written in batches by the shared background writer
+        self.writer = get_log_writer()
+        
+        # Initialize daily stats tracking: one preallocated slot per day
+        # (day 0 is unused, day 41 is logged when the last day ends)
+        self._daily_slots: List[Optional[Dict[str, Any]]] = [None] * (self.GAME_DAYS + 2)
+        self._history: Optional[List[Dict[str, Any]]] = None
+        self.history_version = 0
+        
+        # Action entries are streamed to a side file instead of growing in
+        # memory, and collected into the stats file when the game ends
+        self.actions_file = log_file.replace('.log', '_actions.jsonl')
         
         # Log game start
         self.log_event("GAME_START", {"player_name": player_name})
     
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the tracked stats without the process-local log writer."""
+        state = self.__dict__.copy()
+        del state["writer"]
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the tracked stats and use this process's log writer."""
+        self.__dict__.update(state)
+        self.writer = get_log_writer()
+    
     def log_event(self, event_type: str, data: Dict[str, Any] = None) -> None:
         """
         Log a game event.
@@ -69,8 +79,8 @@ class GameLogger:
         # Format the log message
         message = f"{event_type}: {data}"
         
-        # Log the event
-        self.logger.info(message)
+        # Queue the event for the background writer
+        self.writer.submit(self.log_file, message, time.time())
         
         # Track action in actions log
         current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -79,7 +89,7 @@ class GameLogger:
             "event_type": event_type,
             "data": data
         }
-        self.actions_log.append(action_entry)
+        self.writer.submit(self.actions_file, json.dumps(action_entry))
     
     def log_player_status(self, player, stock_manager=None) -> None:
         """
@@ -89,18 +99,9 @@ class GameLogger:
             player: Player object
             stock_manager: StockManager object (optional)
         """
-        # Calculate net worth and portfolio value if stock_manager is provided
-        net_worth = player.cash + player.bank_savings - player.debt
-        portfolio_value = 0
-        
-        if stock_manager and player.portfolio:
-            for stock_id, stock_info in player.portfolio.items():
-                # Find current market price
-                for market_stock_id, _, _, price in stock_manager.get_available_stocks():
-                    if market_stock_id == stock_id:
-                        portfolio_value += price * stock_info['quantity']
-                        break
-        
+        # Read the portfolio value, kept current by the stock manager, if it is provided
+        net_worth = player.get_net_worth()
+        portfolio_value = stock_manager.get_portfolio_value(player.portfolio) if stock_manager else 0
         total_assets = net_worth + portfolio_value
         
         # Extract player data
@@ -114,7 +115,7 @@ class GameLogger:
             "days_left": player.days_left,
             "portfolio_used": player.portfolio_used,
             "portfolio_capacity": player.portfolio_capacity,
-            "portfolio": player.portfolio,
+            "portfolio": dict(player.portfolio),
             "net_worth": net_worth,
             "portfolio_value": portfolio_value,
             "total_assets": total_assets,
@@ -138,16 +139,27 @@ class GameLogger:
                 "total_assets": total_assets
             }
             
-            # Check if we already have a stat for this day
-            day_exists = False
-            for i, stat in enumerate(self.daily_stats):
-                if stat["day"] == daily_stat["day"]:
-                    self.daily_stats[i] = daily_stat
-                    day_exists = True
-                    break
-            
-            if not day_exists:
-                self.daily_stats.append(daily_stat)
+            # Replace any stat already recorded for this day
+            self._set_daily_stat(daily_stat["day"], daily_stat)
+    
+    def _set_daily_stat(self, day: int, daily_stat: Dict[str, Any]) -> None:
+        """
+        Record the stats of a day and invalidate the cached history.
+        
+        Args:
+            day: Day number
+            daily_stat: Stats of the day
+        """
+        if day >= len(self._daily_slots):
+            self._daily_slots.extend([None] * (day + 1 - len(self._daily_slots)))
+        self._daily_slots[day] = daily_stat
+        self._history = None
+        self.history_version += 1
+    
+    @property
+    def daily_stats(self) -> List[Dict[str, Any]]:
+        """Recorded daily stats, sorted by day."""
+        return self.get_net_worth_history()
     
     def log_next_day(self, player, stock_manager=None) -> None:
         """
@@ -194,7 +206,7 @@ class GameLogger:
         
         self.log_event("BUY", buy_data)
     
-    def log_sell(self, player, stock_id: int, ticker: str, name: str, quantity: int, price: int, buy_price: int) -> None:
+    def log_sell(self, player, stock_id: int, ticker: str, name: str, quantity: int, price: int, cost: int) -> None:
         """
         Log a sell event.
         
@@ -205,9 +217,8 @@ class GameLogger:
             name: Name of the stock
             quantity: Quantity of stocks sold
             price: Price per share
-            buy_price: Original buy price per share
+            cost: Cost basis of the stocks sold, by the player's cost basis method
         """
-        profit = (price - buy_price) * quantity
         sell_data = {
             "player_name": player.name,
             "stock_id": stock_id,
@@ -215,8 +226,10 @@ class GameLogger:
             "name": name,
             "quantity": quantity,
             "price": price,
-            "buy_price": buy_price,
-            "profit": profit,
+            "buy_price": cost // quantity,
+            "cost_basis": cost,
+            "cost_basis_method": player.cost_basis,
+            "profit": price * quantity - cost,
             "total_revenue": price * quantity,
             "cash_after": player.cash
         }
@@ -270,16 +283,8 @@ class GameLogger:
             final_score: Final score
             stock_manager: StockManager object (optional)
         """
-        # Calculate final portfolio value
-        portfolio_value = 0
-        if stock_manager and player.portfolio:
-            for stock_id, stock_info in player.portfolio.items():
-                # Find current market price
-                for market_stock_id, _, _, price in stock_manager.get_available_stocks():
-                    if market_stock_id == stock_id:
-                        portfolio_value += price * stock_info['quantity']
-                        break
-        
+        # Final portfolio value, kept current by the stock manager
+        portfolio_value = stock_manager.get_portfolio_value(player.portfolio) if stock_manager else 0
         total_assets = final_score + portfolio_value
         
         end_data = {
@@ -298,26 +303,88 @@ class GameLogger:
         
         self.log_event("GAME_END", end_data)
         
-        # Save daily stats to a JSON file
+        # Save daily stats to a JSON file. It is written whole, replacing the
+        # file of an earlier end of the game, whose actions it keeps (the
+        # actions file was removed once they were collected)
         stats_file = self.log_file.replace('.log', '_stats.json')
-        with open(stats_file, 'w') as f:
+        actions_log = self.get_actions_log()
+        try:
+            with open(stats_file, "r", encoding="utf-8") as f:
+                actions_log = json.load(f).get("actions_log", []) + actions_log
+        except (OSError, ValueError):
+            pass
+        temp_file = stats_file + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
             json.dump({
                 "daily_stats": self.daily_stats,
-                "actions_log": self.actions_log,
+                "actions_log": actions_log,
                 "end_data": end_data
             }, f, indent=2)
+        os.replace(temp_file, stats_file)
+        
+        # Release the open files of this game and make sure the log is on
+        # disk before reporting it
+        self.writer.close_file(self.log_file)
+        self.writer.flush()
+        
+        # The actions are in the stats file now
+        try:
+            os.remove(self.actions_file)
+        except OSError:
+            pass
         
         # Log the log file paths
         print(f"\nGame log saved to: {self.log_file}")
         print(f"Game stats saved to: {stats_file}")
     
+    def get_actions_log(self) -> List[Dict[str, Any]]:
+        """
+        Read back the action entries logged so far.
+        
+        Returns:
+            List of action entries (timestamp, event type and data)
+        """
+        self.writer.close_file(self.actions_file)
+        self.writer.flush()
+        try:
+            with open(self.actions_file, "r", encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except OSError:
+            return []
+    
+    def close(self) -> None:
+        """
+        Release the log files of the game, e.g. when it leaves memory.
+        They are reopened for appending if the game logs again.
+        """
+        self.writer.close_file(self.log_file)
+        self.writer.close_file(self.actions_file)
+    
+    def save_journal(self, journal) -> None:
+        """
+        Save the action journal of the game next to the log file, so the
+        game can be replayed later (see game.journal). The file is written
+        whole, replacing the journal saved by an earlier end of the game.
+        
+        Args:
+            journal: ActionJournal of the game
+        """
+        journal_file = self.log_file.replace('.log', '_journal.jsonl')
+        temp_file = journal_file + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            f.write(journal.encode())
+        os.replace(temp_file, journal_file)
+    
     def get_net_worth_history(self) -> List[Dict[str, Any]]:
         """
         Get the history of player's net worth over time.
         
+        The slots are indexed by day, so the list is already sorted. It is
+        cached until a day's stats change and must not be modified by callers.
+        
         Returns:
             List of daily stats dictionaries sorted by day
         """
-        # Sort by day
-        sorted_stats = sorted(self.daily_stats, key=lambda x: x["day"])
-        return sorted_stats
+        if self._history is None:
+            self._history = [stat for stat in self._daily_slots if stat is not None]
+        return self._history
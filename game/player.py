@@ -5,7 +5,291 @@ Player module for Yolo Terminal game.
 Handles player stats, portfolio, and other attributes.
 """
 
-from typing import Dict, List, Optional
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from game.stocks import STOCK_DEFINITIONS
+
+# Cost basis methods: which lots a sale takes its shares from
+FIFO = "fifo"
+LIFO = "lifo"
+AVERAGE = "average"
+COST_BASIS_METHODS = {
+    FIFO: "FIFO (oldest lots first)",
+    LIFO: "LIFO (newest lots first)",
+    AVERAGE: "Average cost",
+}
+
+# A lot of shares bought on the same day at the same price:
+# (quantity, cost of the quantity, day bought, profit realized on its sold shares)
+Lot = Tuple[int, int, int, int]
+
+def _cost_taken(cost: int, quantity: int, taken: int) -> int:
+    """
+    Cost of the shares taken out of a lot.
+    
+    The remaining shares keep floor(cost * remaining / quantity), whose
+    average floor(remaining cost / remaining) is the average of the lot, so
+    taking shares never changes the average cost of the rest.
+    """
+    return cost - cost * (quantity - taken) // quantity
+
+class Portfolio(Mapping):
+    """
+    Portfolio class holding a player's stocks in fixed-size arrays indexed
+    by stock ID: the quantity held, its cost basis (the total price paid
+    for the shares still held) and the profit realized by sales, all exact
+    integers. A ledger of lots records the purchases behind each holding,
+    oldest first, and sales take their shares out of the lots by FIFO,
+    LIFO or average cost.
+    
+    The portfolio also keeps its market value current: marks holds the
+    price each stock is valued at (0 when it is not tradable), which the
+    StockManager tracking the portfolio updates on every price change
+    (see StockManager.track), and value is the sum of the marks times the
+    quantities. Trades and price changes update value in O(1).
+    
+    It reads like the original dict of holdings, stock_id -> {"ticker",
+    "name", "quantity", "price"}, where price is the average cost. Those
+    dicts are built on access from the ticker catalog, so they are
+    read-only: change the portfolio with add() and remove().
+    """
+    
+    __slots__ = ("quantities", "costs", "realized", "lots", "marks", "value")
+    
+    def __init__(self, num_stocks: int = len(STOCK_DEFINITIONS)):
+        """
+        Initialize an empty portfolio.
+        
+        Args:
+            num_stocks: Number of stock types
+        """
+        self.quantities = array("q", bytes(8 * num_stocks))
+        self.costs = array("q", bytes(8 * num_stocks))
+        self.realized = array("q", bytes(8 * num_stocks))
+        # Lots of the stocks held, oldest first
+        self.lots: Dict[int, Deque[Lot]] = {}
+        # Market valuation
+        self.marks = array("q", bytes(8 * num_stocks))
+        self.value = 0
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the arrays and the lots."""
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a pickled portfolio."""
+        for name, value in state.items():
+            setattr(self, name, value)
+    
+    def add(self, stock_id: int, quantity: int, price: int, day: int = 0) -> None:
+        """
+        Add shares bought at a price.
+        
+        Args:
+            stock_id: ID of the stock
+            quantity: Number of shares
+            price: Price per share
+            day: Day the shares were bought
+        """
+        self.quantities[stock_id] += quantity
+        self.costs[stock_id] += quantity * price
+        self.value += self.marks[stock_id] * quantity
+        
+        lots = self.lots.get(stock_id)
+        if lots is None:
+            lots = self.lots[stock_id] = deque()
+        if lots:
+            last_quantity, last_cost, last_day, last_realized = lots[-1]
+            if last_day == day and last_cost == last_quantity * price:
+                # Same day and price as the last lot: extend it
+                lots[-1] = (last_quantity + quantity, last_cost + quantity * price, day, last_realized)
+                return
+        lots.append((quantity, quantity * price, day, 0))
+    
+    def remove(self, stock_id: int, quantity: int, method: str = FIFO, price: Optional[int] = None) -> int:
+        """
+        Remove shares, taking them out of the lots by a cost basis method.
+        
+        FIFO and LIFO pop whole lots from the oldest or newest end of the
+        deque, and split at most one lot. Average cost first pools the lots
+        into one, so every later sale takes from a single lot. Every lot is
+        added and popped once, so a sale costs O(1) amortized, whatever the
+        number of lots held.
+        
+        Args:
+            stock_id: ID of the stock
+            quantity: Number of shares (at most the quantity held)
+            method: Cost basis method (FIFO, LIFO or AVERAGE)
+            price: Sale price per share, to record the realized profit (omit
+                if the shares are not sold at a market price)
+            
+        Returns:
+            int: Cost basis of the shares removed
+        """
+        lots = self.lots[stock_id]
+        if method == AVERAGE and len(lots) > 1:
+            pooled = (self.quantities[stock_id], self.costs[stock_id], lots[0][2], sum(lot[3] for lot in lots))
+            lots.clear()
+            lots.append(pooled)
+        
+        # Take the shares from the newest end for LIFO, the oldest end otherwise
+        end = -1 if method == LIFO else 0
+        pop = lots.pop if method == LIFO else lots.popleft
+        cost = 0
+        remaining = quantity
+        while remaining:
+            lot_quantity, lot_cost, day, realized = lots[end]
+            part = min(remaining, lot_quantity)
+            part_cost = _cost_taken(lot_cost, lot_quantity, part)
+            if price is not None:
+                realized += part * price - part_cost
+                self.realized[stock_id] += part * price - part_cost
+            if part == lot_quantity:
+                pop()
+            else:
+                lots[end] = (lot_quantity - part, lot_cost - part_cost, day, realized)
+            cost += part_cost
+            remaining -= part
+        
+        if not lots:
+            del self.lots[stock_id]
+        
+        self.quantities[stock_id] -= quantity
+        self.costs[stock_id] -= cost
+        self.value -= self.marks[stock_id] * quantity
+        return cost
+    
+    def mark(self, stock_id: int, price: int) -> None:
+        """
+        Value a stock at a new price.
+        
+        Args:
+            stock_id: ID of the stock
+            price: Price per share (0 if the stock is not tradable)
+        """
+        self.value += (price - self.marks[stock_id]) * self.quantities[stock_id]
+        self.marks[stock_id] = price
+    
+    def mark_all(self, prices: List[int]) -> None:
+        """
+        Value every stock at new prices.
+        
+        Args:
+            prices: Price per share of each stock, by stock ID (0 if not tradable)
+        """
+        for stock_id, price in enumerate(prices):
+            if price != self.marks[stock_id]:
+                self.mark(stock_id, price)
+    
+    def cost_of(self, stock_id: int, quantity: int, method: str = FIFO) -> int:
+        """
+        Get the cost basis of shares, as remove() would take them, without removing them.
+        
+        Args:
+            stock_id: ID of the stock
+            quantity: Number of shares (at most the quantity held)
+            method: Cost basis method (FIFO, LIFO or AVERAGE)
+            
+        Returns:
+            int: Cost basis of the shares
+        """
+        if method == AVERAGE:
+            return _cost_taken(self.costs[stock_id], self.quantities[stock_id], quantity)
+        lots = self.lots.get(stock_id, ())
+        cost = 0
+        for lot_quantity, lot_cost, _, _ in (reversed(lots) if method == LIFO else lots):
+            if quantity <= 0:
+                break
+            part = min(quantity, lot_quantity)
+            cost += _cost_taken(lot_cost, lot_quantity, part)
+            quantity -= part
+        return cost
+    
+    def quantity(self, stock_id: int) -> int:
+        """Number of shares of a stock held."""
+        return self.quantities[stock_id]
+    
+    def average_price(self, stock_id: int) -> int:
+        """Average cost of the shares of a stock held (rounded down, 0 if none)."""
+        quantity = self.quantities[stock_id]
+        return self.costs[stock_id] // quantity if quantity else 0
+    
+    def realized_pnl(self, stock_id: Optional[int] = None) -> int:
+        """
+        Get the profit realized by sales (negative for a loss).
+        
+        Args:
+            stock_id: ID of the stock (all stocks if omitted)
+            
+        Returns:
+            int: Sale proceeds minus the cost basis of the shares sold
+        """
+        if stock_id is None:
+            return sum(self.realized)
+        return self.realized[stock_id]
+    
+    def unrealized_pnl(self, stock_id: int, market_price: int) -> int:
+        """
+        Get the profit the shares of a stock held would realize at a price.
+        
+        Args:
+            stock_id: ID of the stock
+            market_price: Price per share
+            
+        Returns:
+            int: Market value minus the cost basis of the shares held
+        """
+        return market_price * self.quantities[stock_id] - self.costs[stock_id]
+    
+    def get_lots(self, stock_id: int, market_price: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the lots of a stock held, oldest first.
+        
+        Args:
+            stock_id: ID of the stock
+            market_price: Price per share for the unrealized profit (omitted if not tradable)
+            
+        Returns:
+            List of lots: quantity, price (average cost per share), cost,
+            day bought, realized profit and unrealized profit (None without a market price)
+        """
+        return [
+            {
+                "quantity": quantity,
+                "price": cost // quantity,
+                "cost": cost,
+                "day": day,
+                "realized": realized,
+                "unrealized": None if market_price is None else market_price * quantity - cost
+            }
+            for quantity, cost, day, realized in self.lots.get(stock_id, ())
+        ]
+    
+    def __getitem__(self, stock_id: int) -> Dict[str, Any]:
+        if stock_id not in self:
+            raise KeyError(stock_id)
+        _, ticker, name, _, _ = STOCK_DEFINITIONS[stock_id]
+        quantity = self.quantities[stock_id]
+        return {"ticker": ticker, "name": name, "quantity": quantity, "price": self.costs[stock_id] // quantity}
+    
+    def __contains__(self, stock_id: object) -> bool:
+        try:
+            return stock_id >= 0 and self.quantities[stock_id] > 0
+        except (IndexError, TypeError):
+            return False
+    
+    def __iter__(self) -> Iterator[int]:
+        return (stock_id for stock_id, quantity in enumerate(self.quantities) if quantity)
+    
+    def __len__(self) -> int:
+        return sum(1 for quantity in self.quantities if quantity)
+    
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
 
 class Player:
     """
@@ -13,6 +297,10 @@ class Player:
     Manages player stats, portfolio, and other attributes.
     """
     
+    __slots__ = ("name", "days_left", "cash", "debt", "bank_savings", "health", "fame",
+                 "portfolio", "portfolio_capacity", "portfolio_used", "cost_basis",
+                 "darkweb_visits", "sound_enabled", "hacker_actions_enabled")
+    
     def __init__(self, name: str = "Trader"):
         """
         Initialize a new player.
@@ -32,15 +320,30 @@ class Player:
         self.fame = 100  # Initial reputation
         
         # Portfolio
-        self.portfolio: Dict[int, Dict[str, any]] = {}  # Stocks in portfolio
+        self.portfolio = Portfolio()  # Stocks in portfolio
         self.portfolio_capacity = 100  # Max trade book size
         self.portfolio_used = 0  # Current used capacity
+        self.cost_basis = FIFO  # Lots sold first (see COST_BASIS_METHODS)
         
         # Special flags
         self.darkweb_visits = 0  # Number of darkweb visits
         self.sound_enabled = True  # Sound enabled flag
         self.hacker_actions_enabled = False  # Hacker actions enabled flag
     
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the player's attributes."""
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a pickled player."""
+        for name, value in state.items():
+            setattr(self, name, value)
+    
+    @property
+    def day(self) -> int:
+        """Current day number (day 1 with 40 days left)."""
+        return 41 - self.days_left
+    
     def get_net_worth(self) -> int:
         """
         Calculate player's net worth.
@@ -68,8 +371,8 @@ class Player:
         
         Args:
             stock_id: ID of the stock
-            ticker: Ticker symbol of the stock
-            name: Name of the stock
+            ticker: Ticker symbol of the stock (the portfolio reads it from the ticker catalog)
+            name: Name of the stock (the portfolio reads it from the ticker catalog)
             quantity: Quantity to add
             price: Price per share
             
@@ -79,51 +382,45 @@ class Player:
         if not self.has_portfolio_space(quantity):
             return False
         
-        # If stock already in portfolio, update quantity and average price
-        if stock_id in self.portfolio:
-            old_quantity = self.portfolio[stock_id]["quantity"]
-            old_price = self.portfolio[stock_id]["price"]
-            
-            # Calculate new average price
-            new_price = int((old_price * old_quantity + price * quantity) / (old_quantity + quantity))
-            
-            # Update portfolio
-            self.portfolio[stock_id]["quantity"] += quantity
-            self.portfolio[stock_id]["price"] = new_price
-        else:
-            # Add new stock to portfolio
-            self.portfolio[stock_id] = {
-                "ticker": ticker,
-                "name": name,
-                "quantity": quantity,
-                "price": price
-            }
+        # The shares form a new lot of today; the average price is derived from the cost basis
+        self.portfolio.add(stock_id, quantity, price, self.day)
         
         # Update portfolio used
         self.portfolio_used += quantity
         return True
     
-    def remove_from_portfolio(self, stock_id: int, quantity: int) -> bool:
+    def sell_from_portfolio(self, stock_id: int, quantity: int, price: Optional[int] = None) -> Optional[int]:
         """
-        Remove stocks from player's portfolio.
+        Remove stocks from player's portfolio, taking them out of the lots
+        by the player's cost basis method.
         
         Args:
             stock_id: ID of the stock
             quantity: Quantity to remove
+            price: Sale price per share, to record the realized profit (optional)
             
         Returns:
-            bool: True if stocks were removed successfully, False otherwise
+            int: Cost basis of the stocks removed, None if the player does not hold them
         """
-        if stock_id not in self.portfolio or self.portfolio[stock_id]["quantity"] < quantity:
-            return False
+        if stock_id not in self.portfolio or self.portfolio.quantity(stock_id) < quantity:
+            return None
         
-        # Update portfolio
-        self.portfolio[stock_id]["quantity"] -= quantity
-        
-        # If quantity is 0, remove stock from portfolio
-        if self.portfolio[stock_id]["quantity"] == 0:
-            del self.portfolio[stock_id]
+        # Update portfolio (a stock with no shares left is no longer listed)
+        cost = self.portfolio.remove(stock_id, quantity, self.cost_basis, price)
         
         # Update portfolio used
         self.portfolio_used -= quantity
-        return True
+        return cost
+    
+    def remove_from_portfolio(self, stock_id: int, quantity: int) -> bool:
+        """
+        Remove stocks from player's portfolio.
+        
+        Args:
+            stock_id: ID of the stock
+            quantity: Quantity to remove
+            
+        Returns:
+            bool: True if stocks were removed successfully, False otherwise
+        """
+        return self.sell_from_portfolio(stock_id, quantity) is not None
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Price engine module for Yolo Terminal game.
+Keeps stock prices and market availability in NumPy arrays so that a single
+game, or a whole batch of games, is updated with one batched draw per day.
+"""
+
+from typing import Optional, Sequence
+import numpy as np
+
+class PriceEngine:
+    """
+    PriceEngine class holding array-backed prices for one or more games.
+
+    Prices and availability are stored as ``(num_games, num_stocks)`` arrays.
+    Row ``g`` is the market of game ``g``; column ``s`` is stock ID ``s``.
+    """
+
+    def __init__(self, base_prices: Sequence[int], price_ranges: Sequence[int],
+                 num_games: int = 1, rng: Optional[np.random.Generator] = None):
+        """
+        Initialize the price engine.
+
+        Args:
+            base_prices: Base price of each stock, indexed by stock ID
+            price_ranges: Range of price fluctuation of each stock
+            num_games: Number of games updated together
+            rng: NumPy random generator (a fresh one is created if omitted)
+        """
+        self.base_prices = np.asarray(base_prices, dtype=np.int64)
+        self.price_ranges = np.asarray(price_ranges, dtype=np.int64)
+        self.num_games = num_games
+        self.num_stocks = len(self.base_prices)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        # Per-game market state
+        self.current_prices = np.zeros((num_games, self.num_stocks), dtype=np.int64)
+        self.available = np.ones((num_games, self.num_stocks), dtype=bool)
+
+    def update_prices(self, leave_out: int = 3) -> None:
+        """
+        Roll new prices for every stock of every game and randomly make some
+        stocks unavailable.
+
+        Each price is drawn uniformly from ``[base_price, base_price + price_range]``.
+        ``leave_out`` stock IDs are then picked per game (with replacement, so
+        fewer than ``leave_out`` stocks may end up unavailable).
+
+        Args:
+            leave_out: Number of stock picks to leave out of the market per game
+        """
+        shape = (self.num_games, self.num_stocks)
+        np.add(self.base_prices, self.rng.integers(0, self.price_ranges + 1, size=shape),
+               out=self.current_prices)
+
+        self.available.fill(True)
+        if leave_out > 0:
+            picks = self.rng.integers(0, self.num_stocks, size=(self.num_games, leave_out))
+            rows = np.arange(self.num_games)[:, None]
+            self.available[rows, picks] = False
+
+    def update_price(self, stock_id: int, game: int = 0) -> int:
+        """
+        Roll a new price for a single stock of a single game.
+
+        Args:
+            stock_id: ID of the stock
+            game: Index of the game
+
+        Returns:
+            int: New price of the stock
+        """
+        price = self.base_prices[stock_id] + self.rng.integers(0, self.price_ranges[stock_id] + 1)
+        self.current_prices[game, stock_id] = price
+        return int(price)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ranking module for Yolo Terminal game.
+Keeps scores in a ranked index, so the rank of a score and any page of
+the ranking are found in O(log n), however many scores are kept.
+"""
+
+import itertools
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+# Sorted items of a RankedScores: best score first, oldest first among
+# equal scores (the sequence is unique, so items never compare further)
+ScoreItem = Tuple[int, int, str, int, int, Optional[int]]
+
+class RankedIndex:
+    """
+    RankedIndex class keeping sorted items with positional access.
+
+    Items are kept in sorted blocks of at most 2 * load items, and a
+    Fenwick tree over the block lengths gives the number of items before
+    any block in O(log(n / load)). Inserting an item, finding the position
+    of a value and reaching the item at a position all cost O(log n) plus
+    a move of at most 2 * load items.
+    """
+
+    def __init__(self, load: int = 512):
+        """
+        Initialize an empty index.
+
+        Args:
+            load: Block size; blocks are split when they reach twice this size
+        """
+        self.load = load
+        self._blocks: List[List[Any]] = []
+        # Last item of each block, to find the block of a value
+        self._maxes: List[Any] = []
+        # Fenwick tree (1-based) of the block lengths
+        self._tree: List[int] = [0]
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def insert(self, item: Any) -> int:
+        """
+        Insert an item.
+
+        Args:
+            item: Item, comparable with the other items
+
+        Returns:
+            int: Position of the item (0-based)
+        """
+        if not self._blocks:
+            self._blocks.append([item])
+            self._maxes.append(item)
+            self._rebuild()
+            self._len = 1
+            return 0
+
+        index = bisect_left(self._maxes, item)
+        if index == len(self._blocks):
+            index -= 1
+            block = self._blocks[index]
+            offset = len(block)
+            block.append(item)
+            self._maxes[index] = item
+        else:
+            block = self._blocks[index]
+            offset = bisect_left(block, item)
+            block.insert(offset, item)
+        position = self._prefix(index) + offset
+        self._len += 1
+
+        if len(block) >= 2 * self.load:
+            # Split the block in two; the tree is rebuilt once per `load` inserts
+            self._blocks[index:index + 1] = [block[:self.load], block[self.load:]]
+            self._maxes[index:index + 1] = [block[self.load - 1], block[-1]]
+            self._rebuild()
+        else:
+            self._add(index, 1)
+        return position
+
+    def position(self, value: Any) -> int:
+        """
+        Count the items smaller than a value.
+
+        Args:
+            value: Value comparable with the items
+
+        Returns:
+            int: Position the value would be inserted at
+        """
+        index = bisect_left(self._maxes, value)
+        if index == len(self._blocks):
+            return self._len
+        return self._prefix(index) + bisect_left(self._blocks[index], value)
+
+    def slice(self, start: int, stop: int) -> List[Any]:
+        """
+        Get the items between two positions.
+
+        Args:
+            start: First position
+            stop: Position after the last one
+
+        Returns:
+            List of items
+        """
+        start = max(start, 0)
+        stop = min(stop, self._len)
+        if start >= stop:
+            return []
+        index, offset = self._locate(start)
+        items: List[Any] = []
+        while len(items) < stop - start:
+            block = self._blocks[index]
+            items.extend(block[offset:offset + stop - start - len(items)])
+            index += 1
+            offset = 0
+        return items
+
+    def _prefix(self, index: int) -> int:
+        """Number of items in the blocks before a block."""
+        total = 0
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def _add(self, index: int, delta: int) -> None:
+        """Change the length of a block in the tree."""
+        index += 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def _locate(self, position: int) -> Tuple[int, int]:
+        """Find the block holding a position and the offset in it."""
+        index = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            following = index + step
+            if following < len(self._tree) and self._tree[following] <= position:
+                index = following
+                position -= self._tree[following]
+            step >>= 1
+        return index, position
+
+    def _rebuild(self) -> None:
+        """Build the tree from the block lengths in O(number of blocks)."""
+        tree = [0] + [len(block) for block in self._blocks]
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+
+
+class RankedScores:
+    """
+    RankedScores class ranking score entries, best score first.
+
+    Entries are dicts with name, score, health, fame and optionally time.
+    They are stored as tuples, which take about half the memory of the
+    dicts when millions of scores are kept. Equal scores rank in the
+    order they were added.
+    """
+
+    def __init__(self):
+        """Initialize an empty ranking."""
+        self._index = RankedIndex()
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, entry: Dict[str, Any]) -> int:
+        """
+        Add a score entry.
+
+        Args:
+            entry: Score entry
+
+        Returns:
+            int: Position of the entry (0-based)
+        """
+        item = (-entry["score"], next(self._sequence), entry["name"],
+                entry.get("health", 0), entry.get("fame", 0), entry.get("time"))
+        return self._index.insert(item)
+
+    def rank_of(self, score: int) -> int:
+        """
+        Get the rank a score has or would have: one more than the number of better scores.
+
+        Args:
+            score: Score
+
+        Returns:
+            int: Rank (1 for the best score)
+        """
+        return self._index.position((-score,)) + 1
+
+    def page(self, offset: int = 0, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get a page of the ranking.
+
+        Args:
+            offset: Number of entries skipped
+            limit: Number of entries returned at most
+
+        Returns:
+            List of entries with their rank; equal scores share a rank
+        """
+        items = self._index.slice(offset, offset + limit)
+        entries = []
+        for position, item in enumerate(items, offset):
+            if position == offset:
+                # The first entry may share its score with entries of earlier pages
+                rank = self._index.position(item[:1]) + 1
+            elif item[0] != items[position - offset - 1][0]:
+                rank = position + 1
+            entries.append(self._entry(item, rank))
+        return entries
+
+    def top(self, count: int) -> List[Dict[str, Any]]:
+        """
+        Get the best entries, without ranks.
+
+        Args:
+            count: Number of entries
+
+        Returns:
+            List of entries, best first
+        """
+        return [self._entry(item) for item in self._index.slice(0, count)]
+
+    def _entry(self, item: ScoreItem, rank: Optional[int] = None) -> Dict[str, Any]:
+        """Convert a stored item back to a score entry."""
+        entry: Dict[str, Any] = {"name": item[2], "score": -item[0], "health": item[3], "fame": item[4]}
+        if item[5] is not None:
+            entry["time"] = item[5]
+        if rank is not None:
+            entry["rank"] = rank
+        return entry
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Random number module for Yolo Terminal game.
+Gives each game its own seedable random streams, one per subsystem, so
+games are reproducible and never share generator state.
+"""
+
+import random
+from typing import List, Union
+import numpy as np
+
+SeedLike = Union[None, int, np.random.SeedSequence]
+
+def _python_random(seed_sequence: np.random.SeedSequence) -> random.Random:
+    """
+    Create a Python random generator seeded from a seed sequence.
+
+    Args:
+        seed_sequence: Seed sequence of the stream
+
+    Returns:
+        random.Random: Independent generator
+    """
+    state = seed_sequence.generate_state(4, np.uint64)
+    return random.Random(int.from_bytes(state.tobytes(), "little"))
+
+
+class GameRNG:
+    """
+    GameRNG class holding the independent random streams of one game.
+
+    All streams are spawned from one seed sequence, so a game is fully
+    determined by its seed. Prices are drawn in batches from a NumPy
+    generator; subsystems drawing one number at a time use Python's
+    random.Random, which is faster for scalar draws.
+
+    Streams:
+        prices: NumPy generator for stock prices and market availability
+        events: random.Random for market, health, money and hacker events
+        headlines: random.Random for news headlines
+        darkweb: random.Random for darkweb rewards and tips
+    """
+
+    def __init__(self, seed: SeedLike = None):
+        """
+        Initialize the streams of a game.
+
+        Args:
+            seed: Integer seed or SeedSequence (fresh entropy if omitted)
+        """
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+
+        prices, events, headlines, darkweb = self.seed_sequence.spawn(4)
+        self.prices = np.random.default_rng(prices)
+        self.events = _python_random(events)
+        self.headlines = _python_random(headlines)
+        self.darkweb = _python_random(darkweb)
+
+    @property
+    def seed(self) -> int:
+        """Root entropy of the game, enough to recreate the streams of a generator that was not spawned."""
+        return self.seed_sequence.entropy
+
+    def random_stream(self) -> random.Random:
+        """
+        Split off a new independent stream, e.g. for a strategy policy
+        or an extension that needs its own randomness.
+
+        Returns:
+            random.Random: Generator independent of all other streams
+        """
+        return _python_random(self.seed_sequence.spawn(1)[0])
+
+    def spawn(self, count: int) -> List["GameRNG"]:
+        """
+        Split off independent GameRNGs, e.g. one per game of a simulation batch.
+
+        Args:
+            count: Number of generators
+
+        Returns:
+            List of GameRNG objects
+        """
+        return [GameRNG(child) for child in self.seed_sequence.spawn(count)]
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulation module for Yolo Terminal game.
+Plays whole 40-day games headlessly with strategy policies, across a
+process pool, and reports the distribution of outcomes. Used to tune the
+game's economy.
+
+Usage:
+    python -m game.simulate --games 100000 --strategy bargain --workers 4 --seed 42
+"""
+
+import argparse
+import importlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+from game.engine import GameEngine, GameError
+from game.rng import GameRNG
+
+# Game end reasons, stored as small integer codes in the results
+REASON_CODES = {"DAYS_OVER": 0, "HEALTH_ZERO": 1}
+
+class Strategy:
+    """
+    Strategy base class: a policy deciding the player's actions for a day.
+
+    Strategies are created once per batch of games and must keep any
+    per-game state in start_game. Randomness must come from a stream split
+    off the game's generator (engine.rng.random_stream()), so that runs are
+    reproducible.
+    """
+
+    def start_game(self, engine: GameEngine) -> None:
+        """
+        Called before the first day of a game.
+
+        Args:
+            engine: GameEngine of the new game
+        """
+        pass
+
+    def play_day(self, engine: GameEngine) -> None:
+        """
+        Take the day's actions before the engine advances to the next day.
+
+        Args:
+            engine: GameEngine of the game
+        """
+        raise NotImplementedError
+
+
+class IdleStrategy(Strategy):
+    """Never trade: measures the cost of debt interest and random events alone."""
+
+    def play_day(self, engine: GameEngine) -> None:
+        pass
+
+
+class RandomStrategy(Strategy):
+    """Buy and sell random stocks in random amounts."""
+
+    def start_game(self, engine: GameEngine) -> None:
+        self.random = engine.rng.random_stream()
+
+    def play_day(self, engine: GameEngine) -> None:
+        stock_manager = engine.stock_manager
+        for stock_id in list(engine.player.portfolio):
+            if self.random.random() < 0.5:
+                try:
+                    engine.sell(stock_id, self.random.randint(1, engine.player.portfolio[stock_id]['quantity']))
+                except GameError:
+                    pass
+
+        available_stocks = stock_manager.get_available_stocks()
+        if available_stocks:
+            stock_id = self.random.choice(available_stocks)[0]
+            max_buy = engine.max_buy(stock_id)
+            if max_buy > 0:
+                engine.buy(stock_id, self.random.randint(1, max_buy))
+
+
+class BargainStrategy(Strategy):
+    """
+    Sell holdings at a profit, buy the stock priced lowest in its range with
+    all the cash, and repay the debt before the last days.
+    """
+
+    # Buy only stocks priced below this fraction of their range
+    BUY_BELOW = 0.35
+
+    def play_day(self, engine: GameEngine) -> None:
+        player = engine.player
+        stock_manager = engine.stock_manager
+
+        # Take profits
+        for stock_id, stock_info in list(player.portfolio.items()):
+            if stock_manager.is_available(stock_id) and stock_manager.get_market_price(stock_id) > stock_info['price']:
+                engine.sell(stock_id, stock_info['quantity'])
+
+        # Repay the debt before the debt collector shows up
+        if player.days_left <= 12 and player.debt > 0 and player.cash > 0:
+            engine.repay(min(player.cash, player.debt))
+
+        # Buy the best bargain of the day
+        best = None
+        for stock_id, _, _, price in stock_manager.get_available_stocks():
+            _, _, _, base_price, price_range = stock_manager.STOCK_DEFINITIONS[stock_id]
+            position = (price - base_price) / price_range
+            if position < self.BUY_BELOW and (best is None or position < best[1]):
+                best = (stock_id, position)
+        if best is not None and player.days_left > 1:
+            max_buy = engine.max_buy(best[0])
+            if max_buy > 0:
+                engine.buy(best[0], max_buy)
+
+
+class SaverStrategy(BargainStrategy):
+    """Repay the debt as soon as possible, then trade like BargainStrategy."""
+
+    def play_day(self, engine: GameEngine) -> None:
+        player = engine.player
+        if player.debt > 0 and player.cash > 0:
+            engine.repay(min(player.cash, player.debt))
+        super().play_day(engine)
+
+
+# Built-in strategies by name; other strategies can be given as "module:Class"
+STRATEGIES = {
+    "idle": IdleStrategy,
+    "random": RandomStrategy,
+    "bargain": BargainStrategy,
+    "saver": SaverStrategy,
+}
+
+def load_strategy(name: str) -> Strategy:
+    """
+    Create a strategy by name or by import path.
+
+    Args:
+        name: Built-in strategy name, or "package.module:ClassName"
+
+    Returns:
+        Strategy: New strategy instance
+    """
+    if name in STRATEGIES:
+        return STRATEGIES[name]()
+    if ":" not in name:
+        raise ValueError(f"Unknown strategy: {name} (built-in: {', '.join(STRATEGIES)})")
+    module_name, _, class_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+def play_game(engine: GameEngine, strategy: Strategy) -> Tuple[int, str]:
+    """
+    Play one game to the end.
+
+    Args:
+        engine: GameEngine of a new game
+        strategy: Strategy choosing the player's actions
+
+    Returns:
+        Tuple (final score, game end reason)
+    """
+    strategy.start_game(engine)
+    while engine.result is None:
+        strategy.play_day(engine)
+
+        # Actions such as darkweb visits can end the game before the day does
+        reason = engine.game_over_reason()
+        if reason:
+            engine.end_game(reason)
+            break
+        engine.advance_day()
+    return engine.result.final_score, engine.result.reason
+
+def simulate_batch(strategy_name: str, num_games: int, seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Play a batch of games with one seed. Runs in a worker process.
+
+    Args:
+        strategy_name: Strategy name (see load_strategy)
+        num_games: Number of games to play
+        seed: Seed of the batch
+
+    Returns:
+        Tuple of arrays (final scores, game end reason codes)
+    """
+    strategy = load_strategy(strategy_name)
+
+    scores = np.empty(num_games, dtype=np.int64)
+    reasons = np.empty(num_games, dtype=np.uint8)
+    # Every game gets its own random streams, split off the batch seed
+    for i, rng in enumerate(GameRNG(seed).spawn(num_games)):
+        engine = GameEngine(rng=rng)
+        scores[i], reason = play_game(engine, strategy)
+        reasons[i] = REASON_CODES[reason]
+    return scores, reasons
+
+def run_simulation(num_games: int, strategy_name: str = "bargain", workers: Optional[int] = None,
+                   seed: Optional[int] = None, batch_size: int = 1000) -> Dict[str, float]:
+    """
+    Play many games across a process pool and summarize the outcomes.
+
+    Games are split into batches of batch_size, each with its own seed
+    spawned from the root seed, so results do not depend on the number of
+    workers.
+
+    Args:
+        num_games: Number of games to play
+        strategy_name: Strategy name (see load_strategy)
+        workers: Number of worker processes (defaults to the number of CPUs, 1 runs in process)
+        seed: Root seed (random if omitted)
+        batch_size: Number of games per batch
+
+    Returns:
+        dict: Summary statistics (see summarize)
+    """
+    load_strategy(strategy_name)  # Fail early on unknown strategies
+    workers = workers or os.cpu_count() or 1
+
+    sizes = [batch_size] * (num_games // batch_size)
+    if num_games % batch_size:
+        sizes.append(num_games % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers == 1:
+        results = [simulate_batch(strategy_name, size, batch_seed) for size, batch_seed in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(simulate_batch, [strategy_name] * len(sizes), sizes, seeds))
+
+    scores = np.concatenate([batch_scores for batch_scores, _ in results])
+    reasons = np.concatenate([batch_reasons for _, batch_reasons in results])
+    return summarize(scores, reasons)
+
+def summarize(scores: np.ndarray, reasons: np.ndarray) -> Dict[str, float]:
+    """
+    Summarize the outcomes of simulated games.
+
+    A game is counted as bankrupt when it ends with more debt than cash and
+    savings (a negative final score).
+
+    Args:
+        scores: Final scores
+        reasons: Game end reason codes
+
+    Returns:
+        dict: Number of games, death and bankruptcy rates and score distribution
+    """
+    summary = {
+        "games": int(len(scores)),
+        "death_rate": float(np.mean(reasons == REASON_CODES["HEALTH_ZERO"])),
+        "bankruptcy_rate": float(np.mean(scores < 0)),
+        "mean": float(np.mean(scores)),
+        "std": float(np.std(scores)),
+        "min": int(np.min(scores)),
+        "max": int(np.max(scores)),
+    }
+    for percentile in (1, 5, 25, 50, 75, 95, 99):
+        summary[f"p{percentile}"] = float(np.percentile(scores, percentile))
+    return summary
+
+def main():
+    """Run the simulator from the command line."""
+    parser = argparse.ArgumentParser(description="Play many Yolo Terminal games and report the outcomes.")
+    parser.add_argument("--games", type=int, default=10000, help="Number of games to play")
+    parser.add_argument("--strategy", default="bargain",
+                        help=f"Strategy: {', '.join(STRATEGIES)} or module:Class")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: number of CPUs)")
+    parser.add_argument("--seed", type=int, default=None, help="Root seed for reproducible runs")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Games per batch")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary = run_simulation(args.games, args.strategy, args.workers, args.seed, args.batch_size)
+    elapsed = time.perf_counter() - start
+
+    print(f"Strategy: {args.strategy}, {summary['games']} games in {elapsed:.1f}s "
+          f"({summary['games'] / elapsed:.0f} games/s)")
+    print(f"Death rate:       {summary['death_rate']:.2%}")
+    print(f"Bankruptcy rate:  {summary['bankruptcy_rate']:.2%}")
+    print(f"Final score:      mean ${summary['mean']:,.0f}, std ${summary['std']:,.0f}")
+    print(f"                  min ${summary['min']:,}, max ${summary['max']:,}")
+    print("Percentiles:      " + ", ".join(
+        f"p{p} ${summary[f'p{p}']:,.0f}" for p in (1, 5, 25, 50, 75, 95, 99)))
+
+if __name__ == "__main__":
+    main()
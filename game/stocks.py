@@ -5,17 +5,45 @@ Stocks module for Yolo Terminal game.
 Handles stocks and trading system.
 """
 
-import random
-from typing import Dict, List, Optional, Tuple
-import questionary
-from colorama import Fore, Style
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+from game.price_engine import PriceEngine
+
+# Ticker catalog shared by every game: (stock_id, ticker, name, base_price, price_range)
+STOCK_DEFINITIONS: Tuple[Tuple[int, str, str, int, int], ...] = (
+    (0, "SNCI", "Super Nicron", 100, 350),
+    (1, "PITCOIN", "Pitcoin", 15000, 15000),
+    (2, "CATO", "Cato Coin", 5, 50),
+    (3, "NWDA", "nWidia", 1000, 2500),
+    (4, "SBY", "SBY500", 5000, 9000),
+    (5, "TZLA", "Tezla", 250, 600),
+    (6, "PTT", "PinTuoTuo", 750, 750),
+    (7, "PLTI", "Plantir", 65, 180)
+)
+
+def _read_only(values: List[int]) -> np.ndarray:
+    """Build a constant array that price engines share instead of copying."""
+    array = np.array(values, dtype=np.int64)
+    array.flags.writeable = False
+    return array
+
+BASE_PRICES = _read_only([base_price for _, _, _, base_price, _ in STOCK_DEFINITIONS])
+PRICE_RANGES = _read_only([price_range for _, _, _, _, price_range in STOCK_DEFINITIONS])
 
 class Stock:
     """
     Stock class representing a type of stock in the game.
+    The current price lives in the owning PriceEngine's price array.
     """
     
-    def __init__(self, stock_id: int, ticker: str, name: str, base_price: int, price_range: int):
+    __slots__ = ("id", "ticker", "name", "base_price", "price_range", "_column", "_engine", "_on_price_change")
+    
+    def __init__(self, stock_id: int, ticker: str, name: str, base_price: int, price_range: int,
+                 engine: Optional[PriceEngine] = None, on_price_change: Optional[Callable[[int], None]] = None,
+                 initial_price: Optional[int] = None):
         """
         Initialize a new stock type.
         
@@ -25,14 +53,43 @@ class Stock:
             name: Name of the stock
             base_price: Base price of the stock
             price_range: Range of price fluctuation
+            engine: PriceEngine holding the stock's price (a standalone one if omitted)
+            on_price_change: Callback invoked with the stock ID whenever the price changes
+            initial_price: Starting price (drawn randomly if omitted)
         """
         self.id = stock_id
         self.ticker = ticker
         self.name = name
         self.base_price = base_price
         self.price_range = price_range
-        self.current_price = 0
-        self.update_price()
+        
+        # Column of this stock in the engine's price arrays
+        if engine is None:
+            engine = PriceEngine([base_price], [price_range])
+            self._column = 0
+        else:
+            self._column = stock_id
+        self._engine = engine
+        self._on_price_change = on_price_change
+        if initial_price is None:
+            self.update_price()
+        else:
+            engine.current_prices[0, self._column] = initial_price
+    
+    @property
+    def current_price(self) -> int:
+        """Current price of the stock."""
+        return int(self._engine.current_prices[0, self._column])
+    
+    @current_price.setter
+    def current_price(self, price: int) -> None:
+        self._engine.current_prices[0, self._column] = price
+        self._price_changed()
+    
+    def _price_changed(self) -> None:
+        """Notify the owner that this stock's price changed."""
+        if self._on_price_change:
+            self._on_price_change(self.id)
     
     def update_price(self) -> int:
         """
@@ -41,8 +98,9 @@ class Stock:
         Returns:
             int: New price of the stock
         """
-        self.current_price = self.base_price + random.randint(0, self.price_range)
-        return self.current_price
+        price = self._engine.update_price(self._column)
+        self._price_changed()
+        return price
     
     def multiply_price(self, factor: int) -> int:
         """
@@ -55,7 +113,8 @@ class Stock:
         Returns:
             int: New price of the stock
         """
-        self.current_price *= factor
+        self._engine.current_prices[0, self._column] *= factor
+        self._price_changed()
         return self.current_price
     
     def divide_price(self, factor: int) -> int:
@@ -69,309 +128,249 @@ class Stock:
         Returns:
             int: New price of the stock
         """
-        self.current_price //= factor
+        self._engine.current_prices[0, self._column] //= factor
+        self._price_changed()
         return self.current_price
 
 
 class StockManager:
     """
     StockManager class to manage all stocks and trading operations.
+    
+    The ticker catalog is shared by every game; a game only owns its price
+    engine (today's prices and availability) and the quote index built
+    from it. Stock objects are views on the price engine, created when
+    needed.
+    
+    Portfolios tracked by the manager are marked to market whenever a
+    quote changes, so their value is always current (see Portfolio.mark).
     """
     
-    def __init__(self):
-        """Initialize the stock manager with all available stock types."""
-        # Initialize all stock types
-        self.stock_types: Dict[int, Stock] = {
-            0: Stock(0, "SNCI", "Super Nicron", 100, 350),
-            1: Stock(1, "PITCOIN", "Pitcoin", 15000, 15000),
-            2: Stock(2, "CATO", "Cato Coin", 5, 50),
-            3: Stock(3, "NWDA", "nWidia", 1000, 2500),
-            4: Stock(4, "SBY", "SBY500", 5000, 9000),
-            5: Stock(5, "TZLA", "Tezla", 250, 600),
-            6: Stock(6, "PTT", "PinTuoTuo", 750, 750),
-            7: Stock(7, "PLTI", "Plantir", 65, 180)
-        }
-        
-        # Available stocks in the market (some stocks may not be available)
-        self.available_stocks: Dict[int, bool] = {stock_id: True for stock_id in self.stock_types}
+    STOCK_DEFINITIONS = STOCK_DEFINITIONS
     
-    def update_prices(self, leave_out: int = 3) -> None:
+    def __init__(self, rng: Optional[np.random.Generator] = None):
         """
-        Update prices of all stocks and randomly make some unavailable.
+        Initialize the stock manager with all available stock types.
         
         Args:
-            leave_out: Number of stock types to leave out of the market
+            rng: NumPy random generator for prices (a fresh one is created if omitted)
         """
-        # Make all stocks available first
-        self.available_stocks = {stock_id: True for stock_id in self.stock_types}
-        
-        # Update prices
-        for stock in self.stock_types.values():
-            stock.update_price()
+        self._create_engine(rng)
+        self._rebuild_index()
+    
+    def _create_engine(self, rng: Optional[np.random.Generator], prices: Optional[List[int]] = None) -> None:
+        """
+        Create the price engine of the game.
         
-        # Randomly make some stocks unavailable
-        for _ in range(leave_out):
-            stock_id = random.choice(list(self.stock_types.keys()))
-            self.available_stocks[stock_id] = False
+        Args:
+            rng: NumPy random generator for prices (a fresh one is created if omitted)
+            prices: Current price of each stock (drawn randomly if omitted)
+        """
+        # Array-backed prices and availability for this game
+        self.price_engine = PriceEngine(BASE_PRICES, PRICE_RANGES, rng=rng)
+        if prices is None:
+            # One draw per stock, in stock ID order
+            for stock_id, _, _, _, _ in self.STOCK_DEFINITIONS:
+                self.price_engine.update_price(stock_id)
+        else:
+            self.price_engine.current_prices[0] = prices
+        
+        # Per-day quote index: stock_id -> (ticker, name, price, available)
+        self.quotes: Dict[int, Tuple[str, str, int, bool]] = {}
+        self._available_list: List[Tuple[int, str, str, int]] = []
+        
+        # Portfolios marked to market on every quote change (not pickled)
+        self._portfolios: List[Any] = []
+        
+        # Views on every stock, built on first use (see stock_types)
+        self._stock_types: Optional[Mapping] = None
     
-    def get_available_stocks(self) -> List[Tuple[int, str, str, int]]:
+    def stock(self, stock_id: int) -> Stock:
         """
-        Get list of available stocks in the market.
+        Get a stock, backed by this game's prices.
         
+        Args:
+            stock_id: ID of the stock
+            
         Returns:
-            List of tuples (stock_id, ticker, name, price) for available stocks
+            Stock: View on the stock's price; changing it updates the quotes
         """
-        available = []
-        for stock_id, available_flag in self.available_stocks.items():
-            if available_flag:
-                stock = self.stock_types[stock_id]
-                available.append((stock_id, stock.ticker, stock.name, stock.current_price))
-        return available
+        _, ticker, name, base_price, price_range = self.STOCK_DEFINITIONS[stock_id]
+        return Stock(stock_id, ticker, name, base_price, price_range, self.price_engine,
+                     on_price_change=self._refresh_quote,
+                     initial_price=self.price_engine.current_prices[0, stock_id])
     
-    def buy_stocks(self, player, ui, logger=None, day_manager=None) -> str:
+    @property
+    def stock_types(self) -> Mapping:
+        """
+        All stock types, by ID (see stock). Built once per game and returned
+        as the same read-only mapping of the same Stock views on every access.
         """
-        Handle buying stocks from the market.
+        if self._stock_types is None:
+            self._stock_types = MappingProxyType(
+                {stock_id: self.stock(stock_id) for stock_id, _, _, _, _ in self.STOCK_DEFINITIONS})
+        return self._stock_types
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle only today's prices, availability and generator; the ticker catalog is shared."""
+        return {
+            'current_prices': self.price_engine.current_prices[0].tolist(),
+            'available': self.price_engine.available[0].tolist(),
+            'rng': self.price_engine.rng
+        }
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a stock manager pickled by __getstate__, without drawing new prices."""
+        # The pickled generator continues exactly where the game was pickled
+        self._create_engine(state.get('rng'), state['current_prices'])
+        self.price_engine.available[0] = state['available']
+        self._rebuild_index()
+    
+    @property
+    def available_stocks(self) -> Dict[int, bool]:
+        """Available stocks in the market (some stocks may not be available)."""
+        return {stock_id: quote[3] for stock_id, quote in self.quotes.items()}
+    
+    def is_available(self, stock_id: int) -> bool:
+        """
+        Check whether a stock is tradable in the market today.
         
         Args:
-            player: Player object
-            ui: UI object for user interaction
-            logger: GameLogger object for logging (optional)
-            day_manager: DayManager object (optional)
+            stock_id: ID of the stock
+            
+        Returns:
+            bool: True if the stock is available, False otherwise
         """
-        # Get available stocks
-        available_stocks = self.get_available_stocks()
-        
-        if not available_stocks:
-            ui.show_message("There are no stocks available for trading right now.", player, self, day_manager)
-            return "exit"
-        
-        # Create choices for the stocks menu
-        choices = []
-        for i, (stock_id, ticker, name, price) in enumerate(available_stocks, 1):
-            choices.append(questionary.Choice(
-                title=f"${ticker} ({name}) - Price: ${price}",
-                value=(stock_id, ticker, name, price)
-            ))
-        
-        # Add cancel option
-        choices.append(questionary.Separator())
-        choices.append(questionary.Choice(title='Cancel', value=None))
-        
-        # Ask player which stock to buy
-        stock_choice = ui.custom_select(
-            'Available stocks:',
-            choices=choices,
-            parent_menu_result=None
-        )
-        
-        if not stock_choice:
-            return "exit"
-        
-        try:
-            stock_id, ticker, name, price = stock_choice
-        except (ValueError, TypeError):
-            # Handle case where stock_choice is not a tuple of 4 values
-            return "exit"
-        
-        # Check if player has enough money
-        if player.cash < price:
-            ui.show_message("You don't have enough cash to buy even one share of this stock.")
-            return "continue"
-        
-        # Calculate max amount player can buy
-        max_buy = min(player.cash // price, player.portfolio_capacity - player.portfolio_used)
-        if max_buy <= 0:
-            ui.show_message("You don't have enough space in your trade book or cash to buy this stock.")
-            return "continue"
-        
-        # Ask how many to buy
-        amount = ui.get_input(f"How many shares of ${ticker} do you want to buy? (max {max_buy}): ", 
-                             input_type=int, default=1, min_value=1, max_value=max_buy)
-        
-        # Confirm purchase
-        if not ui.ask_yes_no(f"Confirm purchase of {amount} shares of ${ticker} for ${price * amount}?"):
-            return "continue"
-        
-        # Process purchase
-        player.cash -= price * amount
-        player.add_to_portfolio(stock_id, ticker, name, amount, price)
-        
-        # Log the purchase if logger is provided
-        if logger:
-            logger.log_buy(player, stock_id, ticker, name, amount, price)
+        quote = self.quotes.get(stock_id)
+        return quote is not None and quote[3]
+    
+    def update_prices(self, leave_out: int = 3) -> None:
+        """
+        Update prices of all stocks and randomly make some unavailable.
+        All prices and the left-out stocks are drawn in one batch by the price engine.
         
-        ui.show_message(f"You bought {amount} shares of ${ticker} for ${price * amount}.", player, self, day_manager)
-        return "continue"
+        Args:
+            leave_out: Number of stock types to leave out of the market
+        """
+        self.price_engine.update_prices(leave_out)
+        self._rebuild_index()
     
-    def sell_stocks(self, player, ui, logger=None, day_manager=None) -> str:
+    def _rebuild_index(self) -> None:
+        """Rebuild the quote index and the available stocks list from the price engine."""
+        prices = self.price_engine.current_prices[0].tolist()
+        flags = self.price_engine.available[0].tolist()
+        self.quotes = {
+            stock_id: (ticker, name, prices[stock_id], flags[stock_id])
+            for stock_id, ticker, name, _, _ in self.STOCK_DEFINITIONS
+        }
+        self._available_list = [
+            (stock_id, ticker, name, price)
+            for stock_id, (ticker, name, price, available) in self.quotes.items()
+            if available
+        ]
+        if self._portfolios:
+            marks = self._marks()
+            for portfolio in self._portfolios:
+                portfolio.mark_all(marks)
+    
+    def _marks(self) -> List[int]:
+        """Price each stock is valued at: today's price if tradable, 0 otherwise."""
+        return [price if available else 0 for _, _, price, available in self.quotes.values()]
+    
+    def track(self, portfolio) -> None:
         """
-        Handle selling stocks to the market.
+        Keep a portfolio marked to market: value it at today's prices now,
+        and again whenever a quote changes. Tracking a portfolio again does
+        nothing.
         
         Args:
-            player: Player object
-            ui: UI object for user interaction
-            logger: GameLogger object for logging (optional)
-            day_manager: DayManager object (optional)
-        """
-        if not player.portfolio:
-            ui.show_message("You don't have any stocks to sell.", player, self, day_manager)
-            return "exit"
+            portfolio: Player's Portfolio
+        """
+        for tracked in self._portfolios:
+            if tracked is portfolio:
+                return
+        self._portfolios.append(portfolio)
+        portfolio.mark_all(self._marks())
+    
+    def _refresh_quote(self, stock_id: int) -> None:
+        """
+        Refresh a single quote after a stock's price changed (e.g. by a market event).
         
-        # Create choices for the portfolio menu
-        choices = []
-        portfolio_list = []
+        Args:
+            stock_id: ID of the stock whose price changed
+        """
+        ticker, name, _, available = self.quotes[stock_id]
+        price = int(self.price_engine.current_prices[0, stock_id])
+        self.quotes[stock_id] = (ticker, name, price, available)
+        if available:
+            self._available_list = [
+                (sid, t, n, price if sid == stock_id else p)
+                for sid, t, n, p in self._available_list
+            ]
+            for portfolio in self._portfolios:
+                portfolio.mark(stock_id, price)
+    
+    def get_quote(self, stock_id: int) -> Optional[Tuple[str, str, int]]:
+        """
+        Look up today's quote for a stock.
         
-        for i, (stock_id, stock_info) in enumerate(player.portfolio.items(), 1):
-            portfolio_list.append((stock_id, stock_info["ticker"], stock_info["name"], stock_info["quantity"], stock_info["price"]))
-            
-            # Check if stock is available in market
-            market_price = 0
-            is_available = False
-            for market_stock_id, ticker, name, price in self.get_available_stocks():
-                if market_stock_id == stock_id:
-                    market_price = price
-                    is_available = True
-                    break
-            
-            # Prepare information for display
-            is_profitable = market_price > stock_info['price']
-            
-            # Create title without color codes for questionary
-            title = f"${stock_info['ticker']} ({stock_info['name']}) - Qty: {stock_info['quantity']} - Bought: ${stock_info['price']}"
-            if is_available:
-                title += f" - Current: ${market_price}"
-                profit = market_price - stock_info['price']
-                if profit > 0:
-                    title += f" (+${profit})"
-                else:
-                    title += f" (-${-profit})"
-                
-            # Print colored version to console for reference
-            status_line = ""
-            if is_available:
-                status_line += f"{Fore.GREEN}${stock_info['ticker']} ({stock_info['name']}){Style.RESET_ALL} - Qty: {stock_info['quantity']} - "
-                if is_profitable:
-                    status_line += f"{Fore.YELLOW}Bought: ${stock_info['price']}{Style.RESET_ALL}"
-                else:
-                    status_line += f"{Fore.RED}Bought: ${stock_info['price']}{Style.RESET_ALL}"
-                
-                status_line += f" - Current: ${market_price}"
-                if is_profitable:
-                    status_line += f" ({Fore.GREEN}+${market_price - stock_info['price']}{Style.RESET_ALL})"
-                else:
-                    status_line += f" ({Fore.RED}-${stock_info['price'] - market_price}{Style.RESET_ALL})"
-            else:
-                status_line += f"${stock_info['ticker']} ({stock_info['name']}) - Qty: {stock_info['quantity']} - Bought: ${stock_info['price']}"
-                status_line += " (Not tradable now)"
-            
-            print(f"{i}. {status_line}")
+        Args:
+            stock_id: ID of the stock
             
-            choices.append(questionary.Choice(
-                title=title,
-                value=(stock_id, stock_info["ticker"], stock_info["name"], stock_info["quantity"], stock_info["price"])
-            ))
-        
-        # Add cancel option
-        choices.append(questionary.Separator())
-        choices.append(questionary.Choice(title='Cancel', value=None))
-        
-        # Ask player which stock to sell
-        stock_choice = ui.custom_select(
-            'Your portfolio:',
-            choices=choices,
-            parent_menu_result=None
-        )
-        
-        if not stock_choice:
-            return "exit"
-        
-        try:
-            stock_id, ticker, name, quantity, buy_price = stock_choice
-        except (ValueError, TypeError):
-            # Handle case where stock_choice is not a tuple of 5 values
-            return "exit"
-        
-        # Check if the stock is available in the market
-        market_price = 0
-        is_available = False
-        for market_stock_id, market_ticker, market_name, price in self.get_available_stocks():
-            if market_stock_id == stock_id:
-                market_price = price
-                is_available = True
-                break
-        
-        if not is_available:
-            ui.show_message(f"${ticker} is not currently tradable in the market.", player, self, day_manager)
-            return "continue"
-        
-        # Ask how many to sell
-        amount = ui.get_input(f"How many shares of ${ticker} do you want to sell? (max {quantity}): ", 
-                             input_type=int, default=1, min_value=1, max_value=quantity)
-        
-        # Confirm sale
-        profit = (market_price - buy_price) * amount
-        profit_str = f"Profit: ${profit}" if profit >= 0 else f"Loss: ${-profit}"
-        
-        if not ui.ask_yes_no(f"Confirm sale of {amount} shares of ${ticker} at ${market_price} each? {profit_str}"):
-            return "continue"
-        
-        # Process sale
-        player.cash += market_price * amount
-        player.remove_from_portfolio(stock_id, amount)
-        
-        # Log the sale if logger is provided
-        if logger:
-            logger.log_sell(player, stock_id, ticker, name, amount, market_price, buy_price)
-        
-        ui.show_message(f"You sold {amount} shares of ${ticker} for ${market_price * amount}.", player, self, day_manager)
-        
-        return "continue"
+        Returns:
+            Tuple (ticker, name, price) if the stock is tradable today, None otherwise
+        """
+        quote = self.quotes.get(stock_id)
+        if quote is None or not quote[3]:
+            return None
+        return quote[0], quote[1], quote[2]
     
-    def sell_all_stocks(self, player, ui, logger=None, day_manager=None) -> None:
+    def get_market_price(self, stock_id: int, default: int = 0) -> int:
         """
-        Sell all stocks in player's portfolio at the end of the game.
+        Get today's market price of a stock.
         
         Args:
-            player: Player object
-            ui: UI object for user interaction
-            logger: GameLogger object for logging (optional)
-            day_manager: DayManager object (optional)
+            stock_id: ID of the stock
+            default: Value returned if the stock is not tradable today
+            
+        Returns:
+            int: Market price, or default if the stock is not available
         """
-        if not player.portfolio:
-            return
-        
-        ui.show_message("Game over. The system will automatically sell all your remaining stocks:", player, self, day_manager)
+        quote = self.quotes.get(stock_id)
+        if quote is None or not quote[3]:
+            return default
+        return quote[2]
+    
+    def get_portfolio_value(self, portfolio: Mapping) -> int:
+        """
+        Value a portfolio at today's market prices.
+        Stocks that are not tradable today are valued at 0.
         
-        total_earned = 0
-        for stock_id, stock_info in list(player.portfolio.items()):
-            ticker = stock_info["ticker"]
-            name = stock_info["name"]
-            quantity = stock_info["quantity"]
-            
-            # Find market price
-            market_price = 0
-            is_available = False
-            for market_stock_id, market_ticker, market_name, price in self.get_available_stocks():
-                if market_stock_id == stock_id:
-                    market_price = price
-                    is_available = True
-                    break
-            
-            # If not available in market, use buy price
-            if not is_available:
-                market_price = stock_info["price"]
-                ui.show_message(f"${ticker} is not currently tradable, selling at purchase price.", player, self, day_manager)
-            
-            # Sell stocks
-            earned = market_price * quantity
-            total_earned += earned
-            
-            # Log the sale if logger is provided
-            if logger:
-                logger.log_sell(player, stock_id, ticker, name, quantity, market_price, stock_info["price"])
+        Args:
+            portfolio: Player's Portfolio (tracked from now on, so this is
+                O(1)), or a dict of holdings (stock_id -> holding info)
             
-            ui.show_message(f"Sold {quantity} shares of ${ticker} for ${earned}", player, self, day_manager)
-            player.remove_from_portfolio(stock_id, quantity)
+        Returns:
+            int: Total market value of the portfolio
+        """
+        if not isinstance(portfolio, dict):
+            self.track(portfolio)
+            return portfolio.value
+        
+        quotes = self.quotes
+        value = 0
+        for stock_id, stock_info in portfolio.items():
+            quote = quotes.get(stock_id)
+            if quote is not None and quote[3]:
+                value += quote[2] * stock_info['quantity']
+        return value
+    
+    def get_available_stocks(self) -> List[Tuple[int, str, str, int]]:
+        """
+        Get list of available stocks in the market.
+        The list is cached until prices change, so callers must not modify it.
         
-        player.cash += total_earned
-        ui.show_message(f"Total earned: ${total_earned}", player, self, day_manager)
+        Returns:
+            List of tuples (stock_id, ticker, name, price) for available stocks
+        """
+        return self._available_list
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Trade menu module for Yolo Terminal game.
+Handles the interactive buy and sell screens of the terminal game; the
+trades themselves are made by the GameEngine.
+"""
+
+from typing import List, Tuple
+import questionary
+from colorama import Fore, Style
+
+from game.engine import GameEngine, GameError
+from game.player import COST_BASIS_METHODS
+
+def buy_stocks(engine: GameEngine, ui, day_manager=None) -> str:
+    """
+    Handle buying stocks from the market.
+
+    Args:
+        engine: GameEngine of the game
+        ui: UI object for user interaction
+        day_manager: DayManager object (optional)
+
+    Returns:
+        str: "exit" to leave the buy screen, "continue" to show it again
+    """
+    player = engine.player
+    stock_manager = engine.stock_manager
+
+    # Get available stocks
+    available_stocks = stock_manager.get_available_stocks()
+
+    if not available_stocks:
+        ui.show_message("There are no stocks available for trading right now.", player, stock_manager, day_manager)
+        return "exit"
+
+    # Create choices for the stocks menu
+    choices = []
+    for stock_id, ticker, name, price in available_stocks:
+        choices.append(questionary.Choice(
+            title=f"${ticker} ({name}) - Price: ${price}",
+            value=(stock_id, ticker, name, price)
+        ))
+
+    # Add cancel option
+    choices.append(questionary.Separator())
+    choices.append(questionary.Choice(title='Cancel', value=None))
+
+    # Ask player which stock to buy
+    stock_choice = ui.custom_select(
+        'Available stocks:',
+        choices=choices,
+        parent_menu_result=None
+    )
+
+    if not stock_choice:
+        return "exit"
+
+    try:
+        stock_id, ticker, name, price = stock_choice
+    except (ValueError, TypeError):
+        # Handle case where stock_choice is not a tuple of 4 values
+        return "exit"
+
+    # Check if player has enough money and space
+    if player.cash < price:
+        ui.show_message("You don't have enough cash to buy even one share of this stock.")
+        return "continue"
+
+    max_buy = engine.max_buy(stock_id)
+    if max_buy <= 0:
+        ui.show_message("You don't have enough space in your trade book or cash to buy this stock.")
+        return "continue"
+
+    # Ask how many to buy
+    amount = ui.get_input(f"How many shares of ${ticker} do you want to buy? (max {max_buy}): ",
+                         input_type=int, default=1, min_value=1, max_value=max_buy)
+
+    # Confirm purchase
+    if not ui.ask_yes_no(f"Confirm purchase of {amount} shares of ${ticker} for ${price * amount}?"):
+        return "continue"
+
+    try:
+        ticker, amount, cost = engine.buy(stock_id, amount)
+    except GameError as e:
+        ui.show_message(str(e), player, stock_manager, day_manager)
+        return "continue"
+
+    ui.show_message(f"You bought {amount} shares of ${ticker} for ${cost}.", player, stock_manager, day_manager)
+    return "continue"
+
+def sell_stocks(engine: GameEngine, ui, day_manager=None) -> str:
+    """
+    Handle selling stocks to the market.
+
+    Args:
+        engine: GameEngine of the game
+        ui: UI object for user interaction
+        day_manager: DayManager object (optional)
+
+    Returns:
+        str: "exit" to leave the sell screen, "continue" to show it again
+    """
+    player = engine.player
+    stock_manager = engine.stock_manager
+
+    if not player.portfolio:
+        ui.show_message("You don't have any stocks to sell.", player, stock_manager, day_manager)
+        return "exit"
+
+    # Create choices for the portfolio menu
+    choices = []
+
+    for i, (stock_id, stock_info) in enumerate(player.portfolio.items(), 1):
+        # Check if stock is available in market
+        is_available = stock_manager.is_available(stock_id)
+        market_price = stock_manager.get_market_price(stock_id)
+
+        # Prepare information for display
+        is_profitable = market_price > stock_info['price']
+
+        # Create title without color codes for questionary
+        title = f"${stock_info['ticker']} ({stock_info['name']}) - Qty: {stock_info['quantity']} - Bought: ${stock_info['price']}"
+        if is_available:
+            title += f" - Current: ${market_price}"
+            profit = market_price - stock_info['price']
+            if profit > 0:
+                title += f" (+${profit})"
+            else:
+                title += f" (-${-profit})"
+
+        # Print colored version to console for reference
+        status_line = ""
+        if is_available:
+            status_line += f"{Fore.GREEN}${stock_info['ticker']} ({stock_info['name']}){Style.RESET_ALL} - Qty: {stock_info['quantity']} - "
+            if is_profitable:
+                status_line += f"{Fore.YELLOW}Bought: ${stock_info['price']}{Style.RESET_ALL}"
+            else:
+                status_line += f"{Fore.RED}Bought: ${stock_info['price']}{Style.RESET_ALL}"
+
+            status_line += f" - Current: ${market_price}"
+            if is_profitable:
+                status_line += f" ({Fore.GREEN}+${market_price - stock_info['price']}{Style.RESET_ALL})"
+            else:
+                status_line += f" ({Fore.RED}-${stock_info['price'] - market_price}{Style.RESET_ALL})"
+        else:
+            status_line += f"${stock_info['ticker']} ({stock_info['name']}) - Qty: {stock_info['quantity']} - Bought: ${stock_info['price']}"
+            status_line += " (Not tradable now)"
+
+        print(f"{i}. {status_line}")
+        for lot in player.portfolio.get_lots(stock_id, market_price if is_available else None):
+            lot_line = f"     Day {lot['day']}: {lot['quantity']} @ ${lot['price']}"
+            if lot['unrealized'] is not None:
+                profit = lot['unrealized']
+                if profit >= 0:
+                    lot_line += f" ({Fore.GREEN}+${profit}{Style.RESET_ALL})"
+                else:
+                    lot_line += f" ({Fore.RED}-${-profit}{Style.RESET_ALL})"
+            print(lot_line)
+
+        choices.append(questionary.Choice(
+            title=title,
+            value=(stock_id, stock_info["ticker"], stock_info["name"], stock_info["quantity"], stock_info["price"])
+        ))
+
+    print(f"Realized P&L: ${player.portfolio.realized_pnl()}")
+
+    # Add cost basis and cancel options
+    choices.append(questionary.Separator())
+    choices.append(questionary.Choice(title=f"Cost basis: {COST_BASIS_METHODS[player.cost_basis]}", value="cost_basis"))
+    choices.append(questionary.Choice(title='Cancel', value=None))
+
+    # Ask player which stock to sell
+    stock_choice = ui.custom_select(
+        'Your portfolio:',
+        choices=choices,
+        parent_menu_result=None
+    )
+
+    if not stock_choice:
+        return "exit"
+
+    if stock_choice == "cost_basis":
+        method = ui.custom_select(
+            'Sell shares from:',
+            choices=[questionary.Choice(title=title, value=method) for method, title in COST_BASIS_METHODS.items()],
+            parent_menu_result=None
+        )
+        if method:
+            engine.set_cost_basis(method)
+        return "continue"
+
+    try:
+        stock_id, ticker, name, quantity, _ = stock_choice
+    except (ValueError, TypeError):
+        # Handle case where stock_choice is not a tuple of 5 values
+        return "exit"
+
+    # Check if the stock is available in the market
+    if not stock_manager.is_available(stock_id):
+        ui.show_message(f"${ticker} is not currently tradable in the market.", player, stock_manager, day_manager)
+        return "continue"
+    market_price = stock_manager.get_market_price(stock_id)
+
+    # Ask how many to sell
+    amount = ui.get_input(f"How many shares of ${ticker} do you want to sell? (max {quantity}): ",
+                         input_type=int, default=1, min_value=1, max_value=quantity)
+
+    # Confirm sale, with the profit over the cost basis of the lots sold
+    profit = market_price * amount - player.portfolio.cost_of(stock_id, amount, player.cost_basis)
+    profit_str = f"Profit: ${profit}" if profit >= 0 else f"Loss: ${-profit}"
+
+    if not ui.ask_yes_no(f"Confirm sale of {amount} shares of ${ticker} at ${market_price} each? {profit_str}"):
+        return "continue"
+
+    try:
+        ticker, amount, market_price, cost = engine.sell(stock_id, amount)
+    except GameError as e:
+        ui.show_message(str(e), player, stock_manager, day_manager)
+        return "continue"
+
+    profit = market_price * amount - cost
+    profit_str = f"profit ${profit}" if profit >= 0 else f"loss ${-profit}"
+    ui.show_message(f"You sold {amount} shares of ${ticker} for ${market_price * amount} ({profit_str}).", player, stock_manager, day_manager)
+
+    return "continue"
+
+def show_final_sales(sales: List[Tuple[int, str, int, int, bool]], ui, player=None, stock_manager=None,
+                     day_manager=None) -> None:
+    """
+    Show the stocks sold automatically at the end of the game.
+
+    Args:
+        sales: Sales returned by GameEngine.sell_all
+        ui: UI object for user interaction
+        player: Player object (optional)
+        stock_manager: StockManager object (optional)
+        day_manager: DayManager object (optional)
+    """
+    if not sales:
+        return
+
+    ui.show_message("Game over. The system will automatically sell all your remaining stocks:", player, stock_manager, day_manager)
+
+    total_earned = 0
+    for _, ticker, quantity, price, tradable in sales:
+        if not tradable:
+            ui.show_message(f"${ticker} is not currently tradable, selling at purchase price.", player, stock_manager, day_manager)
+        earned = price * quantity
+        total_earned += earned
+        ui.show_message(f"Sold {quantity} shares of ${ticker} for ${earned}", player, stock_manager, day_manager)
+
+    ui.show_message(f"Total earned: ${total_earned}", player, stock_manager, day_manager)
@@ -7,46 +7,55 @@ Handles increasing player's portfolio capacity.
 
 from typing import Dict, List, Optional, Tuple, Any
 
+from game.engine import GameError
+
 class TradingApp:
     """
     TradingApp class to handle increasing player's portfolio capacity.
+    
+    Upgrade terms are game rules (see game.engine.GameRules); games share
+    the TRADING_APP instance.
     """
     
-    def __init__(self):
-        """Initialize the trading app."""
-        self.upgrade_cost = 30000  # Cost to upgrade trade book
-        self.upgrade_amount = 10  # Amount of capacity increase per upgrade
-        self.max_capacity = 140  # Maximum portfolio capacity
+    def __reduce_ex__(self, protocol):
+        """Pickle TRADING_APP by reference instead of copying it into every game."""
+        return "TRADING_APP" if self is TRADING_APP else super().__reduce_ex__(protocol)
     
-    def visit(self, player, ui) -> None:
+    def visit(self, engine, ui) -> None:
         """
         Handle player's visit to the trading app.
         
         Args:
-            player: Player object
+            engine: GameEngine of the game
             ui: UI object for user interaction
         """
+        player = engine.player
         ui.clear_screen()
         ui.show_message("Welcome to Robinwood Trading App!")
         
-        if player.portfolio_capacity >= self.max_capacity:
+        rules = engine.rules
+        if rules.max_capacity is not None and player.portfolio_capacity >= rules.max_capacity:
             ui.show_message("The app says: You already have our maximum trade book size. We can't offer any further upgrades.")
             return
         
-        if player.cash < self.upgrade_cost:
-            ui.show_message(f"The app says: You don't have enough cash to upgrade your trade book. You need at least ${self.upgrade_cost}.")
+        if player.cash < rules.upgrade_cost:
+            ui.show_message(f"The app says: You don't have enough cash to upgrade your trade book. You need at least ${rules.upgrade_cost}.")
             return
         
-        # Calculate upgrade cost based on player's wealth
-        actual_cost = self.upgrade_cost
-        if player.cash > self.upgrade_cost * 2:
-            actual_cost = player.cash // 2  # If player is rich, charge more
+        # The upgrade may cost more for rich players
+        actual_cost = engine.upgrade_cost()
         
-        if not ui.ask_yes_no(f"Robinwood Premium offers to increase your trade book capacity from {player.portfolio_capacity} to {player.portfolio_capacity + self.upgrade_amount} for ${actual_cost}. Upgrade?"):
+        if not ui.ask_yes_no(f"Robinwood Premium offers to increase your trade book capacity from {player.portfolio_capacity} to {player.portfolio_capacity + rules.upgrade_slots} for ${actual_cost}. Upgrade?"):
             return
         
-        # Apply upgrade
-        player.cash -= actual_cost
-        player.portfolio_capacity += self.upgrade_amount
+        try:
+            engine.upgrade_trade_book()
+        except GameError as e:
+            ui.show_message(f"The app says: {e}")
+            return
         
         ui.show_message(f"Upgrade complete! Your trade book capacity is now {player.portfolio_capacity}")
+
+
+# Trading app shared by all games
+TRADING_APP = TradingApp()
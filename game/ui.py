@@ -320,17 +320,13 @@ class UI:
         if player.portfolio:
             print(f"{self.header_bg}{self.header_fg}║" + " " * 78 + f"║{Style.RESET_ALL}")
             # Portfolio header
-            portfolio_title = "Portfolio:"
+            portfolio_title = f"Portfolio: ${stock_manager.get_portfolio_value(player.portfolio)} at market"
             portfolio_padding = 78 - len(portfolio_title) - 2  # -2 for "║ "
             print(f"{self.header_bg}{self.header_fg}║ {portfolio_title}" + " " * portfolio_padding + f"║{Style.RESET_ALL}")
             
             for stock_id, stock_info in player.portfolio.items():
                 # Check if stock is available in market
-                market_price = 0
-                for market_stock_id, ticker, name, price in stock_manager.get_available_stocks():
-                    if market_stock_id == stock_id:
-                        market_price = price
-                        break
+                market_price = stock_manager.get_market_price(stock_id)
                 
                 # Color stock ticker based on availability and type
                 if stock_info['ticker'] in ["CATO", "PITCOIN"]:
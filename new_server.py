@@ -2,10 +2,32 @@
 # -*- coding: utf-8 -*-
 """
 Main entry point for Yolo Terminal game server.
+
+Without options the Flask development server is started. Use --workers to run
+the production mode with several worker processes over a shared game store.
 """
 
+import argparse
+
 from server import create_app
+from server.workers import run_workers
+
+def main():
+    """Parse command line options and start the server."""
+    parser = argparse.ArgumentParser(description="Yolo Terminal game server")
+    parser.add_argument("--host", default="0.0.0.0", help="Host to listen on")
+    parser.add_argument("--port", type=int, default=5001, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Number of worker processes (0 runs the development server)")
+    parser.add_argument("--store", default=None,
+                        help="Game store URL shared by the workers, e.g. sqlite:///games.db")
+    args = parser.parse_args()
+    
+    if args.workers > 0:
+        run_workers(args.workers, args.host, args.port, args.store)
+    else:
+        app = create_app()
+        app.run(debug=True, host=args.host, port=args.port)
 
 if __name__ == '__main__':
-    app = create_app()
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    main()
@@ -8,6 +8,7 @@ from flask import Flask
 from flask_cors import CORS
 
 from .routes import api, main
+from .game_state import get_game_store
 
 def create_app():
     """
@@ -28,4 +29,7 @@ def create_app():
     app.register_blueprint(main)
     app.register_blueprint(api, url_prefix='/api')
     
+    # Open the game store now, so that durable stores restore their games at startup
+    get_game_store()
+    
     return app
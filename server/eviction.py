@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Eviction policy for Yolo Terminal game stores.
+Tracks which games are resident in memory and when they were last used,
+and picks the games to evict: idle games, finished games, and the least
+recently used games when the estimated memory use exceeds a budget.
+"""
+
+import gc
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from game.events import EventTable
+from game.log_writer import LogWriter
+
+# Eviction reasons
+IDLE = "idle"
+FINISHED = "finished"
+BUDGET = "budget"
+
+# Objects shared by all games, never counted in a game's size: code, the
+# compiled event tables and the process's log writer
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                 types.CodeType, types.MethodType, EventTable, LogWriter)
+
+def estimate_size(obj: Any) -> int:
+    """
+    Estimate the memory used by an object and everything it references.
+
+    Modules, classes, functions, interned strings, event tables and the log
+    writer are shared with other games and not counted.
+
+    Args:
+        obj: Object to measure
+
+    Returns:
+        int: Estimated size in bytes
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SHARED_TYPES):
+            continue
+        seen.add(id(item))
+        if isinstance(item, str) and sys.intern(item) is item:
+            continue
+        total += sys.getsizeof(item)
+        stack.extend(gc.get_referents(item))
+    return total
+
+def is_finished(game_state: Dict[str, Any]) -> bool:
+    """
+    Check whether a game is over.
+
+    Args:
+        game_state: Game state
+
+    Returns:
+        bool: True if the days are over or the player's health is zero
+    """
+    player = game_state['player']
+    return player.days_left <= 0 or player.health <= 0
+
+
+class GameResidency:
+    """
+    GameResidency class tracking the games resident in a store's memory.
+
+    Games are kept in least recently used order, so idle games are found at
+    the front without scanning. The memory use is estimated from a running
+    average of the size of sampled games.
+    """
+
+    def __init__(self, idle_ttl: Optional[float] = None, finished_ttl: Optional[float] = None,
+                 memory_budget: Optional[int] = None, sample_interval: int = 64):
+        """
+        Initialize the tracker.
+
+        Args:
+            idle_ttl: Evict games not used for this many seconds (never if None)
+            finished_ttl: Evict finished games not used for this many seconds (never if None)
+            memory_budget: Evict the least recently used games while the estimated
+                memory use of resident games exceeds this many bytes (no limit if None)
+            sample_interval: Measure the size of one game in this many stored games
+        """
+        self.idle_ttl = idle_ttl
+        self.finished_ttl = finished_ttl
+        self.memory_budget = memory_budget
+        self.sample_interval = sample_interval
+
+        self._lock = threading.Lock()
+        # game_id -> last use time, least recently used first
+        self._last_used: "OrderedDict[str, float]" = OrderedDict()
+        # Finished games: game_id -> last use time, least recently used first
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self._puts = 0
+
+        self.bytes_per_game = 0.0
+        self.evictions: Dict[str, int] = {IDLE: 0, FINISHED: 0, BUDGET: 0}
+
+    def __len__(self) -> int:
+        return len(self._last_used)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._last_used
+
+    def touch(self, game_id: str, game_state: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Record a use of a game.
+
+        Args:
+            game_id: Game ID
+            game_state: Game state when it was stored (checks whether the
+                game is finished and samples its size)
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._last_used[game_id] = now
+            self._last_used.move_to_end(game_id)
+            if game_id in self._finished:
+                self._finished[game_id] = now
+                self._finished.move_to_end(game_id)
+            elif game_state is not None and is_finished(game_state):
+                self._finished[game_id] = now
+            if game_state is None:
+                return
+            self._puts += 1
+            sample = self._puts % self.sample_interval == 1 or self.bytes_per_game == 0
+        if sample:
+            size = estimate_size(game_state)
+            # Running average, weighted towards recent samples
+            self.bytes_per_game = size if self.bytes_per_game == 0 else 0.9 * self.bytes_per_game + 0.1 * size
+
+    def remove(self, game_id: str) -> None:
+        """
+        Stop tracking a game that left memory.
+
+        Args:
+            game_id: Game ID
+        """
+        with self._lock:
+            self._last_used.pop(game_id, None)
+            self._finished.pop(game_id, None)
+
+    def expired(self) -> List[Tuple[str, str]]:
+        """
+        Pick the games to evict now and stop tracking them.
+
+        Returns:
+            List of (game_id, reason) tuples
+        """
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            if self.finished_ttl is not None:
+                while self._finished:
+                    game_id, last_used = next(iter(self._finished.items()))
+                    if now - last_used < self.finished_ttl:
+                        break
+                    self._pop(game_id)
+                    evicted.append((game_id, FINISHED))
+
+            if self.idle_ttl is not None:
+                while self._last_used:
+                    game_id, last_used = next(iter(self._last_used.items()))
+                    if now - last_used < self.idle_ttl:
+                        break
+                    reason = FINISHED if game_id in self._finished else IDLE
+                    self._pop(game_id)
+                    evicted.append((game_id, reason))
+
+            if self.memory_budget is not None and self.bytes_per_game > 0:
+                max_games = max(1, int(self.memory_budget // self.bytes_per_game))
+                while len(self._last_used) > max_games:
+                    game_id = next(iter(self._last_used))
+                    reason = FINISHED if game_id in self._finished else BUDGET
+                    self._pop(game_id)
+                    evicted.append((game_id, reason))
+
+            for _, reason in evicted:
+                self.evictions[reason] += 1
+        return evicted
+
+    def _pop(self, game_id: str) -> None:
+        """Stop tracking a game (the lock must be held)."""
+        del self._last_used[game_id]
+        self._finished.pop(game_id, None)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the residency metrics.
+
+        Returns:
+            dict: Resident and finished game counts, estimated bytes per game
+                and in total, memory budget and eviction counts by reason
+        """
+        with self._lock:
+            resident = len(self._last_used)
+            finished = len(self._finished)
+        return {
+            'resident_games': resident,
+            'finished_games': finished,
+            'bytes_per_game': round(self.bytes_per_game),
+            'resident_bytes': round(self.bytes_per_game * resident),
+            'memory_budget': self.memory_budget,
+            'evictions': dict(self.evictions),
+        }
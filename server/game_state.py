@@ -4,65 +4,90 @@
 Game state management for Yolo Terminal game.
 """
 
-import random
-import string
-from typing import Dict, Any, Optional
+import atexit
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 
 from game.player import Player
 from game.stocks import StockManager
-from game.locations import DayManager
+from game.locations import DAY_MANAGER
 from game.events import EventManager
-from game.bank import Bank
-from game.hospital import Hospital
-from game.trading_app import TradingApp
+from game.bank import BANK
+from game.hospital import HOSPITAL
+from game.trading_app import TRADING_APP
 from game.darkweb import Darkweb
-from game.broker import Broker
-from game.high_scores import HighScores
+from game.broker import BROKER
 from game.logger import GameLogger
 from game.headlines import get_random_headline
+from game.engine import GameEngine
+from game.journal import ActionJournal
+from game.rng import GameRNG
 
-# Game state storage (in-memory for simplicity)
-# In a production environment, you would use a database
-game_states = {}
+from .ids import new_game_id, new_token
+from .leaderboard import get_leaderboard
+from .store import GameStore, create_store
 
-def generate_token() -> str:
-    """Generate a unique token for a game."""
-    # Generate a random token with letters and numbers
-    letters_and_digits = string.ascii_letters + string.digits
-    token = ''.join(random.choice(letters_and_digits) for i in range(10))
-    return token
+# Game state storage, configured with the YOLO_GAME_STORE environment variable
+# (in-memory by default, or a SQLite database shared by several workers).
+# Created on first use so that worker processes open their own connections.
+game_store: Optional[GameStore] = None
+_store_lock = threading.Lock()
 
-def create_new_game(player_name: str) -> Dict[str, Any]:
+# Last response payload sent for each game, used to answer delta requests:
+# game_id -> (payload version, payload). Bounded, oldest games are dropped first.
+# Each worker keeps its own, so payload versions are random rather than counted:
+# a version sent by another worker (or before a restart) never matches ours.
+MAX_SENT_PAYLOADS = 10000
+PAYLOAD_VERSION_BITS = 53  # Integers stay exact in JavaScript
+_sent_payloads: "OrderedDict[str, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+_sent_payloads_lock = threading.Lock()
+
+def get_game_store() -> GameStore:
+    """
+    Get the game store, creating it on first use.
+    
+    Returns:
+        GameStore: Game store of this process
+    """
+    global game_store
+    if game_store is None:
+        with _store_lock:
+            if game_store is None:
+                game_store = create_store()
+                # Write buffered changes when the process exits
+                atexit.register(game_store.close)
+    return game_store
+
+def create_new_game(player_name: str, seed: Optional[int] = None) -> Dict[str, Any]:
     """
     Create a new game state.
     
     Args:
         player_name: Name of the player
+        seed: Seed of the game's random streams (random if omitted)
         
     Returns:
         dict: Game state
     """
-    # Initialize game components
+    # Each game draws from its own random streams
+    rng = GameRNG(seed)
+    
+    # Initialize the game's own components; catalogs and stateless
+    # locations (bank, hospital, ...) are shared by all games
     player = Player(name=player_name)
-    stock_manager = StockManager()
-    day_manager = DayManager()
-    event_manager = EventManager()
-    bank = Bank()
-    hospital = Hospital()
-    trading_app = TradingApp()
-    darkweb = Darkweb()
-    broker = Broker()
-    high_scores = HighScores()
+    stock_manager = StockManager(rng.prices)
+    event_manager = EventManager(rng.events)
+    darkweb = Darkweb(rng.darkweb)
     
     # Initialize logger
     logger = GameLogger(player_name)
     logger.log_player_status(player)
     
-    # Generate a unique game ID
-    game_id = str(random.randint(10000, 99999))
-    
-    # Generate a unique token for this game
-    token = generate_token()
+    # Allocate a unique game ID, and a token carrying it with a random secret
+    game_id = new_game_id()
+    token = new_token(game_id)
     
     # Create game state
     game_state = {
@@ -70,23 +95,24 @@ def create_new_game(player_name: str) -> Dict[str, Any]:
         'token': token,
         'player': player,
         'stock_manager': stock_manager,
-        'day_manager': day_manager,
+        'day_manager': DAY_MANAGER,
         'event_manager': event_manager,
-        'bank': bank,
-        'hospital': hospital,
-        'trading_app': trading_app,
+        'bank': BANK,
+        'hospital': HOSPITAL,
+        'trading_app': TRADING_APP,
         'darkweb': darkweb,
-        'broker': broker,
-        'high_scores': high_scores,
+        'broker': BROKER,
         'logger': logger,
+        'rng': rng,
+        'journal': ActionJournal.for_game(rng, player_name),  # Seed and actions, for replay
         'news_reports': [],
         'message': "Welcome to Yolo Terminal! Day 1 has begun. Let's jump into the stock market!",
-        'show_stocks': False  # Don't show stocks automatically on first day
+        'show_stocks': False,  # Don't show stocks automatically on first day
+        'version': 1  # Incremented every time the game state is saved
     }
     
-    # Store game state by both game_id and token
-    game_states[game_id] = game_state
-    game_states[token] = game_state
+    # Store game state (looked up by game_id, or by token)
+    get_game_store().put(game_state)
     
     return game_state
 
@@ -100,7 +126,38 @@ def get_game_state(game_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         dict: Game state or None if not found
     """
-    return game_states.get(game_id)
+    return get_game_store().get(game_id)
+
+def get_game_engine(game_state: Dict[str, Any]) -> GameEngine:
+    """
+    Get a GameEngine applying the game rules to a game state's components.
+    
+    Args:
+        game_state: Game state
+        
+    Returns:
+        GameEngine: Engine sharing the game state's objects
+    """
+    return GameEngine(
+        game_state['player'],
+        game_state['stock_manager'],
+        game_state['event_manager'],
+        game_state['bank'],
+        game_state['logger'],
+        get_leaderboard(),  # Final scores go to the leaderboard shared by all games
+        game_state.get('rng'),
+        game_state.get('journal')
+    )
+
+def save_game_state(game_state: Dict[str, Any]) -> None:
+    """
+    Save a game state after it was modified.
+    
+    Args:
+        game_state: Game state
+    """
+    game_state['version'] = game_state.get('version', 0) + 1
+    get_game_store().put(game_state)
 
 def get_game_state_data(game_state: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -117,39 +174,44 @@ def get_game_state_data(game_state: Dict[str, Any]) -> Dict[str, Any]:
     day_manager = game_state['day_manager']
     
     # Get available stocks
-    available_stocks = []
-    for stock_id, ticker, name, price in stock_manager.get_available_stocks():
-        available_stocks.append({
+    available_stocks = [
+        {
             'id': stock_id,
             'ticker': ticker,
             'name': name,
             'price': price
-        })
+        }
+        for stock_id, ticker, name, price in stock_manager.get_available_stocks()
+    ]
     
-    # Get portfolio
+    # Get portfolio, with the lots of each stock and their profit at today's price
     portfolio = []
     for stock_id, stock_info in player.portfolio.items():
-        # Check if stock is available in market
-        market_price = 0
-        for market_stock in available_stocks:
-            if market_stock['id'] == stock_id:
-                market_price = market_stock['price']
-                break
-        
+        market_price = stock_manager.get_market_price(stock_id)
+        tradable_price = market_price if stock_manager.is_available(stock_id) else None
         portfolio.append({
             'id': stock_id,
             'ticker': stock_info['ticker'],
             'name': stock_info['name'],
             'quantity': stock_info['quantity'],
             'price': stock_info['price'],
-            'market_price': market_price
+            'cost': player.portfolio.costs[stock_id],
+            'market_price': market_price,
+            'realized': player.portfolio.realized_pnl(stock_id),
+            'unrealized': (None if tradable_price is None
+                           else player.portfolio.unrealized_pnl(stock_id, tradable_price)),
+            'lots': player.portfolio.get_lots(stock_id, tradable_price)
         })
     
+    # Valuation at today's prices, kept current by the stock manager
+    portfolio_value = stock_manager.get_portfolio_value(player.portfolio)
+    
     # Get current day description
     current_day = day_manager.get_day_description(player)
     
     # Get a random headline
-    headline, agency, _ = get_random_headline()
+    rng = game_state.get('rng')
+    headline, agency, _ = get_random_headline(rng.headlines if rng else None)
     
     # Get net worth history
     net_worth_history = game_state['logger'].get_net_worth_history()
@@ -169,7 +231,11 @@ def get_game_state_data(game_state: Dict[str, Any]) -> Dict[str, Any]:
             'health': player.health,
             'fame': player.fame,
             'portfolio_capacity': player.portfolio_capacity,
-            'portfolio_used': player.portfolio_used
+            'portfolio_used': player.portfolio_used,
+            'cost_basis': player.cost_basis,
+            'realized_pnl': player.portfolio.realized_pnl(),
+            'portfolio_value': portfolio_value,
+            'total_assets': player.get_net_worth() + portfolio_value
         },
         'current_day': current_day,
         'available_stocks': available_stocks,
@@ -183,3 +249,58 @@ def get_game_state_data(game_state: Dict[str, Any]) -> Dict[str, Any]:
         'net_worth_history': net_worth_history,
         'show_stocks': show_stocks
     }
+
+def get_game_state_response(game_state: Dict[str, Any], since: Optional[int] = None,
+                            extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Get the response payload for a game state, as a delta when possible.
+    
+    Every payload carries a ``version``, a random number identifying it. A
+    client that sends back the version of the last payload it received
+    (``since``) gets only the top-level fields that changed since then::
+    
+        {'version': 5810..., 'since': 1377..., 'delta': {...changed fields...}, 'removed': [...]}
+    
+    If ``since`` is missing or does not match the last payload this process
+    sent for this game (e.g. another worker or browser tab answered in
+    between), the full payload is returned.
+    
+    Args:
+        game_state: Game state
+        since: Version of the last payload the client received (optional)
+        extra: Additional fields to include, e.g. game over information (optional)
+        
+    Returns:
+        dict: Full or delta response payload
+    """
+    payload = get_game_state_data(game_state)
+    if extra:
+        payload.update(extra)
+    
+    game_id = game_state['game_id']
+    with _sent_payloads_lock:
+        version = secrets.randbits(PAYLOAD_VERSION_BITS)
+        previous = _sent_payloads.pop(game_id, None)
+        _sent_payloads[game_id] = (version, payload)
+        if len(_sent_payloads) > MAX_SENT_PAYLOADS:
+            _sent_payloads.popitem(last=False)
+    
+    if since is None or previous is None or previous[0] != since:
+        response = dict(payload)
+        response['version'] = version
+        return response
+    
+    last_payload = previous[1]
+    delta = {
+        key: value
+        for key, value in payload.items()
+        if key not in last_payload or (last_payload[key] is not value and last_payload[key] != value)
+    }
+    removed = [key for key in last_payload if key not in payload]
+    
+    return {
+        'version': version,
+        'since': since,
+        'delta': delta,
+        'removed': removed
+    }
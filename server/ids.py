@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Game ID and token allocation for Yolo Terminal game.
+Game IDs are 64-bit integers made of a millisecond timestamp, the node
+(worker process) that allocated them and a per-millisecond sequence, so
+they never collide, across threads, workers or restarts. Tokens are the
+game ID followed by a secret from the operating system's CSPRNG, so a
+game is found by a single key whether a request gives its ID or its token.
+"""
+
+import hmac
+import os
+import secrets
+import threading
+import time
+from typing import Optional, Tuple
+
+# Layout of a game ID: 41 bits of milliseconds since EPOCH_MS, 10 bits of
+# node and 12 bits of sequence (63 bits, so IDs stay positive)
+EPOCH_MS = 1735689600000  # 2025-01-01 00:00:00 UTC
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+MAX_NODE = (1 << NODE_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+# Separates the game ID from the secret in a token
+TOKEN_SEPARATOR = "."
+TOKEN_BYTES = 16
+
+class GameIdAllocator:
+    """
+    GameIdAllocator class handing out unique 64-bit game IDs.
+
+    IDs are increasing within a process. If the clock moves backwards, or
+    more than 4096 IDs are needed in one millisecond, the allocator keeps
+    counting from its last timestamp instead of reusing one.
+    """
+
+    def __init__(self, node: int = 0):
+        """
+        Initialize the allocator.
+
+        Args:
+            node: Node number of this process, unique among the processes
+                sharing a game store (0 to 1023)
+        """
+        if not 0 <= node <= MAX_NODE:
+            raise ValueError(f"Node must be between 0 and {MAX_NODE}, got {node}")
+        self.node = node
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._sequence = 0
+
+    def next_id(self) -> int:
+        """
+        Allocate a game ID.
+
+        Returns:
+            int: New game ID
+        """
+        now_ms = int(time.time() * 1000) - EPOCH_MS
+        with self._lock:
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = 0
+            elif self._sequence < MAX_SEQUENCE:
+                self._sequence += 1
+            else:
+                # Sequence exhausted (or clock moved back), borrow the next millisecond
+                self._last_ms += 1
+                self._sequence = 0
+            return (self._last_ms << (NODE_BITS + SEQUENCE_BITS)) | (self.node << SEQUENCE_BITS) | self._sequence
+
+# Allocator of this process, see set_node
+_allocator = GameIdAllocator(int(os.environ.get("YOLO_NODE_ID", "0")))
+
+def set_node(node: int) -> None:
+    """
+    Set the node number of this process, e.g. in each worker process.
+
+    Args:
+        node: Node number, unique among the processes sharing a game store
+    """
+    global _allocator
+    _allocator = GameIdAllocator(node)
+
+def new_game_id() -> str:
+    """Allocate a unique game ID."""
+    return str(_allocator.next_id())
+
+def new_token(game_id: str) -> str:
+    """
+    Generate the token of a game.
+
+    Args:
+        game_id: Game ID
+
+    Returns:
+        str: Game ID followed by a random secret, e.g. ``"8412...4096.Zk3-..."``
+    """
+    return game_id + TOKEN_SEPARATOR + secrets.token_urlsafe(TOKEN_BYTES)
+
+def split_key(key: str) -> Tuple[str, bool]:
+    """
+    Find the game ID of a key.
+
+    Args:
+        key: Game ID or token
+
+    Returns:
+        Tuple (game ID, whether the key is a token)
+    """
+    game_id, separator, _ = key.partition(TOKEN_SEPARATOR)
+    return game_id, bool(separator)
+
+def key_matches(key: str, token: Optional[str]) -> bool:
+    """
+    Check a key against the token of the game it names: a game ID always
+    matches, a token must be the game's token.
+
+    Args:
+        key: Game ID or token
+        token: Token of the game
+
+    Returns:
+        bool: True if the key gives access to the game
+    """
+    if TOKEN_SEPARATOR not in key:
+        return True
+    return token is not None and hmac.compare_digest(key, token)
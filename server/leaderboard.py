@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Leaderboard for Yolo Terminal game.
+Keeps the final scores of all games in process-wide ranked indexes, one
+per window (all time, today, this week), updated when a game ends, and
+serves pages of them as cached response bytes.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from game.high_scores import ScoreLog
+from game.ranking import RankedScores
+
+from .serializer import dumps
+
+# Windows of the leaderboard, and the length of their periods in days
+# (UTC days, weeks starting on Monday)
+ALL_TIME = "all"
+DAILY = "daily"
+WEEKLY = "weekly"
+WINDOWS = {ALL_TIME: None, DAILY: 1, WEEKLY: 7}
+
+# 1970-01-01 was a Thursday: weeks start 3 days before day 0
+_WEEK_OFFSET = 3
+
+# Cached response pages kept at most
+MAX_CACHED_PAGES = 256
+
+def window_period(window: str, timestamp: float) -> int:
+    """
+    Get the period (day or week number) of a window a time falls in.
+
+    Args:
+        window: Window name
+        timestamp: Unix time
+
+    Returns:
+        int: Period number (always 0 for the all-time window)
+    """
+    days = WINDOWS[window]
+    if days is None:
+        return 0
+    day = int(timestamp // 86400)
+    return (day + _WEEK_OFFSET) // 7 if days == 7 else day
+
+
+class Leaderboard:
+    """
+    Leaderboard class ranking the scores of all games.
+
+    Every score is kept in the all-time ranking, and in the daily and
+    weekly rankings while its day and week last. Rankings are ranked
+    indexes (see game.ranking): adding a score, finding the rank of a
+    score and reading a page cost O(log n), with millions of scores.
+    Encoded pages are cached until a new score lands on or before them,
+    so the first page, the one read most, rarely changes.
+
+    With a scores file, the rankings are loaded from it once, and every
+    score is stored through a ScoreLog (see game.high_scores). Reads pick
+    up the scores logged by other processes since the last read.
+    """
+
+    def __init__(self, size: int = 10, path: Optional[str] = None):
+        """
+        Initialize the leaderboard.
+
+        Args:
+            size: Number of scores of a page when no limit is given
+            path: Scores file, shared with game.high_scores (optional)
+        """
+        self.size = size
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._rankings: Dict[str, RankedScores] = {}
+        self._periods: Dict[str, int] = {}
+        self._pages: Dict[Tuple[str, int, int], bytes] = {}
+        self._reset(time.time())
+
+        # Every score is kept, so compaction keeps them all
+        self.log = ScoreLog(path) if path else None
+        if self.log is not None:
+            self._load()
+
+    def add_score(self, name: str, score: int, health: int, fame: int) -> bool:
+        """
+        Add the final score of a game.
+
+        Args:
+            name: Player's name
+            score: Player's score
+            health: Player's health
+            fame: Player's reputation
+
+        Returns:
+            bool: True if the score entered the first page of the all-time ranking
+        """
+        entry = {"name": name, "score": score, "health": health, "fame": fame, "time": int(time.time())}
+        with self._lock:
+            self._refresh()
+            if self.log is not None:
+                self.log.append(entry)
+            return self._push(entry) < self.size
+
+    def get_scores(self, window: str = ALL_TIME, offset: int = 0,
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get a page of a ranking, best score first.
+
+        Args:
+            window: Ranking window (all, daily or weekly)
+            offset: Number of scores skipped
+            limit: Number of scores returned at most (size if omitted)
+
+        Returns:
+            List of score entries (rank, name, score, health, fame and time)
+        """
+        with self._lock:
+            self._refresh()
+            return self._rankings[window].page(offset, self.size if limit is None else limit)
+
+    def rank_of(self, score: int, window: str = ALL_TIME) -> int:
+        """
+        Get the rank a score has or would have in a ranking.
+
+        Args:
+            score: Score
+            window: Ranking window (all, daily or weekly)
+
+        Returns:
+            int: Rank (1 for the best score)
+        """
+        with self._lock:
+            self._refresh()
+            return self._rankings[window].rank_of(score)
+
+    def count(self, window: str = ALL_TIME) -> int:
+        """
+        Get the number of scores in a ranking.
+
+        Args:
+            window: Ranking window (all, daily or weekly)
+
+        Returns:
+            int: Number of scores
+        """
+        with self._lock:
+            self._refresh()
+            return len(self._rankings[window])
+
+    def response_bytes(self, window: str = ALL_TIME, offset: int = 0, limit: Optional[int] = None) -> bytes:
+        """
+        Get a page of a ranking encoded as a JSON array, cached until it changes.
+
+        Args:
+            window: Ranking window (all, daily or weekly)
+            offset: Number of scores skipped
+            limit: Number of scores returned at most (size if omitted)
+
+        Returns:
+            bytes: JSON response body
+        """
+        key = (window, offset, self.size if limit is None else limit)
+        with self._lock:
+            self._refresh()
+            encoded = self._pages.get(key)
+            if encoded is None:
+                if len(self._pages) >= MAX_CACHED_PAGES:
+                    self._pages.clear()
+                encoded = self._pages[key] = dumps(self._rankings[window].page(offset, key[2]))
+            return encoded
+
+    def close(self) -> None:
+        """Write the buffered scores to the scores file."""
+        if self.log is not None:
+            self.log.close()
+
+    def _push(self, entry: Dict[str, Any]) -> int:
+        """
+        Add an entry to the rankings of its windows (the lock must be held).
+
+        Returns:
+            int: Position of the entry in the all-time ranking
+        """
+        position = 0
+        timestamp = entry.get("time")
+        for window, ranking in self._rankings.items():
+            if window != ALL_TIME and (timestamp is None or window_period(window, timestamp) != self._periods[window]):
+                continue
+            inserted = ranking.add(entry)
+            if window == ALL_TIME:
+                position = inserted
+            # Pages ending after the new entry have shifted
+            for key in [key for key in self._pages if key[0] == window and key[1] + key[2] > inserted]:
+                del self._pages[key]
+        return position
+
+    def _reset(self, now: float) -> None:
+        """Start empty rankings for the current periods (the lock must be held)."""
+        for window in WINDOWS:
+            self._rankings[window] = RankedScores()
+            self._periods[window] = window_period(window, now)
+        self._pages.clear()
+
+    def _roll(self) -> None:
+        """Start the rankings of a new day or week (the lock must be held)."""
+        now = time.time()
+        for window in WINDOWS:
+            period = window_period(window, now)
+            if period != self._periods[window]:
+                self._rankings[window] = RankedScores()
+                self._periods[window] = period
+                for key in [key for key in self._pages if key[0] == window]:
+                    del self._pages[key]
+
+    def _load(self) -> None:
+        """Rebuild the rankings from the scores file (the lock must be held)."""
+        self._reset(time.time())
+        for entry in self.log.load():
+            self._push(entry)
+
+    def _refresh(self) -> None:
+        """Add the scores logged by other processes (the lock must be held)."""
+        self._roll()
+        if self.log is None:
+            return
+        entries = self.log.read_new()
+        if entries is None:
+            self._load()
+            return
+        for entry in entries:
+            self._push(entry)
+
+
+# Leaderboard of this process, created on first use
+_leaderboard: Optional[Leaderboard] = None
+_leaderboard_lock = threading.Lock()
+
+def get_leaderboard() -> Leaderboard:
+    """
+    Get the leaderboard shared by all games of this process.
+
+    The scores file is set with the YOLO_SCORES_FILE environment variable
+    (scores.json by default, empty to keep the leaderboard in memory).
+
+    Returns:
+        Leaderboard: Leaderboard of this process
+    """
+    global _leaderboard
+    if _leaderboard is None:
+        with _leaderboard_lock:
+            if _leaderboard is None:
+                _leaderboard = Leaderboard(path=os.environ.get("YOLO_SCORES_FILE", "scores.json") or None)
+    return _leaderboard
+
+def close_leaderboard() -> None:
+    """Write the buffered scores of this process's leaderboard, if it was used."""
+    if _leaderboard is not None:
+        _leaderboard.close()
@@ -6,11 +6,20 @@ API routes for Yolo Terminal game.
 
 from flask import Blueprint, request, jsonify, render_template, send_from_directory
 
+from game.engine import GameError, NotFoundError
+from game.player import COST_BASIS_METHODS
+
 from .game_state import (
     create_new_game,
+    get_game_engine,
     get_game_state,
-    get_game_state_data
+    get_game_state_response,
+    get_game_store,
+    save_game_state
 )
+from .leaderboard import ALL_TIME, WINDOWS, get_leaderboard
+from .serializer import encode_game_state_response, json_response
+from .store import StaleGameError
 
 # Create a blueprint for the API routes
 api = Blueprint('api', __name__)
@@ -18,6 +27,44 @@ api = Blueprint('api', __name__)
 # Create a blueprint for the main routes
 main = Blueprint('main', __name__)
 
+# Largest page of high scores
+MAX_SCORES_LIMIT = 100
+
+# Most legs in one order batch
+MAX_ORDER_LEGS = 50
+
+def game_state_json(game_state, extra=None):
+    """
+    Build the JSON response for a game state (a delta if the client sent ``since``).
+    
+    Args:
+        game_state: Game state
+        extra: Additional fields to include (optional)
+        
+    Returns:
+        Response: Flask response with the encoded payload
+    """
+    response = get_game_state_response(game_state, request.args.get('since', type=int), extra)
+    return json_response(encode_game_state_response(response, game_state))
+
+def game_error(error):
+    """
+    Build the error response for an action refused by the game rules.
+    
+    Args:
+        error: GameError raised by the engine
+        
+    Returns:
+        tuple: Flask response and status code
+    """
+    status = 404 if isinstance(error, NotFoundError) else 400
+    return jsonify({'error': str(error)}), status
+
+@api.errorhandler(StaleGameError)
+def stale_game(error):
+    """Refuse a change made to a game state that another worker changed in the meantime."""
+    return jsonify({'error': 'This game was changed by another request. Reload it and try again.'}), 409
+
 @main.route('/')
 def index():
     """Render the main page."""
@@ -40,7 +87,7 @@ def new_game():
     game_state = create_new_game(player_name)
     
     # Return game state data
-    return jsonify(get_game_state_data(game_state))
+    return game_state_json(game_state)
 
 @api.route('/game/<game_id>', methods=['GET'])
 def get_game(game_id):
@@ -49,7 +96,7 @@ def get_game(game_id):
     if not game_state:
         return jsonify({'error': 'Game not found'}), 404
     
-    return jsonify(get_game_state_data(game_state))
+    return game_state_json(game_state)
 
 @api.route('/game/<game_id>/next_day', methods=['POST'])
 def next_day(game_id):
@@ -58,131 +105,61 @@ def next_day(game_id):
     if not game_state:
         return jsonify({'error': 'Game not found'}), 404
     
-    player = game_state['player']
-    stock_manager = game_state['stock_manager']
-    day_manager = game_state['day_manager']
-    event_manager = game_state['event_manager']
-    bank = game_state['bank']
-    logger = game_state['logger']
-    
-    # Handle next day
-    player.days_left -= 1
-    
-    # Log travel event
-    logger.log_next_day(player, stock_manager)
-    
-    # Update stock prices
-    stock_manager.update_prices()
-    
-    # Handle random events and show news reports
-    news_reports = event_manager.handle_events(player, stock_manager)
-    
-    # Add debt collector visit in the last 10 days if player has debt
-    if player.days_left <= 10 and player.debt > 0:
-        debt_collector_report = f"A debt collector visits you, demanding payment. The stress affects your mental health. (-10 health)"
-        player.health = max(0, player.health - 10)
-        if not news_reports:
-            news_reports = [debt_collector_report]
-        else:
-            news_reports.append(debt_collector_report)
-        
-        # Log debt collector event
-        logger.log_random_event("Debt Collector", debt_collector_report, {})
+    # A finished game has no next day (and its score is already recorded)
+    if game_state.get('game_over'):
+        return jsonify({'error': 'This game is over. Start a new game to keep trading.'}), 400
     
-    # Update bank interest and debt
-    bank.update_interest(player)
-    
-    # Calculate net worth and profit
-    current_net_worth = player.cash + player.bank_savings - player.debt
-    
-    # Calculate portfolio value
-    portfolio_value = 0
-    for stock_id, stock_info in player.portfolio.items():
-        # Find current market price
-        for market_stock_id, _, _, price in stock_manager.get_available_stocks():
-            if market_stock_id == stock_id:
-                portfolio_value += price * stock_info['quantity']
-                break
-    
-    total_assets = current_net_worth + portfolio_value
-    
-    # Calculate profit (simplified)
-    profit = total_assets - 2000 + 5000  # Starting cash was $2000, debt was $5000
-    
-    # Calculate tax (45% of profit, only if profit is positive)
-    tax = round(max(0, profit * 0.45))
-    
-    # Set message - simplified to just show day info
-    message = f"Day {41 - player.days_left} has begun. Check out today's available stocks!"
-    
-    # Update game state
-    game_state['news_reports'] = news_reports
-    game_state['message'] = message
-    game_state['show_stocks'] = True  # Show available stocks when a new day begins
-    
-    # Log player status after next day
-    logger.log_player_status(player, stock_manager)
-    
-    # Check if game should end
-    game_over = False
-    game_over_reason = None
-    final_score = 0
+    player = game_state['player']
+    engine = get_game_engine(game_state)
     
-    if player.days_left <= 0:
-        game_over = True
-        game_over_reason = "DAYS_OVER"
-        
-        # Sell all remaining stocks
-        stock_manager.sell_all_stocks(player, None, logger, day_manager)
-        
-        # Calculate final score and profit
-        final_score = player.cash + player.bank_savings - player.debt
-        portfolio_value = 0  # Portfolio should be empty after selling all stocks
-        total_assets = final_score + portfolio_value
-        profit = total_assets - 2000 + 5000  # Starting cash was $2000, debt was $5000
-        
-        # Calculate tax (45% of profit, only if profit is positive)
-        tax = round(max(0, profit * 0.45))
+    reason = engine.game_over_reason()
+    if reason:
+        # Already over after another action (e.g. health lost on the darkweb): end it without a new day
+        result = engine.end_game(reason)
+    else:
+        # Roll prices and events, apply interest and end the game if it is over
+        day = engine.advance_day()
         
-        if profit > 0:
-            game_state['message'] = f"Your final score is: ${final_score}\nPortfolio value: ${portfolio_value}\nTotal assets: ${total_assets}\n\nYour profit: ${profit}\nTax (45%): ${tax}\nNet profit after tax: ${profit - tax}"
+        # Update game state
+        game_state['news_reports'] = day.news_reports
+        game_state['message'] = f"Day {41 - player.days_left} has begun. Check out today's available stocks!"
+        game_state['show_stocks'] = True  # Show available stocks when a new day begins
+        result = day.game_result
+    
+    if result:
+        game_state['game_over'] = result.reason
+    
+    if result and result.reason == "DAYS_OVER":
+        if result.profit > 0:
+            game_state['message'] = f"Your final score is: ${result.final_score}\nPortfolio value: ${result.portfolio_value}\nTotal assets: ${result.total_assets}\n\nYour profit: ${result.profit}\nTax (45%): ${result.tax}\nNet profit after tax: ${result.profit - result.tax}"
         else:
             # Check if player is in debt
             if player.debt > player.cash + player.bank_savings:
                 debt_remaining = player.debt - (player.cash + player.bank_savings)
                 hours_needed = round(debt_remaining / 10)  # $10 per hour at Mandy's
-                game_state['message'] = f"Your final score is: ${final_score}\nPortfolio value: ${portfolio_value}\nTotal assets: ${total_assets}\n\nYou ended with a loss of ${-profit}.\n\nYou still have ${debt_remaining} in debt. You'll need to work at Mandy's for {hours_needed} hours to pay it off."
+                game_state['message'] = f"Your final score is: ${result.final_score}\nPortfolio value: ${result.portfolio_value}\nTotal assets: ${result.total_assets}\n\nYou ended with a loss of ${-result.profit}.\n\nYou still have ${debt_remaining} in debt. You'll need to work at Mandy's for {hours_needed} hours to pay it off."
             else:
-                game_state['message'] = f"Your final score is: ${final_score}\nPortfolio value: ${portfolio_value}\nTotal assets: ${total_assets}\n\nYou ended with a loss of ${-profit}, but at least you're not in debt!"
-        
-        # Check if it's a high score
-        game_state['high_scores'].add_score(player.name, final_score, player.health, player.fame)
-        
-        # Log game end
-        logger.log_game_end(player, game_over_reason, final_score, stock_manager)
-    
-    # Check if player is dead
-    if player.health <= 0:
-        game_over = True
-        game_over_reason = "HEALTH_ZERO"
-        
-        # Calculate final score
-        final_score = player.cash + player.bank_savings - player.debt
-        
+                game_state['message'] = f"Your final score is: ${result.final_score}\nPortfolio value: ${result.portfolio_value}\nTotal assets: ${result.total_assets}\n\nYou ended with a loss of ${-result.profit}, but at least you're not in debt!"
+    elif result:
         game_state['message'] = "Your health has dropped to 0. Game over!"
-        
-        # Log game end
-        logger.log_game_end(player, game_over_reason, final_score, stock_manager)
+    
+    save_game_state(game_state)
     
     # Return game state data with game over info
-    response_data = get_game_state_data(game_state)
-    if game_over:
-        response_data['game_over'] = True
-        response_data['game_over_reason'] = game_over_reason
-        response_data['final_score'] = final_score
-        response_data['high_scores'] = game_state['high_scores'].get_scores()
-    
-    return jsonify(response_data)
+    extra = None
+    if result:
+        leaderboard = get_leaderboard()
+        extra = {
+            'game_over': True,
+            'game_over_reason': result.reason,
+            'final_score': result.final_score,
+            'high_scores': leaderboard.get_scores()
+        }
+        if result.reason == "DAYS_OVER":
+            # Rank of the player among all the scores ever recorded
+            extra['rank'] = leaderboard.rank_of(result.final_score)
+    
+    return game_state_json(game_state, extra)
 
 @api.route('/game/<game_id>/buy', methods=['POST'])
 def buy_stocks(game_id):
@@ -195,43 +172,16 @@ def buy_stocks(game_id):
     stock_id = data.get('stock_id')
     amount = int(data.get('amount', 1))  # Ensure amount is an integer
     
-    player = game_state['player']
-    stock_manager = game_state['stock_manager']
-    logger = game_state['logger']
-    
-    # Find the stock
-    stock_found = False
-    for market_stock_id, ticker, name, price in stock_manager.get_available_stocks():
-        if market_stock_id == stock_id:
-            stock_found = True
-            
-            # Check if player has enough money
-            if player.cash < price:
-                return jsonify({'error': "You don't have enough cash to buy even one share of this stock."}), 400
-            
-            # Calculate max amount player can buy
-            max_buy = min(player.cash // price, player.portfolio_capacity - player.portfolio_used)
-            if max_buy <= 0:
-                return jsonify({'error': "You don't have enough space in your trade book or cash to buy this stock."}), 400
-            
-            # Validate amount
-            if amount > max_buy:
-                amount = max_buy
-            
-            # Process purchase
-            player.cash -= price * amount
-            player.add_to_portfolio(stock_id, ticker, name, amount, price)
-            
-            # Log the purchase
-            logger.log_buy(player, stock_id, ticker, name, amount, price)
-            
-            game_state['message'] = f"You bought {amount} shares of ${ticker} for ${price * amount}."
-            break
-    
-    if not stock_found:
-        return jsonify({'error': 'Stock not found'}), 404
-    
-    return jsonify(get_game_state_data(game_state))
+    try:
+        ticker, amount, cost = get_game_engine(game_state).buy(stock_id, amount)
+    except GameError as e:
+        return game_error(e)
+    
+    game_state['message'] = f"You bought {amount} shares of ${ticker} for ${cost}."
+    
+    save_game_state(game_state)
+    
+    return game_state_json(game_state)
 
 @api.route('/game/<game_id>/sell', methods=['POST'])
 def sell_stocks(game_id):
@@ -244,42 +194,86 @@ def sell_stocks(game_id):
     stock_id = data.get('stock_id')
     amount = int(data.get('amount', 1))  # Ensure amount is an integer
     
-    player = game_state['player']
-    stock_manager = game_state['stock_manager']
-    logger = game_state['logger']
+    try:
+        ticker, amount, market_price, cost = get_game_engine(game_state).sell(stock_id, amount)
+    except GameError as e:
+        return game_error(e)
+    
+    revenue = market_price * amount
+    profit = revenue - cost
+    profit_text = f"profit ${profit}" if profit >= 0 else f"loss ${-profit}"
+    game_state['message'] = f"You sold {amount} shares of ${ticker} for ${revenue} ({profit_text})."
+    
+    save_game_state(game_state)
     
-    # Check if player has the stock
-    if stock_id not in player.portfolio:
-        return jsonify({'error': 'Stock not found in portfolio'}), 404
+    # Cost basis of the shares sold, by the player's cost basis method
+    sale = {'quantity': amount, 'price': market_price, 'cost': cost, 'profit': profit}
+    return game_state_json(game_state, {'sale': sale})
+
+@api.route('/game/<game_id>/orders', methods=['POST'])
+def place_orders(game_id):
+    """Buy and sell several stocks at once, all or nothing."""
+    game_state = get_game_state(game_id)
+    if not game_state:
+        return jsonify({'error': 'Game not found'}), 404
     
-    stock_info = player.portfolio[stock_id]
+    data = request.json or {}
+    legs = data.get('orders')
+    if not isinstance(legs, list) or not legs:
+        return jsonify({'error': 'orders must be a non-empty list of {action, stock_id, amount}'}), 400
+    if len(legs) > MAX_ORDER_LEGS:
+        return jsonify({'error': f'At most {MAX_ORDER_LEGS} orders can be placed at once'}), 400
+    
+    orders = []
+    for number, leg in enumerate(legs, 1):
+        try:
+            orders.append((leg['action'], int(leg['stock_id']), int(leg.get('amount', 1))))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return jsonify({'error': f'Order {number}: expected {{"action", "stock_id", "amount"}}'}), 400
+    
+    try:
+        results = get_game_engine(game_state).place_orders(orders)
+    except GameError as e:
+        return game_error(e)
+    
+    # One line per leg, and one save and response for the whole batch
+    filled = []
+    summary = []
+    for action, stock_id, ticker, quantity, price, cost in results:
+        if action == 'buy':
+            filled.append({'action': action, 'stock_id': stock_id, 'ticker': ticker, 'quantity': quantity,
+                           'price': price, 'total': cost})
+            summary.append(f"bought {quantity} shares of ${ticker} for ${cost}")
+        else:
+            revenue = price * quantity
+            filled.append({'action': action, 'stock_id': stock_id, 'ticker': ticker, 'quantity': quantity,
+                           'price': price, 'total': revenue, 'cost': cost, 'profit': revenue - cost})
+            summary.append(f"sold {quantity} shares of ${ticker} for ${revenue}")
+    game_state['message'] = "You " + ", ".join(summary) + "."
     
-    # Check if the stock is available in the market
-    market_price = 0
-    is_available = False
-    for market_stock_id, ticker, name, price in stock_manager.get_available_stocks():
-        if market_stock_id == stock_id:
-            market_price = price
-            is_available = True
-            break
+    save_game_state(game_state)
     
-    if not is_available:
-        return jsonify({'error': f"${stock_info['ticker']} is not currently tradable in the market."}), 400
+    return game_state_json(game_state, {'orders': filled})
+
+@api.route('/game/<game_id>/cost_basis', methods=['POST'])
+def set_cost_basis(game_id):
+    """Choose the lots sales take their shares from (fifo, lifo or average)."""
+    game_state = get_game_state(game_id)
+    if not game_state:
+        return jsonify({'error': 'Game not found'}), 404
     
-    # Validate amount
-    if amount > stock_info['quantity']:
-        amount = stock_info['quantity']
+    data = request.json
     
-    # Process sale
-    player.cash += market_price * amount
-    player.remove_from_portfolio(stock_id, amount)
+    try:
+        method = get_game_engine(game_state).set_cost_basis(data.get('method'))
+    except GameError as e:
+        return game_error(e)
     
-    # Log the sale
-    logger.log_sell(player, stock_id, stock_info['ticker'], stock_info['name'], amount, market_price, stock_info['price'])
+    game_state['message'] = f"Cost basis of your sales: {COST_BASIS_METHODS[method]}."
     
-    game_state['message'] = f"You sold {amount} shares of ${stock_info['ticker']} for ${market_price * amount}."
+    save_game_state(game_state)
     
-    return jsonify(get_game_state_data(game_state))
+    return game_state_json(game_state)
 
 @api.route('/game/<game_id>/bank', methods=['POST'])
 def bank_action(game_id):
@@ -292,59 +286,26 @@ def bank_action(game_id):
     action = data.get('action')
     amount = int(data.get('amount', 0))  # Ensure amount is an integer
     
-    player = game_state['player']
-    bank = game_state['bank']
-    logger = game_state['logger']
-    
-    if action == 'deposit':
-        # Validate amount
-        if amount > player.cash:
-            return jsonify({'error': "You don't have enough cash."}), 400
-        
-        # Process deposit
-        player.cash -= amount
-        player.bank_savings += amount
-        
-        # Log the deposit
-        logger.log_bank_transaction(player, "DEPOSIT", amount)
-        
-        game_state['message'] = f"You deposited ${amount} into your savings account."
-    
-    elif action == 'withdraw':
-        # Validate amount
-        if amount > player.bank_savings:
-            return jsonify({'error': "You don't have enough savings."}), 400
-        
-        # Process withdrawal
-        player.bank_savings -= amount
-        player.cash += amount
-        
-        # Log the withdrawal
-        logger.log_bank_transaction(player, "WITHDRAW", amount)
-        
-        game_state['message'] = f"You withdrew ${amount} from your savings account."
-    
-    elif action == 'repay':
-        # Validate amount
-        if amount > player.cash:
-            return jsonify({'error': "You don't have enough cash."}), 400
-        
-        if amount > player.debt:
-            amount = player.debt
-        
-        # Process repayment
-        player.cash -= amount
-        player.debt -= amount
-        
-        # Log the repayment
-        logger.log_bank_transaction(player, "REPAY", amount)
-        
-        game_state['message'] = f"You repaid ${amount} of your debt."
+    engine = get_game_engine(game_state)
+    
+    try:
+        if action == 'deposit':
+            amount = engine.deposit(amount)
+            game_state['message'] = f"You deposited ${amount} into your savings account."
+        elif action == 'withdraw':
+            amount = engine.withdraw(amount)
+            game_state['message'] = f"You withdrew ${amount} from your savings account."
+        elif action == 'repay':
+            amount = engine.repay(amount)
+            game_state['message'] = f"You repaid ${amount} of your debt."
+        else:
+            return jsonify({'error': 'Invalid action'}), 400
+    except GameError as e:
+        return game_error(e)
     
-    else:
-        return jsonify({'error': 'Invalid action'}), 400
+    save_game_state(game_state)
     
-    return jsonify(get_game_state_data(game_state))
+    return game_state_json(game_state)
 
 @api.route('/game/<game_id>/hospital', methods=['POST'])
 def hospital_action(game_id):
@@ -353,30 +314,19 @@ def hospital_action(game_id):
     if not game_state:
         return jsonify({'error': 'Game not found'}), 404
     
-    player = game_state['player']
-    hospital = game_state['hospital']
-    
-    # Check if player has enough cash for copay
-    copay = 200
-    if player.cash < copay:
-        return jsonify({'error': f"You need ${copay} for the hospital copay, but you only have ${player.cash}."}), 400
+    engine = get_game_engine(game_state)
+    copay, health_cost = engine.hospital_cost()
     
-    # Calculate cost based on current health
-    health_needed = 100 - player.health
-    health_cost = health_needed * 10000  # $10,000 per health point
-    total_cost = copay + health_cost
-    
-    # Check if player has enough cash for total cost
-    if player.cash < total_cost:
-        return jsonify({'error': f"You need ${total_cost} to fully restore your health (${copay} copay + ${health_cost} treatment cost due to your health insurance), but you only have ${player.cash}."}), 400
-    
-    # Process hospital visit
-    player.cash -= total_cost
-    player.health = 100
+    try:
+        total_cost = engine.visit_hospital()
+    except GameError as e:
+        return game_error(e)
     
     game_state['message'] = f"You spent ${total_cost} at the hospital (${copay} copay + ${health_cost} treatment cost due to your health insurance) and restored your health to 100."
     
-    return jsonify(get_game_state_data(game_state))
+    save_game_state(game_state)
+    
+    return game_state_json(game_state)
 
 @api.route('/game/<game_id>/broker', methods=['POST'])
 def broker_action(game_id):
@@ -388,26 +338,16 @@ def broker_action(game_id):
     data = request.json
     amount = int(data.get('amount', 0))  # Ensure amount is an integer
     
-    player = game_state['player']
-    logger = game_state['logger']
-    
-    # Validate amount
-    if amount > player.cash:
-        return jsonify({'error': "You don't have enough cash."}), 400
-    
-    if amount > player.debt:
-        amount = player.debt
-    
-    # Process repayment
-    player.cash -= amount
-    player.debt -= amount
-    
-    # Log the repayment
-    logger.log_bank_transaction(player, "REPAY", amount)
+    try:
+        amount = get_game_engine(game_state).repay(amount)
+    except GameError as e:
+        return game_error(e)
     
     game_state['message'] = f"You repaid ${amount} of your student loan debt."
     
-    return jsonify(get_game_state_data(game_state))
+    save_game_state(game_state)
+    
+    return game_state_json(game_state)
 
 @api.route('/game/<game_id>/trading_app', methods=['POST'])
 def trading_app_action(game_id):
@@ -418,20 +358,16 @@ def trading_app_action(game_id):
     
     player = game_state['player']
     
-    # Calculate cost for upgrade
-    cost = 30000  # $30,000 for 10 additional slots
-    
-    # Check if player has enough cash
-    if player.cash < cost:
-        return jsonify({'error': f"You need ${cost} to upgrade your trade book capacity, but you only have ${player.cash}."}), 400
-    
-    # Process upgrade
-    player.cash -= cost
-    player.portfolio_capacity += 10  # Add 10 slots instead of 50
+    try:
+        cost = get_game_engine(game_state).upgrade_trade_book()
+    except GameError as e:
+        return game_error(e)
     
     game_state['message'] = f"You spent ${cost} to upgrade your trade book capacity by 10 slots to {player.portfolio_capacity}."
     
-    return jsonify(get_game_state_data(game_state))
+    save_game_state(game_state)
+    
+    return game_state_json(game_state)
 
 @api.route('/game/<game_id>/darkweb', methods=['POST'])
 def darkweb_action(game_id):
@@ -440,26 +376,16 @@ def darkweb_action(game_id):
     if not game_state:
         return jsonify({'error': 'Game not found'}), 404
     
-    player = game_state['player']
-    
-    # Check if player has visited the darkweb too many times
-    if player.darkweb_visits >= 3:
-        return jsonify({'error': "You've visited the darkweb too many times today. Try again tomorrow."}), 400
-    
-    # Process darkweb visit
-    player.darkweb_visits += 1
-    
-    # Random reward
-    reward = random.randint(50, 200)
-    player.cash += reward
-    
-    # Random health penalty
-    health_penalty = random.randint(5, 15)
-    player.health = max(0, player.health - health_penalty)
+    try:
+        reward, health_penalty = get_game_engine(game_state).visit_darkweb()
+    except GameError as e:
+        return game_error(e)
     
     game_state['message'] = f"You visited the darkweb and found ${reward}, but lost {health_penalty} health points."
     
-    return jsonify(get_game_state_data(game_state))
+    save_game_state(game_state)
+    
+    return game_state_json(game_state)
 
 @api.route('/game/<game_id>/chart', methods=['GET'])
 def get_chart_data(game_id):
@@ -475,47 +401,66 @@ def get_chart_data(game_id):
     player = game_state['player']
     game_completed = player.days_left <= 0 or player.health <= 0
     
-    # Calculate final score
-    final_score = player.cash + player.bank_savings - player.debt
-    
-    # Calculate portfolio value
-    portfolio_value = 0
-    stock_manager = game_state['stock_manager']
-    for stock_id, stock_info in player.portfolio.items():
-        # Find current market price
-        for market_stock_id, _, _, price in stock_manager.get_available_stocks():
-            if market_stock_id == stock_id:
-                portfolio_value += price * stock_info['quantity']
-                break
+    # Current score and valuation, kept up to date by the engine
+    engine = get_game_engine(game_state)
     
-    # Calculate total assets
-    total_assets = final_score + portfolio_value
-    
-    # Return chart data
-    return jsonify({
+    # Return chart data (the history is encoded from its cached fragments)
+    return json_response(encode_game_state_response({
         'net_worth_history': net_worth_history,
         'game_completed': game_completed,
-        'final_score': final_score,
-        'portfolio_value': portfolio_value,
-        'total_assets': total_assets,
+        'final_score': engine.get_net_worth(),
+        'portfolio_value': engine.get_portfolio_value(),
+        'total_assets': engine.get_total_assets(),
         'player_name': player.name,
         'days_left': player.days_left
-    })
+    }, game_state))
+
+def scores_window():
+    """
+    Read the leaderboard window of a request (``?window=all|daily|weekly``).
+    
+    Returns:
+        str: Window name, or None if it is unknown
+    """
+    window = request.args.get('window', ALL_TIME)
+    return window if window in WINDOWS else None
 
 @api.route('/high_scores', methods=['GET'])
 def get_high_scores():
-    """Get high scores."""
-    from .game_state import game_states
-    
-    # Combine high scores from all games
-    all_scores = []
-    for game_state in game_states.values():
-        all_scores.extend(game_state['high_scores'].get_scores())
-    
-    # Sort by score (descending)
-    all_scores.sort(key=lambda x: x['score'], reverse=True)
-    
-    # Take top 10
-    top_scores = all_scores[:10]
-    
-    return jsonify(top_scores)
+    """Get a page of high scores (``?window=all|daily|weekly&offset=0&limit=10``)."""
+    window = scores_window()
+    offset = request.args.get('offset', 0, type=int)
+    limit = request.args.get('limit', 10, type=int)
+    if window is None:
+        return jsonify({'error': 'Window must be one of: ' + ', '.join(WINDOWS)}), 400
+    if offset < 0 or not 1 <= limit <= MAX_SCORES_LIMIT:
+        return jsonify({'error': f'Offset must not be negative and limit between 1 and {MAX_SCORES_LIMIT}'}), 400
+    
+    # The rankings are kept up to date as games end, and the encoding of each page is cached
+    leaderboard = get_leaderboard()
+    response = json_response(leaderboard.response_bytes(window, offset, limit))
+    response.headers['X-Total-Count'] = str(leaderboard.count(window))
+    return response
+
+@api.route('/high_scores/rank', methods=['GET'])
+def get_high_score_rank():
+    """Get the rank a score has among the high scores (``?score=<score>&window=all|daily|weekly``)."""
+    window = scores_window()
+    score = request.args.get('score', type=int)
+    if window is None:
+        return jsonify({'error': 'Window must be one of: ' + ', '.join(WINDOWS)}), 400
+    if score is None:
+        return jsonify({'error': 'Score must be an integer'}), 400
+    
+    leaderboard = get_leaderboard()
+    return jsonify({
+        'window': window,
+        'score': score,
+        'rank': leaderboard.rank_of(score, window),
+        'total': leaderboard.count(window)
+    })
+
+@api.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Get the memory metrics of the game store: resident games, bytes per game and evictions."""
+    return jsonify(get_game_store().metrics())
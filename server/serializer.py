@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON serialization for Yolo Terminal game server.
+Assembles game state responses from cached, pre-encoded fragments and uses
+orjson as the JSON backend when it is installed.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+
+from flask import Response
+
+from game.stocks import StockManager
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj: Any) -> bytes:
+        """
+        Encode an object as compact UTF-8 JSON.
+
+        Args:
+            obj: Object to encode
+
+        Returns:
+            bytes: JSON document
+        """
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+else:
+    JSON_BACKEND = "json"
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(obj: Any) -> bytes:
+        """
+        Encode an object as compact UTF-8 JSON.
+
+        Args:
+            obj: Object to encode
+
+        Returns:
+            bytes: JSON document
+        """
+        return _encoder.encode(obj).encode("utf-8")
+
+# Ticker metadata never changes, so each available stock entry is its
+# pre-encoded prefix followed by today's price
+_STOCK_PREFIXES: Dict[int, bytes] = {
+    stock_id: b'{"id":%d,"ticker":%s,"name":%s,"price":' % (stock_id, dumps(ticker), dumps(name))
+    for stock_id, ticker, name, _, _ in StockManager.STOCK_DEFINITIONS
+}
+
+
+class FragmentCache:
+    """
+    FragmentCache mapping objects to their encoded JSON, by object identity.
+
+    Used for values that are cached by the game objects and replaced rather
+    than modified when they change (the available stocks list, the net worth
+    history and its daily entries). The object is kept alongside its bytes so
+    that its id cannot be reused while the entry is cached.
+    """
+
+    def __init__(self, max_entries: int = 50000):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached fragments, least recently used are dropped first
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[Any, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, obj: Any, encode: Callable[[Any], bytes]) -> bytes:
+        """
+        Get the encoded JSON of an object, encoding it on a miss.
+
+        Args:
+            obj: Object to encode, must not be modified after it was encoded
+            encode: Function encoding the object
+
+        Returns:
+            bytes: Encoded JSON
+        """
+        key = id(obj)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is obj:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        data = encode(obj)
+        with self._lock:
+            self._entries[key] = (obj, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def clear(self) -> None:
+        """Drop all cached fragments."""
+        with self._lock:
+            self._entries.clear()
+
+
+fragment_cache = FragmentCache()
+
+@lru_cache(maxsize=256)
+def _encode_key(key: str) -> bytes:
+    """Encode an object key followed by its colon."""
+    return dumps(key) + b":"
+
+@lru_cache(maxsize=1024)
+def encode_text(text: str) -> bytes:
+    """
+    Encode a string from a small fixed set, such as a day description.
+
+    Args:
+        text: String to encode
+
+    Returns:
+        bytes: Encoded JSON string
+    """
+    return dumps(text)
+
+@lru_cache(maxsize=1024)
+def encode_headline(text: str, agency: str) -> bytes:
+    """
+    Encode a headline; headlines and agencies come from fixed lists.
+
+    Args:
+        text: Headline text
+        agency: News agency acronym
+
+    Returns:
+        bytes: Encoded JSON object
+    """
+    return b'{"text":' + dumps(text) + b',"agency":' + dumps(agency) + b"}"
+
+def _encode_stock_list(stocks: List[Tuple[int, str, str, int]]) -> bytes:
+    """Encode (stock_id, ticker, name, price) tuples from the ticker prefixes."""
+    parts = []
+    for stock_id, ticker, name, price in stocks:
+        prefix = _STOCK_PREFIXES.get(stock_id)
+        if prefix is None:
+            parts.append(dumps({'id': stock_id, 'ticker': ticker, 'name': name, 'price': price}))
+        else:
+            parts.append(prefix + b"%d}" % price)
+    return b"[" + b",".join(parts) + b"]"
+
+def encode_available_stocks(stocks: List[Tuple[int, str, str, int]]) -> bytes:
+    """
+    Encode the available stocks list of a StockManager.
+
+    Args:
+        stocks: List returned by StockManager.get_available_stocks
+
+    Returns:
+        bytes: Encoded JSON list of stock objects
+    """
+    return fragment_cache.get(stocks, _encode_stock_list)
+
+def _encode_history(history: List[Dict[str, Any]]) -> bytes:
+    """Encode a history list, reusing the fragments of days already encoded."""
+    return b"[" + b",".join(fragment_cache.get(stat, dumps) for stat in history) + b"]"
+
+def encode_history(history: List[Dict[str, Any]]) -> bytes:
+    """
+    Encode the net worth history of a GameLogger.
+
+    Only the days recorded since the last call are encoded, earlier days
+    reuse their cached fragments.
+
+    Args:
+        history: List returned by GameLogger.get_net_worth_history
+
+    Returns:
+        bytes: Encoded JSON list of daily stats
+    """
+    return fragment_cache.get(history, _encode_history)
+
+def _encode_fields(fields: Dict[str, Any], game_state: Dict[str, Any]) -> bytes:
+    """
+    Encode a response object, using cached fragments for the fields built
+    from the game's cached objects.
+
+    Args:
+        fields: Response fields
+        game_state: Game state the fields were built from
+
+    Returns:
+        bytes: Encoded JSON object
+    """
+    parts = []
+    for key, value in fields.items():
+        if key == 'available_stocks':
+            data = encode_available_stocks(game_state['stock_manager'].get_available_stocks())
+        elif key == 'net_worth_history':
+            data = encode_history(game_state['logger'].get_net_worth_history())
+        elif key == 'current_day':
+            data = encode_text(value)
+        elif key == 'headline':
+            data = encode_headline(value['text'], value['agency'])
+        elif key == 'delta':
+            data = _encode_fields(value, game_state)
+        else:
+            data = dumps(value)
+        parts.append(_encode_key(key) + data)
+    return b"{" + b",".join(parts) + b"}"
+
+def encode_game_state_response(response: Dict[str, Any], game_state: Dict[str, Any]) -> bytes:
+    """
+    Encode a payload returned by get_game_state_response (full or delta).
+
+    The available stocks and net worth history fields are encoded from the
+    stock manager's and logger's cached lists, which the payload was built
+    from in the same request.
+
+    Args:
+        response: Response payload
+        game_state: Game state the payload was built from
+
+    Returns:
+        bytes: Encoded JSON document
+    """
+    return _encode_fields(response, game_state)
+
+def json_response(data: bytes, status: int = 200) -> Response:
+    """
+    Wrap an encoded JSON document in a Flask response.
+
+    Args:
+        data: Encoded JSON document
+        status: HTTP status code
+
+    Returns:
+        Response: Flask response
+    """
+    return Response(data, status=status, mimetype='application/json')
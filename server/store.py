@@ -0,0 +1,950 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Game state storage for Yolo Terminal game.
+Provides a GameStore abstraction with an in-memory backend, an in-memory
+backend made durable by a snapshot and action log, and a local SQLite
+backend that can be shared by several worker processes.
+"""
+
+import json
+import mmap
+import os
+import pickle
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from game.engine import GameEngine, GameError
+from game.journal import apply_action
+from .eviction import FINISHED, GameResidency
+from .ids import key_matches, split_key
+
+def serialize_game_state(game_state: Dict[str, Any]) -> bytes:
+    """
+    Serialize a game state into compact bytes.
+    Game objects trim their own pickled state (see their __getstate__ methods).
+
+    Args:
+        game_state: Game state
+
+    Returns:
+        bytes: Compressed pickle of the game state
+    """
+    return zlib.compress(pickle.dumps(game_state, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+def deserialize_game_state(data: bytes) -> Dict[str, Any]:
+    """
+    Deserialize a game state produced by serialize_game_state.
+
+    Args:
+        data: Serialized game state
+
+    Returns:
+        dict: Game state
+    """
+    return pickle.loads(zlib.decompress(data))
+
+
+class StaleGameError(Exception):
+    """Raised when a game is saved from a state that another process has changed since it was loaded."""
+    pass
+
+
+class GameStore:
+    """
+    GameStore base class defining how game states are stored and looked up.
+    Games can be looked up by game ID or by token. Tokens start with the
+    game ID (see server.ids), so both are resolved with one key lookup.
+    """
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a game state by game ID or token.
+
+        Args:
+            key: Game ID or token
+
+        Returns:
+            dict: Game state or None if not found (or if the token is wrong)
+        """
+        raise NotImplementedError
+
+    def put(self, game_state: Dict[str, Any]) -> None:
+        """
+        Store a new or modified game state. Stores shared by several
+        processes raise StaleGameError when the game was changed by another
+        process since this state was loaded.
+
+        Args:
+            game_state: Game state
+        """
+        raise NotImplementedError
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all stored game states (each game once).
+
+        Returns:
+            Iterator of game states
+        """
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Write any buffered changes to the backend."""
+        pass
+
+    def close(self) -> None:
+        """Flush buffered changes and release backend resources."""
+        self.flush()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the memory metrics of the store.
+
+        Returns:
+            dict: Resident game count, estimated bytes per game, evictions, etc.
+        """
+        return {}
+
+
+class MemoryGameStore(GameStore):
+    """
+    MemoryGameStore keeping live game state objects in a process-local dict.
+
+    Games can leave memory when they have not been used for idle_ttl
+    seconds, finished_ttl seconds after they ended, or least recently used
+    first when their estimated memory use exceeds memory_budget bytes.
+    Evicted games are dropped and their players get "Game not found", so
+    nothing is evicted unless asked for: use a journal:// store to spill
+    games to disk instead.
+    """
+
+    def __init__(self, idle_ttl: Optional[float] = None, finished_ttl: Optional[float] = None,
+                 memory_budget: Optional[int] = None):
+        """
+        Initialize the in-memory store.
+
+        Args:
+            idle_ttl: Evict games not used for this many seconds (never if None)
+            finished_ttl: Evict finished games not used for this many seconds (never if None)
+            memory_budget: Evict the least recently used games beyond this
+                estimated memory use in bytes (no limit if None)
+        """
+        self.game_states: Dict[str, Dict[str, Any]] = {}
+        self.residency = GameResidency(idle_ttl, finished_ttl, memory_budget)
+        self._sweep_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        game_id, _ = split_key(key)
+        game_state = self.game_states.get(game_id)
+        if game_state is None or not key_matches(key, game_state['token']):
+            return None
+        self.residency.touch(game_id)
+        return game_state
+
+    def put(self, game_state: Dict[str, Any]) -> None:
+        self._add(game_state)
+        self._sweep()
+
+    def _add(self, game_state: Dict[str, Any]) -> None:
+        """
+        Keep a game state in memory.
+
+        Args:
+            game_state: Game state
+        """
+        self.game_states[game_state['game_id']] = game_state
+        self.residency.touch(game_state['game_id'], game_state)
+
+    def _sweep(self) -> None:
+        """Evict the games picked by the residency policy, unless another thread is already at it."""
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            evicted = self.residency.expired()
+            if evicted:
+                self._evict(evicted)
+        finally:
+            self._sweep_lock.release()
+
+    def _evict(self, evicted: List[Tuple[str, str]]) -> None:
+        """
+        Remove games from memory.
+
+        Args:
+            evicted: List of (game_id, reason) tuples
+        """
+        for game_id, _ in evicted:
+            game_state = self.game_states.pop(game_id, None)
+            if game_state is not None:
+                self._drop(game_state)
+
+    def _drop(self, game_state: Dict[str, Any]) -> None:
+        """Release the log files of an evicted game."""
+        logger = game_state.get('logger')
+        if logger is not None:
+            logger.close()
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self.game_states.values()))
+
+    def metrics(self) -> Dict[str, Any]:
+        return self.residency.metrics()
+
+
+class SQLiteGameStore(GameStore):
+    """
+    SQLiteGameStore keeping serialized game states in a local SQLite database.
+
+    Writes are buffered and committed in batches, either when batch_size games
+    are pending or after flush_interval seconds. Reads go through a per-process
+    cache of deserialized states that is validated against the row version, so
+    an unchanged game costs one indexed lookup and no deserialization. Games
+    leave the cache with the same policy as MemoryGameStore; their rows stay.
+
+    Row versions are assigned by the database (incremented on every write).
+    A game state remembers the version it was loaded or last written at
+    (ROW_VERSION), and a write only applies if the row still has that
+    version (compare-and-set). A write from a state that another process
+    changed since is rejected and the game leaves the cache, so the next
+    get loads the current state: put raises StaleGameError when it writes
+    through (batch_size=1), and batched stale writes are dropped and
+    counted in the conflicts metric.
+    """
+
+    # Game state key of the row version the state was loaded or written at
+    ROW_VERSION = 'row_version'
+
+    def __init__(self, path: str = "games.db", batch_size: int = 64, flush_interval: float = 0.05,
+                 idle_ttl: Optional[float] = 3600, finished_ttl: Optional[float] = 600,
+                 memory_budget: Optional[int] = None):
+        """
+        Initialize the SQLite store.
+
+        Args:
+            path: Path to the SQLite database file
+            batch_size: Number of pending writes that triggers a flush
+            flush_interval: Maximum time (seconds) a write stays buffered
+            idle_ttl: Drop cached games not used for this many seconds (never if None)
+            finished_ttl: Drop cached finished games not used for this many seconds (never if None)
+            memory_budget: Drop the least recently used cached games beyond this
+                estimated memory use in bytes (no limit if None)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # Stale writes rejected
+        self.conflicts = 0
+
+        # Pending writes: game_id -> game state
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # Writes taken by a flush that is not committed yet: game_id -> game state
+        self._flushing: Dict[str, Dict[str, Any]] = {}
+        # Read cache: game_id -> (version, game state)
+        self._cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self.residency = GameResidency(idle_ttl, finished_ttl, memory_budget)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            "game_id TEXT PRIMARY KEY, "
+            "token TEXT UNIQUE, "
+            "version INTEGER NOT NULL, "
+            "updated REAL NOT NULL, "
+            "state BLOB NOT NULL)"
+        )
+        conn.commit()
+
+        # Background flusher bounds how long a write stays buffered
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="game-store-flusher", daemon=True)
+        self._flusher.start()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's SQLite connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _flush_loop(self) -> None:
+        """Flush pending writes every flush_interval seconds."""
+        while not self._closed.wait(self.flush_interval):
+            if self._pending:
+                self.flush()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        game_id, _ = split_key(key)
+
+        # Games with buffered writes are newer than the database row
+        game_state = self._pending.get(game_id) or self._flushing.get(game_id)
+        if game_state is not None:
+            return game_state if key_matches(key, game_state['token']) else None
+
+        conn = self._connection()
+        row = conn.execute("SELECT game_id, version, token FROM games WHERE game_id = ?", (game_id,)).fetchone()
+        if row is None or not key_matches(key, row[2]):
+            return None
+        game_id, version, _ = row
+
+        cached = self._cache.get(game_id)
+        if cached is not None and cached[0] >= version:
+            self.residency.touch(game_id)
+            return cached[1]
+
+        # Changed by another worker (or not cached yet), load the full state
+        row = conn.execute("SELECT version, state FROM games WHERE game_id = ?", (game_id,)).fetchone()
+        if row is None:
+            return None
+        version, data = row
+        game_state = deserialize_game_state(data)
+        game_state[self.ROW_VERSION] = version
+        self._cache[game_id] = (version, game_state)
+        self.residency.touch(game_id, game_state)
+        return game_state
+
+    def put(self, game_state: Dict[str, Any]) -> None:
+        game_id = game_state['game_id']
+        with self._lock:
+            self._pending[game_id] = game_state
+            should_flush = len(self._pending) >= self.batch_size
+        if should_flush and game_id in self._flush():
+            raise StaleGameError(f"Game {game_id} was changed by another request")
+
+    def flush(self) -> None:
+        self._flush()
+
+    def _flush(self) -> List[str]:
+        """
+        Write the pending games, each only if its row is still at the
+        version the game state was loaded at.
+
+        Returns:
+            List of the IDs of the games whose stale writes were rejected
+        """
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._flushing.update(pending)
+            if not pending:
+                return []
+            conflicts = self._write(pending)
+
+        # Drop the cached games picked by the residency policy
+        for game_id, _ in self.residency.expired():
+            self._cache.pop(game_id, None)
+        return conflicts
+
+    def _write(self, pending: Dict[str, Dict[str, Any]]) -> List[str]:
+        """
+        Write game states in one transaction (the write lock must be held).
+
+        Args:
+            pending: Game states by game ID
+
+        Returns:
+            List of the IDs of the games whose stale writes were rejected
+        """
+        conflicts = []
+        try:
+            now = time.time()
+            rows = [(game_id, game_state.get(self.ROW_VERSION), game_state['token'], now,
+                     serialize_game_state(game_state))
+                    for game_id, game_state in pending.items()]
+
+            # The database assigns the versions. A new game is inserted at
+            # version 1; a known game is updated only if nobody wrote it since
+            versions = {}
+            conn = self._connection()
+            with conn:
+                for game_id, expected, token, updated, data in rows:
+                    if expected is None:
+                        row = conn.execute(
+                            "INSERT INTO games (game_id, token, version, updated, state) VALUES (?, ?, 1, ?, ?) "
+                            "ON CONFLICT(game_id) DO NOTHING RETURNING version",
+                            (game_id, token, updated, data)
+                        ).fetchone()
+                    else:
+                        row = conn.execute(
+                            "UPDATE games SET version = version + 1, updated = ?, state = ? "
+                            "WHERE game_id = ? AND version = ? RETURNING version",
+                            (updated, data, game_id, expected)
+                        ).fetchone()
+                    if row is None:
+                        conflicts.append(game_id)
+                    else:
+                        versions[game_id] = row[0]
+
+            for game_id, game_state in pending.items():
+                if game_id in versions:
+                    game_state[self.ROW_VERSION] = versions[game_id]
+                    self._cache[game_id] = (versions[game_id], game_state)
+                    self.residency.touch(game_id, game_state)
+                else:
+                    # Stale: the next get loads the game as the other process left it
+                    self._cache.pop(game_id, None)
+                    self.residency.remove(game_id)
+            self.conflicts += len(conflicts)
+        finally:
+            with self._lock:
+                for game_id, game_state in pending.items():
+                    if self._flushing.get(game_id) is game_state:
+                        del self._flushing[game_id]
+        return conflicts
+
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        self.flush()
+        conn = self._connection()
+        for game_id, version, data in conn.execute("SELECT game_id, version, state FROM games"):
+            cached = self._cache.get(game_id)
+            if cached is not None and cached[0] >= version:
+                yield cached[1]
+            else:
+                yield deserialize_game_state(data)
+
+    def metrics(self) -> Dict[str, Any]:
+        metrics = self.residency.metrics()
+        metrics.update(conflicts=self.conflicts)
+        return metrics
+
+    def close(self) -> None:
+        self._closed.set()
+        self.flush()
+
+
+# Log records: kind, game ID length, token length, payload length, CRC32 of the rest of the record
+_RECORD_HEADER = struct.Struct("<BHHII")
+_SNAPSHOT = 1  # Payload: serialized game state
+_ACTIONS = 2   # Payload: JSON [journal position, [action, ...]]
+_DELETE = 3    # No payload: the game was removed
+
+def _encode_record(kind: int, game_id: str, payload: bytes = b"", token: str = "") -> bytes:
+    """
+    Frame a log record.
+
+    Args:
+        kind: Record kind (_SNAPSHOT, _ACTIONS or _DELETE)
+        game_id: Game ID
+        payload: Record payload
+        token: Token of the game (snapshots only)
+
+    Returns:
+        bytes: Framed record
+    """
+    key = game_id.encode("utf-8")
+    token_bytes = token.encode("utf-8")
+    body = key + token_bytes + payload
+    return _RECORD_HEADER.pack(kind, len(key), len(token_bytes), len(payload), zlib.crc32(body)) + body
+
+def _payload_span(offset: int, record: bytes) -> Tuple[int, int]:
+    """
+    Locate the payload of a framed record written at a log offset.
+
+    Args:
+        offset: Log offset of the record
+        record: Framed record
+
+    Returns:
+        Tuple (payload start, record end)
+    """
+    _, key_length, token_length, payload_length, _ = _RECORD_HEADER.unpack_from(record)
+    payload_start = offset + _RECORD_HEADER.size + key_length + token_length
+    return payload_start, payload_start + payload_length
+
+def _scan_log(data) -> Tuple[Dict[str, list], int]:
+    """
+    Find the live records of every game in a log: its latest snapshot and
+    the action records appended after it. Deleted games are left out.
+
+    Args:
+        data: Log contents (bytes or mmap)
+
+    Returns:
+        Tuple (game_id -> [token, snapshot span, action spans], end of the
+        last valid record). Spans are (record start, payload start, record end).
+    """
+    games: Dict[str, list] = {}
+    offset = 0
+    size = len(data)
+    while offset + _RECORD_HEADER.size <= size:
+        kind, key_length, token_length, payload_length, crc = _RECORD_HEADER.unpack_from(data, offset)
+        key_start = offset + _RECORD_HEADER.size
+        token_start = key_start + key_length
+        payload_start = token_start + token_length
+        end = payload_start + payload_length
+        # A torn or corrupt record can only be the tail of an interrupted write
+        if end > size or zlib.crc32(data[key_start:end]) != crc:
+            break
+        game_id = data[key_start:token_start].decode("utf-8")
+        span = (offset, payload_start, end)
+        if kind == _SNAPSHOT:
+            games[game_id] = [data[token_start:payload_start].decode("utf-8"), span, []]
+        elif kind == _ACTIONS and game_id in games:
+            games[game_id][2].append(span)
+        elif kind == _DELETE:
+            games.pop(game_id, None)
+        offset = end
+    return games, offset
+
+
+class JournaledGameStore(MemoryGameStore):
+    """
+    JournaledGameStore keeping live game states in memory, made durable by an
+    append-only log in a local directory.
+
+    A game is snapshotted when it is created and whenever its day changes.
+    Between snapshots only the new actions of its journal (see game.journal)
+    are logged, which are a few bytes each. Records are appended by a
+    background thread and made durable with one fsync per batch, so a crash
+    loses at most the last flush_interval seconds of changes.
+
+    Games that are not in memory are dormant: the store only keeps the log
+    offsets of their latest snapshot and the actions logged after it. On
+    startup every game of the log is dormant. Idle games, and the least
+    recently used games beyond the memory budget, are spilled: snapshotted
+    and made dormant. A dormant game is read back, deserialized and its
+    actions replayed through the engine on first access. Finished games
+    are deleted from the log when they are evicted, and dormant games after
+    expire_ttl seconds.
+
+    The log is compacted (rewritten with the live records only) when it
+    grows past compact_ratio times its size after the last compaction.
+    """
+
+    LOG_FILE = "games.log"
+
+    def __init__(self, directory: str = "game_data", batch_size: int = 1024, flush_interval: float = 0.05,
+                 compact_ratio: float = 2.0, compact_min_bytes: int = 64 * 1024 * 1024,
+                 idle_ttl: Optional[float] = 900, finished_ttl: Optional[float] = 600,
+                 memory_budget: Optional[int] = None, expire_ttl: Optional[float] = 7 * 24 * 3600):
+        """
+        Initialize the store and restore the games of an existing log.
+
+        Args:
+            directory: Directory of the log file
+            batch_size: Number of pending records that triggers a flush
+            flush_interval: Maximum time (seconds) a record stays buffered before it is fsynced
+            compact_ratio: Compact when the log is this many times larger than after the last compaction
+            compact_min_bytes: Never compact logs smaller than this
+            idle_ttl: Spill games not used for this many seconds (never if None)
+            finished_ttl: Delete finished games not used for this many seconds (never if None)
+            memory_budget: Spill the least recently used games beyond this
+                estimated memory use in bytes (no limit if None)
+            expire_ttl: Delete games dormant for this many seconds (never if None)
+        """
+        super().__init__(idle_ttl, finished_ttl, memory_budget)
+        self.directory = directory
+        self.path = os.path.join(directory, self.LOG_FILE)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self.expire_ttl = expire_ttl
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._restore_lock = threading.Lock()
+        self._pending: List[bytes] = []
+        # Logged position of each game in memory: game_id -> (days left at the last snapshot, journal length)
+        self._logged: Dict[str, Tuple[int, int]] = {}
+        # Dormant games, least recently made dormant first:
+        # game_id -> (token, snapshot span, action spans, time made dormant).
+        # Spans are the (start, end) log offsets of record payloads.
+        self._dormant: Dict[str, Tuple[str, Tuple[int, int], List[Tuple[int, int]], float]] = {}
+        self.restores = 0
+
+        os.makedirs(directory, exist_ok=True)
+        start = time.perf_counter()
+        self.recovered = self._recover()
+        self.recovery_time = time.perf_counter() - start
+
+        self._file = open(self.path, "ab")
+        self._log_size = self._file.tell()
+        self._compacted_size = self._log_size
+        self._reader = os.open(self.path, os.O_RDONLY)
+
+        # Background flusher bounds how long a record stays buffered
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="game-log-flusher", daemon=True)
+        self._flusher.start()
+
+    def _recover(self) -> int:
+        """
+        Make the games of the log dormant and drop a torn record at its end.
+
+        Returns:
+            int: Number of games restored
+        """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return 0
+
+        now = time.monotonic()
+        with open(self.path, "r+b") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                games, end = _scan_log(data)
+                size = len(data)
+            finally:
+                data.close()
+            if end < size:
+                f.truncate(end)
+
+        for game_id, (token, snapshot, actions) in games.items():
+            self._dormant[game_id] = (token, snapshot[1:], [action[1:] for action in actions], now)
+        return len(games)
+
+    def _read(self, span: Tuple[int, int]) -> bytes:
+        """Read a record payload from the log (the restore lock must be held)."""
+        start, end = span
+        return os.pread(self._reader, end - start, start)
+
+    def _restore(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Bring a dormant game back into memory: deserialize its snapshot and
+        replay its logged actions.
+
+        Args:
+            key: Game ID or token
+
+        Returns:
+            dict: Game state or None if no dormant game has this key
+        """
+        game_id, _ = split_key(key)
+        with self._restore_lock:
+            # Another thread may have restored the game in the meantime
+            game_state = self.game_states.get(game_id)
+            if game_state is not None:
+                return game_state if key_matches(key, game_state['token']) else None
+
+            entry = self._dormant.get(game_id)
+            if entry is None or not key_matches(key, entry[0]):
+                return None
+            del self._dormant[game_id]
+            _, snapshot, actions, _ = entry
+
+            game_state = deserialize_game_state(self._read(snapshot))
+            for span in actions:
+                position, entries = json.loads(self._read(span))
+                self._replay(game_state, position, entries)
+
+            journal = game_state.get('journal')
+            self._logged[game_id] = (game_state['player'].days_left, len(journal) if journal is not None else 0)
+            self._add(game_state)
+            self.restores += 1
+            return game_state
+
+    def _replay(self, game_state: Dict[str, Any], position: int, entries: List[list]) -> None:
+        """
+        Apply logged journal actions to a restored game state.
+
+        Actions already in the snapshot are skipped. The engine records the
+        replayed actions in the game's journal again, without logging them.
+
+        Args:
+            game_state: Game state restored from its snapshot
+            position: Journal position of the first action
+            entries: Logged actions
+        """
+        journal = game_state.get('journal')
+        if journal is None:
+            return
+        engine = GameEngine(game_state['player'], game_state['stock_manager'], game_state['event_manager'],
+                            game_state['bank'], rng=game_state.get('rng'), journal=journal)
+        for index, action in enumerate(entries, position):
+            if index < len(journal):
+                continue
+            if index > len(journal):
+                break  # Actions are missing, keep the game as far as it is known
+            try:
+                apply_action(engine, tuple(action))
+            except GameError:
+                break
+        if engine.result is not None:
+            game_state['game_over'] = engine.result.reason
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        game_state = super().get(key)
+        if game_state is None and self._dormant:
+            game_state = self._restore(key)
+        return game_state
+
+    def put(self, game_state: Dict[str, Any]) -> None:
+        self._add(game_state)
+        if self._dormant:
+            # A new game replaces a dormant game with the same ID
+            with self._restore_lock:
+                self._dormant.pop(game_state['game_id'], None)
+        record = self._record(game_state)
+        if record is None:
+            return
+        with self._lock:
+            self._pending.append(record)
+            should_flush = len(self._pending) >= self.batch_size
+        if should_flush:
+            self.flush()
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        for game_id in list(self._dormant):
+            self._restore(game_id)
+        return super().values()
+
+    def _record(self, game_state: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Build the log record of a changed game: a snapshot for new games and
+        new days, the new journal actions otherwise.
+
+        Args:
+            game_state: Game state
+
+        Returns:
+            bytes: Framed record, or None if nothing replayable changed
+        """
+        game_id = game_state['game_id']
+        journal = game_state.get('journal')
+        days_left = game_state['player'].days_left
+        logged = self._logged.get(game_id)
+
+        if journal is None or logged is None or logged[0] != days_left:
+            self._logged[game_id] = (days_left, len(journal) if journal is not None else 0)
+            return _encode_record(_SNAPSHOT, game_id, serialize_game_state(game_state), game_state['token'])
+
+        position = logged[1]
+        if len(journal) <= position:
+            return None
+        self._logged[game_id] = (days_left, len(journal))
+        payload = json.dumps([position, journal.actions[position:]], separators=(",", ":"))
+        return _encode_record(_ACTIONS, game_id, payload.encode("utf-8"))
+
+    def _evict(self, evicted: List[Tuple[str, str]]) -> None:
+        """
+        Spill evicted games to the log, or delete them if they are finished.
+
+        Args:
+            evicted: List of (game_id, reason) tuples
+        """
+        # (game_id, game state, snapshot record or None to delete the game)
+        spilled = []
+        for game_id, reason in evicted:
+            game_state = self.game_states.get(game_id)
+            if game_state is None:
+                continue
+            if reason == FINISHED:
+                spilled.append((game_id, game_state, None))
+                continue
+            try:
+                snapshot = serialize_game_state(game_state)
+            except RuntimeError:
+                # Changed by a request while it was pickled, keep it in memory
+                self.residency.touch(game_id, game_state)
+                continue
+            spilled.append((game_id, game_state, _encode_record(_SNAPSHOT, game_id, snapshot, game_state['token'])))
+        if not spilled:
+            return
+
+        # One write and fsync for the batch, then the games leave memory
+        records = [record or _encode_record(_DELETE, game_id) for game_id, _, record in spilled]
+        with self._write_lock:
+            offset = self._append(records)
+            now = time.monotonic()
+            with self._restore_lock:
+                for (game_id, game_state, record), written in zip(spilled, records):
+                    # The next change of the game is logged as a snapshot
+                    self._logged.pop(game_id, None)
+                    start, offset = offset, offset + len(written)
+                    # Games used again since they were picked stay in memory
+                    if game_id in self.residency or self.game_states.pop(game_id, None) is None:
+                        continue
+                    self._drop(game_state)
+                    if record is not None:
+                        self._dormant[game_id] = (game_state['token'], _payload_span(start, record), [], now)
+
+    def _sweep(self) -> None:
+        """Evict the games picked by the residency policy and delete expired dormant games."""
+        super()._sweep()
+        if self.expire_ttl is None or not self._dormant:
+            return
+
+        deadline = time.monotonic() - self.expire_ttl
+        records = []
+        with self._restore_lock:
+            # Dormant games are kept in the order they were made dormant
+            for game_id, (_, _, _, dormant_since) in list(self._dormant.items()):
+                if dormant_since > deadline:
+                    break
+                del self._dormant[game_id]
+                records.append(_encode_record(_DELETE, game_id))
+        if records:
+            with self._lock:
+                self._pending.extend(records)
+
+    def _flush_loop(self) -> None:
+        """
+        Every flush_interval seconds, flush pending records, evict games and
+        compact the log when it has grown.
+        """
+        while not self._closed.wait(self.flush_interval):
+            self._sweep()
+            if self._pending:
+                self.flush()
+            if self._log_size > max(self.compact_min_bytes, self.compact_ratio * self._compacted_size):
+                self.compact()
+
+    def flush(self) -> None:
+        with self._write_lock:
+            self._append()
+
+    def _append(self, records: List[bytes] = ()) -> int:
+        """
+        Write the pending records, then the given ones, with one fsync (the
+        write lock must be held).
+
+        Args:
+            records: Framed records to write after the pending ones
+
+        Returns:
+            int: Log offset of the first given record
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        data = b"".join(pending)
+        offset = self._log_size + len(data)
+        data += b"".join(records)
+        if not data:
+            return offset
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._log_size += len(data)
+        return offset
+
+    def compact(self) -> None:
+        """Rewrite the log with the latest snapshot and later actions of each game only."""
+        with self._write_lock:
+            self._append()
+            self._file.close()
+            compact_path = self.path + ".compact"
+            # New payload spans of each game: snapshot first, then actions
+            spans: Dict[str, List[Tuple[int, int]]] = {}
+            with open(self.path, "rb") as f, open(compact_path, "wb") as out:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    games, _ = _scan_log(data)
+                    position = 0
+                    for game_id, (_, snapshot, actions) in games.items():
+                        game_spans = spans[game_id] = []
+                        for start, payload_start, end in [snapshot] + actions:
+                            out.write(data[start:end])
+                            game_spans.append((position + payload_start - start, position + end - start))
+                            position += end - start
+                finally:
+                    data.close()
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(compact_path, self.path)
+
+            # Make the rename durable
+            dir_fd = os.open(self.directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+            self._file = open(self.path, "ab")
+            self._log_size = self._compacted_size = self._file.tell()
+
+            # Dormant games now live at their offsets in the new log
+            with self._restore_lock:
+                for game_id, (token, _, _, dormant_since) in list(self._dormant.items()):
+                    game_spans = spans.get(game_id)
+                    if game_spans is None:
+                        del self._dormant[game_id]
+                    else:
+                        self._dormant[game_id] = (token, game_spans[0], game_spans[1:], dormant_since)
+                os.close(self._reader)
+                self._reader = os.open(self.path, os.O_RDONLY)
+
+    def metrics(self) -> Dict[str, Any]:
+        metrics = super().metrics()
+        metrics.update(dormant_games=len(self._dormant), restores=self.restores, log_bytes=self._log_size)
+        return metrics
+
+    def close(self) -> None:
+        self._closed.set()
+        self._flusher.join()
+        self.flush()
+        self._file.close()
+        os.close(self._reader)
+
+
+def create_store(url: Optional[str] = None) -> GameStore:
+    """
+    Create a game store from a store URL.
+
+    Supported URLs are ``memory://``, ``journal:///path/to/directory`` and
+    ``sqlite:///path/to/games.db``. All stores accept the ``idle_ttl``,
+    ``finished_ttl`` and ``memory_budget`` eviction query parameters, e.g.
+    ``memory://?idle_ttl=600&memory_budget=500000000``. Journal and SQLite
+    URLs also accept ``batch_size`` and ``flush_interval``, e.g.
+    ``sqlite:///games.db?batch_size=1`` to write through on every change.
+    Journal URLs also accept ``compact_ratio``, ``compact_min_bytes`` and
+    ``expire_ttl``.
+
+    Args:
+        url: Store URL (defaults to the YOLO_GAME_STORE environment variable, then memory)
+
+    Returns:
+        GameStore: Configured game store
+    """
+    if url is None:
+        url = os.environ.get("YOLO_GAME_STORE", "memory://")
+
+    if url.startswith("memory://"):
+        _, kwargs = _parse_url(url[len("memory://"):])
+        return MemoryGameStore(**kwargs)
+    if url.startswith("journal://"):
+        path, kwargs = _parse_url(url[len("journal://"):], batch_size=int, flush_interval=float,
+                                  compact_ratio=float, compact_min_bytes=int, expire_ttl=_ttl)
+        return JournaledGameStore(path or "game_data", **kwargs)
+    if url.startswith("sqlite://"):
+        path, kwargs = _parse_url(url[len("sqlite://"):], batch_size=int, flush_interval=float)
+        return SQLiteGameStore(path or "games.db", **kwargs)
+    raise ValueError(f"Unsupported game store URL: {url}")
+
+def _ttl(value: str) -> Optional[float]:
+    """Parse a TTL option, where ``none`` disables the eviction."""
+    return None if value.lower() == "none" else float(value)
+
+def _parse_url(rest: str, **option_types) -> Tuple[str, Dict[str, Any]]:
+    """
+    Parse the path and options of a store URL (the part after ``scheme://``).
+
+    Args:
+        rest: URL without its scheme
+        **option_types: Backend-specific options and their types, in
+            addition to the eviction options
+
+    Returns:
+        Tuple (path, keyword arguments of the backend)
+    """
+    path, _, query = rest.partition("?")
+    if path.startswith("/"):
+        path = path[1:]
+    option_types = dict(idle_ttl=_ttl, finished_ttl=_ttl, memory_budget=int, **option_types)
+    options = parse_qs(query)
+    kwargs = {name: option_type(options[name][0]) for name, option_type in option_types.items() if name in options}
+    return path, kwargs
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Multi-process server mode for Yolo Terminal game.
+Runs several worker processes that accept connections on one shared
+listening socket and keep their games in a shared SQLite store.
+"""
+
+import os
+import signal
+import socket
+import multiprocessing
+from typing import List, Optional
+
+from .ids import MAX_NODE
+
+# Default store for multi-process mode: every change is written through and
+# gets a new row version from the database, so the next request of a game
+# can go to any worker, which reloads the game if another worker changed it.
+# A worker that did not send a client's last payload answers delta requests
+# with the full payload. Requests of one game that run at the same time on
+# two workers are not serialized, but a write only applies to the version it
+# was loaded from: the later one is rejected with a 409 and changes nothing.
+DEFAULT_WORKER_STORE = "sqlite:///games.db?batch_size=1"
+
+def _worker_main(listen_fd: int, host: str, port: int, threaded: bool, node: int) -> None:
+    """
+    Serve requests from the shared listening socket in a worker process.
+
+    Args:
+        listen_fd: File descriptor of the shared listening socket
+        host: Host the socket is bound to
+        port: Port the socket is bound to
+        threaded: Handle requests of this worker in threads
+        node: Node number of this worker in game IDs (see server.ids)
+    """
+    # Import the app in the worker so that the store is opened after the fork
+    from werkzeug.serving import make_server
+    from .app import create_app
+    from .ids import set_node
+
+    # Workers allocate game IDs independently, each under its own node number
+    set_node(node)
+
+    app = create_app()
+    http_server = make_server(host, port, app, threaded=threaded, fd=listen_fd)
+    try:
+        http_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        from .game_state import game_store
+        if game_store is not None:
+            game_store.close()
+        from .leaderboard import close_leaderboard
+        close_leaderboard()
+
+def run_workers(workers: Optional[int] = None, host: str = "0.0.0.0", port: int = 5001,
+                store_url: Optional[str] = None, threaded: bool = True) -> None:
+    """
+    Run the game server with several worker processes.
+
+    Args:
+        workers: Number of worker processes (defaults to the number of CPUs)
+        host: Host to listen on
+        port: Port to listen on
+        store_url: Game store URL shared by the workers (see server.store.create_store)
+        threaded: Handle requests of each worker in threads
+    """
+    workers = workers or os.cpu_count() or 1
+
+    store_url = store_url or os.environ.get("YOLO_GAME_STORE") or DEFAULT_WORKER_STORE
+    if store_url.startswith(("memory://", "journal://")) and workers > 1:
+        raise ValueError("In-memory game stores cannot be shared by several workers, use a sqlite:// store.")
+    os.environ["YOLO_GAME_STORE"] = store_url
+
+    # Node numbers of the workers, after YOLO_NODE_ID for servers sharing a store
+    first_node = int(os.environ.get("YOLO_NODE_ID", "0"))
+    if first_node + workers - 1 > MAX_NODE:
+        raise ValueError(f"Worker node numbers go past {MAX_NODE}, lower YOLO_NODE_ID or the number of workers.")
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        raise RuntimeError("Multi-process mode needs the fork start method, which this platform does not support.")
+    context = multiprocessing.get_context("fork")
+
+    # Create the listening socket once, all workers accept from it
+    listen_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listen_socket.bind((host, port))
+    listen_socket.listen(1024)
+    listen_socket.set_inheritable(True)
+
+    processes: List[multiprocessing.Process] = []
+    for index in range(workers):
+        process = context.Process(target=_worker_main,
+                                  args=(listen_socket.fileno(), host, port, threaded, first_node + index))
+        process.start()
+        processes.append(process)
+
+    print(f"Serving on http://{host}:{port} with {workers} workers (store: {store_url})")
+
+    def stop(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        stop(signal.SIGINT, None)
+        for process in processes:
+            process.join()
+    finally:
+        listen_socket.close()
@@ -111,6 +111,65 @@ let gameState = {
     newsShown: false  // Flag to track if news has been shown for the current day
 };
 
+// Last full game state received from the server, used to apply delta responses
+let serverState = null;
+
+// Ask for a delta against the last received game state
+function withSince(url) {
+    if (serverState && serverState.version !== undefined) {
+        return `${url}?since=${serverState.version}`;
+    }
+    return url;
+}
+
+// Apply a full or delta game state response and return the full game state
+async function applyStateResponse(data, idToUse) {
+    if (data.delta === undefined) {
+        serverState = data;
+    } else if (serverState && data.since === serverState.version) {
+        const merged = Object.assign({}, serverState, data.delta);
+        data.removed.forEach(key => delete merged[key]);
+        merged.version = data.version;
+        serverState = merged;
+    } else {
+        // Responses arrived out of order, fetch the full state again
+        const response = await fetch(`/api/game/${idToUse}`);
+        serverState = await response.json();
+    }
+    
+    // Callers may modify the returned state, keep our copy intact
+    return Object.assign({}, serverState);
+}
+
+// Format a profit (or a loss) in green (or red)
+function formatProfit(profit) {
+    if (profit >= 0) {
+        return `<span class="positive">+$${profit}</span>`;
+    }
+    return `<span class="negative">-$${-profit}</span>`;
+}
+
+// Cost basis of shares sold out of a portfolio stock's lots, as the server
+// takes them: oldest lots first (fifo), newest first (lifo) or at the
+// average cost. A partly sold lot keeps the floor of its cost share.
+function saleCost(stock, quantity, method) {
+    const taken = (cost, held, part) => cost - Math.floor(cost * (held - part) / held);
+    if (method === 'average') {
+        return taken(stock.cost, stock.quantity, quantity);
+    }
+    const lots = method === 'lifo' ? stock.lots.slice().reverse() : stock.lots;
+    let cost = 0;
+    for (const lot of lots) {
+        if (quantity <= 0) {
+            break;
+        }
+        const part = Math.min(quantity, lot.quantity);
+        cost += taken(lot.cost, lot.quantity, part);
+        quantity -= part;
+    }
+    return cost;
+}
+
 // DOM Elements
 const elements = {
     // Screens
@@ -169,6 +228,9 @@ const elements = {
     confirmSellBtn: document.getElementById('confirm-sell-btn'),
     cancelSellBtn: document.getElementById('cancel-sell-btn'),
     backFromSellBtn: document.getElementById('back-from-sell-btn'),
+    costBasis: document.getElementById('cost-basis'),
+    sellRealized: document.getElementById('sell-realized'),
+    sellEstimate: document.getElementById('sell-estimate'),
     
     // Bank
     bank: document.getElementById('bank'),
@@ -252,7 +314,7 @@ const api = {
                 throw new Error(errorData.error || 'Failed to create new game');
             }
             
-            return await response.json();
+            return await applyStateResponse(await response.json(), null);
         } catch (error) {
             console.error('Error creating new game:', error);
             alert('Error creating new game: ' + error.message);
@@ -263,14 +325,14 @@ const api = {
     // Get game state
     getGame: async (gameId) => {
         try {
-            const response = await fetch(`/api/game/${gameId}`);
+            const response = await fetch(withSince(`/api/game/${gameId}`));
             
             if (!response.ok) {
                 const errorData = await response.json();
                 throw new Error(errorData.error || 'Failed to get game state');
             }
             
-            return await response.json();
+            return await applyStateResponse(await response.json(), gameId);
         } catch (error) {
             console.error('Error getting game state:', error);
             alert('Error getting game state: ' + error.message);
@@ -284,7 +346,7 @@ const api = {
             // Use token if available, otherwise use gameId
             const idToUse = gameState.token || gameId;
             
-            const response = await fetch(`/api/game/${idToUse}/next_day`, {
+            const response = await fetch(withSince(`/api/game/${idToUse}/next_day`), {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -296,7 +358,7 @@ const api = {
                 throw new Error(errorData.error || 'Failed to advance to next day');
             }
             
-            return await response.json();
+            return await applyStateResponse(await response.json(), idToUse);
         } catch (error) {
             console.error('Error advancing to next day:', error);
             alert('Error advancing to next day: ' + error.message);
@@ -310,7 +372,7 @@ const api = {
             // Use token if available, otherwise use gameId
             const idToUse = gameState.token || gameId;
             
-            const response = await fetch(`/api/game/${idToUse}/buy`, {
+            const response = await fetch(withSince(`/api/game/${idToUse}/buy`), {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -323,7 +385,7 @@ const api = {
                 throw new Error(errorData.error || 'Failed to buy stocks');
             }
             
-            return await response.json();
+            return await applyStateResponse(await response.json(), idToUse);
         } catch (error) {
             console.error('Error buying stocks:', error);
             alert('Error buying stocks: ' + error.message);
@@ -337,7 +399,7 @@ const api = {
             // Use token if available, otherwise use gameId
             const idToUse = gameState.token || gameId;
             
-            const response = await fetch(`/api/game/${idToUse}/sell`, {
+            const response = await fetch(withSince(`/api/game/${idToUse}/sell`), {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -350,7 +412,7 @@ const api = {
                 throw new Error(errorData.error || 'Failed to sell stocks');
             }
             
-            return await response.json();
+            return await applyStateResponse(await response.json(), idToUse);
         } catch (error) {
             console.error('Error selling stocks:', error);
             alert('Error selling stocks: ' + error.message);
@@ -358,13 +420,40 @@ const api = {
         }
     },
     
+    // Choose the lots sales take their shares from
+    setCostBasis: async (gameId, method) => {
+        try {
+            // Use token if available, otherwise use gameId
+            const idToUse = gameState.token || gameId;
+            
+            const response = await fetch(withSince(`/api/game/${idToUse}/cost_basis`), {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({ method: method })
+            });
+            
+            if (!response.ok) {
+                const errorData = await response.json();
+                throw new Error(errorData.error || 'Failed to change the cost basis');
+            }
+            
+            return await applyStateResponse(await response.json(), idToUse);
+        } catch (error) {
+            console.error('Error changing the cost basis:', error);
+            alert('Error changing the cost basis: ' + error.message);
+            return null;
+        }
+    },
+    
     // Bank actions
     bankAction: async (gameId, action, amount) => {
         try {
             // Use token if available, otherwise use gameId
             const idToUse = gameState.token || gameId;
             
-            const response = await fetch(`/api/game/${idToUse}/bank`, {
+            const response = await fetch(withSince(`/api/game/${idToUse}/bank`), {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -377,7 +466,7 @@ const api = {
                 throw new Error(errorData.error || 'Failed to perform bank action');
             }
             
-            return await response.json();
+            return await applyStateResponse(await response.json(), idToUse);
         } catch (error) {
             console.error('Error performing bank action:', error);
             alert('Error performing bank action: ' + error.message);
@@ -391,7 +480,7 @@ const api = {
             // Use token if available, otherwise use gameId
             const idToUse = gameState.token || gameId;
             
-            const response = await fetch(`/api/game/${idToUse}/hospital`, {
+            const response = await fetch(withSince(`/api/game/${idToUse}/hospital`), {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -403,7 +492,7 @@ const api = {
                 throw new Error(errorData.error || 'Failed to visit hospital');
             }
             
-            return await response.json();
+            return await applyStateResponse(await response.json(), idToUse);
         } catch (error) {
             console.error('Error visiting hospital:', error);
             alert('Error visiting hospital: ' + error.message);
@@ -417,7 +506,7 @@ const api = {
             // Use token if available, otherwise use gameId
             const idToUse = gameState.token || gameId;
             
-            const response = await fetch(`/api/game/${idToUse}/broker`, {
+            const response = await fetch(withSince(`/api/game/${idToUse}/broker`), {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -430,7 +519,7 @@ const api = {
                 throw new Error(errorData.error || 'Failed to visit broker');
             }
             
-            return await response.json();
+            return await applyStateResponse(await response.json(), idToUse);
         } catch (error) {
             console.error('Error visiting broker:', error);
             alert('Error visiting broker: ' + error.message);
@@ -444,7 +533,7 @@ const api = {
             // Use token if available, otherwise use gameId
             const idToUse = gameState.token || gameId;
             
-            const response = await fetch(`/api/game/${idToUse}/trading_app`, {
+            const response = await fetch(withSince(`/api/game/${idToUse}/trading_app`), {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -456,7 +545,7 @@ const api = {
                 throw new Error(errorData.error || 'Failed to use trading app');
             }
             
-            return await response.json();
+            return await applyStateResponse(await response.json(), idToUse);
         } catch (error) {
             console.error('Error using trading app:', error);
             alert('Error using trading app: ' + error.message);
@@ -470,7 +559,7 @@ const api = {
             // Use token if available, otherwise use gameId
             const idToUse = gameState.token || gameId;
             
-            const response = await fetch(`/api/game/${idToUse}/darkweb`, {
+            const response = await fetch(withSince(`/api/game/${idToUse}/darkweb`), {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -482,7 +571,7 @@ const api = {
                 throw new Error(errorData.error || 'Failed to visit darkweb');
             }
             
-            return await response.json();
+            return await applyStateResponse(await response.json(), idToUse);
         } catch (error) {
             console.error('Error visiting darkweb:', error);
             alert('Error visiting darkweb: ' + error.message);
@@ -771,6 +860,8 @@ const ui = {
     // Show sell stocks
     showSellStocks: () => {
         elements.sellStocksList.innerHTML = '';
+        elements.costBasis.value = gameState.player.cost_basis || 'fifo';
+        elements.sellRealized.innerHTML = formatProfit(gameState.player.realized_pnl || 0);
         
         if (gameState.portfolio.length === 0) {
             const item = document.createElement('div');
@@ -787,18 +878,24 @@ const ui = {
                 const tickerClass = isCrypto ? 'crypto' : 'stock';
                 
                 // Create HTML for sell item
-                let html = `${index + 1}. <span class="${tickerClass}">$${stock.ticker}</span> (${stock.name}) - Qty: ${stock.quantity} - Bought: $${stock.price}`;
+                let html = `${index + 1}. <span class="${tickerClass}">$${stock.ticker}</span> (${stock.name}) - Qty: ${stock.quantity} - Avg cost: $${stock.price}`;
                 
                 // Check if stock is available in market
                 if (stock.market_price > 0) {
-                    const profit = stock.market_price - stock.price;
-                    const profitClass = profit > 0 ? 'positive' : 'negative';
-                    const profitSign = profit > 0 ? '+' : '';
-                    html += ` - Current: $${stock.market_price} (<span class="${profitClass}">${profitSign}$${profit}</span>)`;
+                    html += ` - Current: $${stock.market_price} (${formatProfit(stock.unrealized)})`;
                 } else {
                     html += ' (Not tradable now)';
                 }
                 
+                // Lots of the stock, oldest first
+                (stock.lots || []).forEach(lot => {
+                    html += `<div class="lot-list">Day ${lot.day}: ${lot.quantity} @ $${lot.price}`;
+                    if (lot.unrealized !== null) {
+                        html += ` (${formatProfit(lot.unrealized)})`;
+                    }
+                    html += '</div>';
+                });
+                
                 item.innerHTML = html;
                 
                 // Add click event only if stock is tradable
@@ -819,6 +916,7 @@ const ui = {
                         elements.sellAmount.value = 1;
                         elements.sellAmount.max = stock.quantity;
                         elements.sellControls.classList.remove('hidden');
+                        ui.updateSellEstimate();
                     });
                 }
                 
@@ -832,6 +930,19 @@ const ui = {
         ui.showActionScreen('sell-stocks');
     },
     
+    // Show the cost basis and profit of the sale being entered
+    updateSellEstimate: () => {
+        const stock = gameState.selectedPortfolioStock;
+        const amount = parseInt(elements.sellAmount.value);
+        if (!stock || isNaN(amount) || amount <= 0) {
+            elements.sellEstimate.innerHTML = '';
+            return;
+        }
+        const quantity = Math.min(amount, stock.quantity);
+        const cost = saleCost(stock, quantity, gameState.player.cost_basis || 'fifo');
+        elements.sellEstimate.innerHTML = `Cost basis: $${cost} - ${formatProfit(stock.market_price * quantity - cost)}`;
+    },
+    
     // Show bank
     showBank: () => {
         elements.bankCash.textContent = gameState.player.cash;
@@ -1603,6 +1714,7 @@ const game = {
             
             // Set to max quantity
             elements.sellAmount.value = gameState.selectedPortfolioStock.quantity;
+            ui.updateSellEstimate();
         });
         
         // Add input validation to ensure integers
@@ -1621,6 +1733,18 @@ const game = {
             if (value > max) {
                 elements.sellAmount.value = max.toString();
             }
+            ui.updateSellEstimate();
+        });
+        
+        elements.costBasis.addEventListener('change', async () => {
+            const data = await api.setCostBasis(gameState.gameId, elements.costBasis.value);
+            
+            if (data) {
+                data.show_stocks = false;
+                game.loadGameState(data);
+                gameState.selectedPortfolioStock = null;
+                ui.showSellStocks();
+            }
         });
         
         elements.confirmSellBtn.addEventListener('click', async () => {
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared fixtures for the web server tests.
+"""
+
+import pytest
+
+import server.game_state as game_state_module
+import server.leaderboard as leaderboard_module
+from game.log_writer import get_log_writer
+from server.app import create_app
+from server.leaderboard import Leaderboard
+from server.store import MemoryGameStore
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """A test client of the web app with a fresh in-memory store and leaderboard, logging under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(game_state_module, "game_store", MemoryGameStore())
+    monkeypatch.setattr(leaderboard_module, "_leaderboard", Leaderboard())
+    app = create_app()
+    app.testing = True
+    with app.test_client() as test_client:
+        yield test_client
+    get_log_writer().flush(5.0)
+
+def start_game(client, name="Tester"):
+    """Start a new game through the API and return its token."""
+    response = client.post("/api/new_game", json={"player_name": name})
+    assert response.status_code == 200
+    return response.get_json()["token"]
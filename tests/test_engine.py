@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the location rules of the web and terminal games.
+"""
+
+import pytest
+
+from game.engine import TERMINAL_RULES, GameEngine, GameError
+from game.player import Player
+from game.rng import GameRNG
+
+def new_engine(rules=None, **player_fields):
+    """Engine of a new seeded game, with some player fields set."""
+    player = Player(name="Rules")
+    for name, value in player_fields.items():
+        setattr(player, name, value)
+    return GameEngine(player, rng=GameRNG(3), rules=rules)
+
+def test_web_hospital_restores_full_health():
+    engine = new_engine(health=90, cash=200000)
+    assert engine.visit_hospital() == 200 + 10 * 10000
+    assert engine.player.health == 100
+    with pytest.raises(GameError):
+        new_engine(health=90, cash=200000).visit_hospital(5)
+
+def test_terminal_hospital_sells_partial_insured_treatments():
+    engine = new_engine(TERMINAL_RULES, health=80, cash=10000)
+    assert engine.visit_hospital(5) == 500 + 5 * 3500 * 20 // 100
+    assert engine.player.health == 85
+    with pytest.raises(GameError):
+        engine.visit_hospital(16)
+
+def test_terminal_trading_app_charges_rich_players_more_up_to_a_maximum():
+    engine = new_engine(TERMINAL_RULES, cash=100000)
+    assert engine.upgrade_trade_book() == 50000
+    assert engine.upgrade_trade_book() == 30000  # 50000 left: no longer rich
+    engine.player.portfolio_capacity = 140
+    with pytest.raises(GameError):
+        engine.upgrade_trade_book()
+    assert new_engine(cash=100000).upgrade_trade_book() == 30000
+
+def test_terminal_darkweb_charges_a_fee_for_a_small_reward():
+    engine = new_engine(TERMINAL_RULES, cash=20)
+    reward, health_penalty = engine.visit_darkweb()
+    assert 1 <= reward <= 10 and health_penalty == 0
+    assert engine.player.cash == 20 - 15 + reward
+    assert engine.player.health == 100
+    with pytest.raises(GameError):
+        new_engine(TERMINAL_RULES, cash=14).visit_darkweb()
+
+def test_broker_rebate_only_under_terminal_rules():
+    engine = new_engine(TERMINAL_RULES, debt=0, cash=5000)
+    assert engine.collect_broker_rebate() == 1000
+    assert engine.player.cash == 6000
+    with pytest.raises(GameError):
+        new_engine(TERMINAL_RULES, debt=100, cash=5000).collect_broker_rebate()
+    with pytest.raises(GameError):
+        new_engine(debt=0, cash=5000).collect_broker_rebate()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the compiled event tables: they must fire each event with the
+probability of the original per-event rolls (each event tried in order
+with ``randint(0, draw_range - 1) % freq == 0``), and be deterministic
+for a given seed.
+"""
+
+import itertools
+import random
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from game.engine import GameEngine
+from game.events import EventManager
+from game.rng import GameRNG
+
+def legacy_pick(rng: random.Random, events, draw_range: int, eligible=None):
+    """Pick an event like the original handlers: roll each event in order."""
+    for index, event in enumerate(events):
+        if rng.randint(0, draw_range - 1) % event["freq"] == 0:
+            if eligible is not None and not eligible[index]:
+                continue
+            return index
+    return None
+
+def chain_probabilities(freqs, draw_range: int, eligible=None):
+    """Exact probability of each event of the original per-event chain, as fractions."""
+    probabilities = []
+    none_fired = Fraction(1)
+    for index, freq in enumerate(freqs):
+        fires = Fraction(sum(1 for r in range(draw_range) if r % freq == 0), draw_range)
+        if eligible is not None and not eligible[index]:
+            fires = Fraction(0)
+        probabilities.append(none_fired * fires)
+        none_fired *= 1 - fires
+    return probabilities
+
+def all_tables():
+    """Every table with every eligibility mask the game can use."""
+    tables = [(EventManager.health_table, None), (EventManager.money_table, None),
+              (EventManager.hacker_table, None)]
+    stock_ids = EventManager._market_stock_ids
+    for available in itertools.product((False, True), repeat=max(stock_ids) + 1):
+        tables.append((EventManager.market_table, tuple(available[s] for s in stock_ids)))
+    return tables
+
+def test_firing_probabilities_match_the_per_event_chain():
+    for table, mask in all_tables():
+        exact = chain_probabilities(table.freqs, table.draw_range, mask)
+        assert table.event_probabilities(mask).tolist() == pytest.approx([float(p) for p in exact],
+                                                                        rel=0, abs=1e-15)
+
+        # Every boundary of the cumulative table is the exact chance that one of
+        # the events so far fires, so a draw picks each event with its exact odds
+        cumulative = list(itertools.accumulate(exact))
+        assert table.cumulative(mask) == pytest.approx([float(c) for c in cumulative], rel=0, abs=1e-15)
+
+def test_single_event_firing_odds_are_exact():
+    for table in (EventManager.market_table, EventManager.health_table, EventManager.money_table):
+        for freq, probability in zip(table.freqs, table.probabilities):
+            # The nearest float to the exact fraction
+            exact = Fraction(sum(1 for r in range(table.draw_range) if r % freq == 0), table.draw_range)
+            assert probability == float(exact)
+
+def test_picks_follow_the_original_frequencies():
+    rng = random.Random(1)
+    np_rng = np.random.default_rng(1)
+    samples = 50000
+    for events, table in ((EventManager.market_events, EventManager.market_table),
+                          (EventManager.health_events, EventManager.health_table),
+                          (EventManager.money_events, EventManager.money_table)):
+        legacy = np.zeros(len(events) + 1)
+        for _ in range(samples):
+            index = legacy_pick(rng, events, table.draw_range)
+            legacy[len(events) if index is None else index] += 1
+
+        picks = table.pick_batch(np_rng.random(samples))
+        compiled = np.bincount(np.where(picks < 0, len(events), picks), minlength=len(events) + 1)
+
+        p = (legacy + compiled) / (2 * samples)
+        stderr = np.sqrt(np.maximum(p * (1 - p), 1e-12) * 2 / samples)
+        assert (np.abs(legacy - compiled) / samples / stderr).max() < 5
+
+def test_picks_are_deterministic_for_a_seed():
+    table = EventManager.market_table
+    mask = tuple(index % 3 != 0 for index in range(len(table)))
+    first, second = random.Random(99), random.Random(99)
+    assert [table.pick(first.random(), mask) for _ in range(1000)] == \
+           [table.pick(second.random(), mask) for _ in range(1000)]
+
+    batches = [EventManager().roll_batch(np.random.default_rng(7), 500) for _ in range(2)]
+    for category in batches[0]:
+        assert np.array_equal(batches[0][category], batches[1][category])
+
+def test_games_with_the_same_seed_get_the_same_events():
+    news = []
+    for _ in range(2):
+        engine = GameEngine(rng=GameRNG(2024))
+        engine.enable_hacker_actions()
+        engine.deposit(1000)
+        news.append([engine.advance_day().news_reports for _ in range(39)])
+    assert news[0] == news[1]
+    assert any(news[0])
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the delta game state responses served by several workers.
+"""
+
+import json
+import multiprocessing
+
+import pytest
+
+import server.game_state as game_state_module
+from game.log_writer import get_log_writer
+from server.game_state import (create_new_game, get_game_engine, get_game_state_data,
+                               get_game_state_response, save_game_state)
+from server.store import MemoryGameStore
+
+@pytest.fixture
+def game_state(tmp_path, monkeypatch):
+    """A new game in a fresh in-memory store, logging under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(game_state_module, "game_store", MemoryGameStore())
+    yield create_new_game("Tester", seed=7)
+    get_log_writer().flush(5.0)
+
+def serve(connection) -> None:
+    """Worker process: answer (game state, since) requests until None is received."""
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        connection.send(get_game_state_response(*request))
+
+class Worker:
+    """A forked worker process with its own record of the payloads it sent."""
+
+    def __init__(self, context):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=serve, args=(child,))
+        self.process.start()
+
+    def respond(self, game_state, since):
+        self.connection.send((game_state, since))
+        return self.connection.recv()
+
+    def stop(self):
+        self.connection.send(None)
+        self.process.join(5)
+
+def apply_response(client, response):
+    """Apply a full or delta response like the web client (static/js/app.js)."""
+    if 'delta' not in response:
+        return dict(response)
+    assert client is not None and response['since'] == client['version']
+    merged = dict(client, **response['delta'])
+    for key in response['removed']:
+        del merged[key]
+    merged['version'] = response['version']
+    return merged
+
+def comparable(payload):
+    """Game state fields of a payload, without the headline drawn for each payload."""
+    fields = {key: value for key, value in payload.items() if key not in ('version', 'headline')}
+    return json.loads(json.dumps(fields, default=str))
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_delta_responses_alternating_between_workers(game_state):
+    context = multiprocessing.get_context("fork")
+    workers = [Worker(context), Worker(context)]
+    engine = get_game_engine(game_state)
+    client = None
+    try:
+        for request in range(8):
+            since = client['version'] if client else None
+            client = apply_response(client, workers[request % 2].respond(game_state, since))
+            assert comparable(client) == comparable(get_game_state_data(game_state))
+
+            # Buy a share, then sell it back: every other payload is the same
+            stock_id = engine.stock_manager.get_available_stocks()[0][0]
+            if request % 2:
+                engine.sell(stock_id, 1)
+            else:
+                engine.buy(stock_id, 1)
+            save_game_state(game_state)
+    finally:
+        for worker in workers:
+            worker.stop()
+
+def test_delta_response_from_same_worker(game_state):
+    first = get_game_state_response(game_state)
+    game_state['player'].cash += 100
+    second = get_game_state_response(game_state, first['version'])
+
+    assert second['since'] == first['version']
+    assert second['version'] != first['version']
+    assert second['delta']['player']['cash'] == first['player']['cash'] + 100
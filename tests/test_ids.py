@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for game ID allocation and game tokens.
+"""
+
+import threading
+
+import pytest
+
+from game.player import Player
+from server import ids
+from server.ids import (MAX_SEQUENCE, TOKEN_SEPARATOR, GameIdAllocator, key_matches, new_game_id,
+                        new_token, split_key)
+from server.store import MemoryGameStore
+
+def test_ids_are_unique_across_threads_and_nodes():
+    allocators = [GameIdAllocator(node) for node in (0, 1)]
+    allocated = []
+    lock = threading.Lock()
+
+    def allocate(allocator):
+        batch = [allocator.next_id() for _ in range(2000)]
+        with lock:
+            allocated.extend(batch)
+
+    threads = [threading.Thread(target=allocate, args=(allocator,)) for allocator in allocators * 4]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(allocated)) == len(allocated) == 8 * 2000
+    assert all(0 < game_id < 1 << 63 for game_id in allocated)
+
+def test_ids_keep_increasing_when_the_clock_stalls_or_goes_back(monkeypatch):
+    allocator = GameIdAllocator(3)
+    clock = [1800000000.0]
+    monkeypatch.setattr(ids.time, "time", lambda: clock[0])
+    allocated = [allocator.next_id() for _ in range(MAX_SEQUENCE + 10)]  # More than one millisecond holds
+    clock[0] -= 60
+    allocated += [allocator.next_id() for _ in range(10)]
+    assert allocated == sorted(allocated) and len(set(allocated)) == len(allocated)
+
+def test_node_must_fit_in_the_id():
+    with pytest.raises(ValueError):
+        GameIdAllocator(1024)
+
+def test_token_carries_its_game_id():
+    game_id = new_game_id()
+    token = new_token(game_id)
+    assert split_key(token) == (game_id, True)
+    assert split_key(game_id) == (game_id, False)
+    assert key_matches(token, token) and key_matches(game_id, token)
+    assert new_token(game_id) != token
+
+def test_tampered_token_is_rejected():
+    store = MemoryGameStore()
+    game_id = new_game_id()
+    token = new_token(game_id)
+    store.put({'game_id': game_id, 'token': token, 'player': Player()})
+
+    secret = token.partition(TOKEN_SEPARATOR)[2]
+    tampered = [
+        token[:-1] + ("A" if token[-1] != "A" else "B"),  # Secret changed
+        token + "x",
+        game_id + TOKEN_SEPARATOR,  # Secret left out
+        new_token(game_id),  # Another secret for the same game
+    ]
+    for key in tampered:
+        assert not key_matches(key, token)
+        assert store.get(key) is None
+    assert store.get(token)['token'] == token
+    assert store.get(new_game_id() + TOKEN_SEPARATOR + secret) is None  # Right secret, other game
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for saving and decoding game journals.
+"""
+
+import pytest
+
+from game.journal import ActionJournal, ReplayError, replay
+from game.log_writer import get_log_writer
+from game.logger import GameLogger
+from game.rng import GameRNG
+
+def played_journal(seed: int = 11) -> ActionJournal:
+    """Journal of a game played a few days."""
+    journal = ActionJournal.for_game(GameRNG(seed), "Journal")
+    journal.record("N")
+    journal.record("D", 100)
+    journal.record("N")
+    return journal
+
+def test_saved_journal_replaces_the_earlier_one(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    logger = GameLogger("Journal")
+    journal = played_journal()
+    logger.save_journal(journal)
+    journal.record("N")
+    logger.save_journal(journal)
+    get_log_writer().flush(5.0)
+
+    loaded = ActionJournal.load(logger.log_file.replace('.log', '_journal.jsonl'))
+    assert loaded.actions == journal.actions
+    assert replay(loaded).player.days_left == 37
+
+@pytest.mark.parametrize("line", [
+    '{"format":1,"seed":5,"player":"Other"}',  # Another journal appended
+    '["Z",1]',
+    '[]',
+    '"N"',
+    'not json',
+])
+def test_decode_rejects_lines_that_are_not_actions(line):
+    text = played_journal().encode() + line + "\n"
+    with pytest.raises(ReplayError):
+        ActionJournal.decode(text)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the recovery of games from the journaled store's log.
+"""
+
+import os
+
+import pytest
+
+import server.game_state as game_state_module
+from game.log_writer import get_log_writer
+from server.game_state import create_new_game, get_game_engine, save_game_state
+from server.store import JournaledGameStore
+
+@pytest.fixture
+def directory(tmp_path, monkeypatch):
+    """Directory of the store's log, with the game logs written under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    yield str(tmp_path / "game_data")
+    get_log_writer().flush(5.0)
+
+def open_store(directory, monkeypatch):
+    """Open a journaled store writing through, and make it the server's store."""
+    store = JournaledGameStore(directory, batch_size=1, flush_interval=3600)
+    monkeypatch.setattr(game_state_module, "game_store", store)
+    return store
+
+def summary(game_state):
+    """Fields of a game that its replayed actions change."""
+    player = game_state['player']
+    return (player.days_left, player.cash, player.bank_savings, list(player.portfolio.quantities),
+            player.portfolio.value, list(game_state['journal'].actions))
+
+def act(game_state, action, *args):
+    """Apply an engine action to a stored game and save it."""
+    result = getattr(get_game_engine(game_state), action)(*args)
+    save_game_state(game_state)
+    return result
+
+def played_game():
+    """A game on its second day (snapshotted), with actions logged after the snapshot."""
+    game_state = create_new_game("Journaled", seed=21)
+    act(game_state, "advance_day")
+    stock_id = game_state['stock_manager'].get_available_stocks()[0][0]
+    act(game_state, "buy", stock_id, 3)
+    act(game_state, "deposit", 100)
+    return game_state, stock_id
+
+def test_recovers_snapshot_and_later_actions(directory, monkeypatch):
+    store = open_store(directory, monkeypatch)
+    game_state, _ = played_game()
+    expected = summary(game_state)
+    store.close()
+
+    store = open_store(directory, monkeypatch)
+    assert store.recovered == 1
+    restored = store.get(game_state['token'])
+    assert restored is not None and restored is not game_state
+    assert summary(restored) == expected
+    assert store.restores == 1
+
+    # The restored game goes on, and is logged from where it was
+    act(restored, "withdraw", 50)
+    expected = summary(restored)
+    store.close()
+    store = open_store(directory, monkeypatch)
+    assert summary(store.get(game_state['game_id'])) == expected
+    store.close()
+
+def test_torn_last_record_is_dropped(directory, monkeypatch):
+    store = open_store(directory, monkeypatch)
+    game_state, stock_id = played_game()
+    expected = summary(game_state)
+    act(game_state, "sell", stock_id, 1)  # Last record, torn below
+    store.close()
+
+    path = os.path.join(directory, JournaledGameStore.LOG_FILE)
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.truncate(size - 3)
+
+    store = open_store(directory, monkeypatch)
+    restored = store.get(game_state['token'])
+    assert summary(restored) == expected
+    assert os.path.getsize(path) < size - 3  # The torn record is gone from the log
+
+    # Records appended after the recovery are read back
+    act(restored, "withdraw", 50)
+    expected = summary(restored)
+    store.close()
+    store = open_store(directory, monkeypatch)
+    assert summary(store.get(game_state['token'])) == expected
+    store.close()
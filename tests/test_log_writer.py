@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the background log writer.
+"""
+
+import threading
+
+from game.log_writer import LogWriter
+
+def run_with_timeout(function, timeout: float = 5.0) -> None:
+    """Run a function in a thread and fail if it blocks."""
+    thread = threading.Thread(target=function, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "blocked"
+
+def test_bad_line_does_not_stop_the_writer(tmp_path, capsys):
+    writer = LogWriter(flush_interval=0.01)
+    path = str(tmp_path / "game.log")
+
+    writer.submit(path, "before")
+    assert writer.flush(5.0)
+    writer.submit(path, 12345)  # Not text, the batch fails to write
+    writer.submit(path, "bad timestamp", timestamp="noon")
+    assert writer.flush(5.0)
+    writer.submit(path, "after")
+    assert writer.flush(5.0)
+
+    assert writer._thread.is_alive()
+    assert writer.errors >= 1
+    assert "Game log writer" in capsys.readouterr().err
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[0] == "before" and lines[-1] == "after"
+
+
+class StoppedWriter(LogWriter):
+    """Log writer whose thread stops at once, like a thread killed by an error."""
+
+    def _run(self) -> None:
+        return
+
+
+def test_submit_and_flush_write_directly_without_thread(tmp_path):
+    writer = StoppedWriter(max_pending=2, flush_interval=0.01)
+    writer._thread.join(5.0)
+    path = str(tmp_path / "game.log")
+
+    def log():
+        for number in range(10):
+            writer.submit(path, f"line {number}")
+        assert writer.flush()
+
+    run_with_timeout(log)
+    with open(path, encoding="utf-8") as f:
+        assert f.read().splitlines() == [f"line {number}" for number in range(10)]
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the files written by the game logger.
+"""
+
+import json
+
+import pytest
+
+from game.log_writer import get_log_writer
+from game.logger import GameLogger
+from game.player import Player
+
+@pytest.fixture
+def logger(tmp_path, monkeypatch):
+    """A game logger writing under tmp_path (named apart from the other tests' games,
+    whose files the shared writer may still hold open under the same relative path)."""
+    monkeypatch.chdir(tmp_path)
+    yield GameLogger("Logged")
+    get_log_writer().flush(5.0)
+
+def test_stats_file_is_replaced_when_the_game_ends_again(logger):
+    player = Player(name="Logged")
+    logger.log_player_status(player)
+    logger.log_game_end(player, "HEALTH_ZERO", 100)
+    logger.log_game_end(player, "HEALTH_ZERO", 200)
+
+    stats_file = logger.log_file.replace('.log', '_stats.json')
+    with open(stats_file, encoding="utf-8") as f:
+        stats = json.load(f)  # One JSON document, not two appended
+    assert stats["end_data"]["final_score"] == 200
+    events = [entry["event_type"] for entry in stats["actions_log"]]
+    assert events[0] == "GAME_START" and events.count("GAME_END") == 2
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the lot ledger of the player's portfolio.
+"""
+
+import random
+from collections import deque
+
+import pytest
+
+from game.player import AVERAGE, FIFO, LIFO, Portfolio
+
+@pytest.mark.parametrize("method", [FIFO, LIFO])
+def test_sales_take_shares_like_a_queue_or_stack(method):
+    rng = random.Random(method)
+    portfolio = Portfolio()
+    shares = deque()  # Reference model: the purchase price of every share, oldest first
+    for day in range(200):
+        if shares and rng.random() < 0.4:
+            quantity = rng.randint(1, len(shares))
+            expected = sum(shares.popleft() if method == FIFO else shares.pop() for _ in range(quantity))
+            assert portfolio.remove(0, quantity, method, price=50) == expected
+        else:
+            price = rng.randint(1, 100)
+            quantity = rng.randint(1, 20)
+            portfolio.add(0, quantity, price, day)
+            shares.extend([price] * quantity)
+        assert portfolio.quantity(0) == len(shares)
+        assert portfolio.costs[0] == sum(shares)
+        assert sum(lot["quantity"] for lot in portfolio.get_lots(0)) == len(shares)
+
+def test_average_cost_pools_the_lots():
+    portfolio = Portfolio()
+    portfolio.add(1, 10, 10, day=1)
+    portfolio.add(1, 10, 20, day=2)
+    assert portfolio.remove(1, 5, AVERAGE, price=30) == 75
+    assert portfolio.get_lots(1) == [{"quantity": 15, "price": 15, "cost": 225, "day": 1,
+                                      "realized": 75, "unrealized": None}]
+    assert portfolio.realized_pnl(1) == 75
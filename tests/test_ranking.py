@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the ranked index behind the leaderboard.
+"""
+
+import random
+from bisect import bisect_left, insort
+
+import pytest
+
+from game.ranking import RankedIndex, RankedScores
+
+@pytest.mark.parametrize("load", [1, 4, 512])
+def test_ranked_index_matches_a_sorted_list(load):
+    rng = random.Random(load)
+    index = RankedIndex(load=load)
+    reference = []
+    for _ in range(3000):
+        item = (rng.randint(0, 200), rng.random())
+        # Position of the new item among equal items: before them, like bisect_left
+        expected = bisect_left(reference, item)
+        insort(reference, item)
+        assert index.insert(item) == expected
+        assert len(index) == len(reference)
+
+        value = (rng.randint(-5, 205),)
+        assert index.position(value) == bisect_left(reference, value)
+        start = rng.randint(-3, len(reference) + 3)
+        stop = start + rng.randint(0, 40)
+        assert index.slice(start, stop) == reference[max(start, 0):max(stop, 0)]
+    assert index.slice(0, len(reference)) == reference
+
+def test_ranked_scores_pages_share_ranks_of_equal_scores():
+    rng = random.Random(5)
+    ranking = RankedScores()
+    scores = []
+    for number in range(500):
+        score = rng.randint(0, 50)
+        scores.append(score)
+        ranking.add({"name": f"P{number}", "score": score, "health": 100, "fame": 0})
+    ordered = sorted(scores, reverse=True)
+    for offset in range(0, 520, 7):
+        page = ranking.page(offset, 7)
+        assert [entry["score"] for entry in page] == ordered[offset:offset + 7]
+        for entry in page:
+            assert entry["rank"] == sum(1 for score in scores if score > entry["score"]) + 1
+    assert ranking.rank_of(51) == 1
+    assert ranking.rank_of(-1) == len(scores) + 1
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the game API routes.
+"""
+
+import pytest
+
+from game.logger import GameLogger
+from server.game_state import get_game_state
+from server.leaderboard import get_leaderboard
+from server.routes import MAX_ORDER_LEGS, MAX_SCORES_LIMIT
+
+from .conftest import start_game
+
+def test_next_day_on_finished_game_is_rejected(client, monkeypatch):
+    token = start_game(client)
+    game_state = get_game_state(token)
+    game_state['player'].days_left = 1
+
+    ends = []
+    original = GameLogger.log_game_end
+    monkeypatch.setattr(GameLogger, "log_game_end", lambda self, *args: (ends.append(args), original(self, *args)))
+    journals = []
+    original_journal = GameLogger.save_journal
+    monkeypatch.setattr(GameLogger, "save_journal", lambda self, *args: (journals.append(args), original_journal(self, *args)))
+
+    response = client.post(f"/api/game/{token}/next_day")
+    assert response.status_code == 200
+    assert response.get_json()["game_over_reason"] == "DAYS_OVER"
+    assert get_leaderboard().count() == 1
+
+    response = client.post(f"/api/game/{token}/next_day")
+    assert response.status_code == 400
+    assert get_leaderboard().count() == 1
+    assert len(ends) == 1 and len(journals) == 1
+    assert game_state['player'].days_left == 0
+    assert [action[0] for action in game_state['journal'].actions].count("E") == 1
+
+def orders_game(client):
+    """A new game with two tradable stocks, returning (token, game state, [(stock_id, price), ...])."""
+    token = start_game(client)
+    game_state = get_game_state(token)
+    stocks = [(stock_id, price) for stock_id, _, _, price in game_state['stock_manager'].get_available_stocks()
+              if price > 0]
+    return token, game_state, stocks[:2]
+
+def holdings(game_state):
+    """Cash and shares held, to check that a refused batch changed nothing."""
+    player = game_state['player']
+    return player.cash, player.portfolio_used, dict((stock_id, info['quantity']) for stock_id, info in player.portfolio.items())
+
+def test_orders_refused_leg_trades_nothing(client):
+    token, game_state, [(first, first_price), (second, _)] = orders_game(client)
+    game_state['player'].cash = first_price * 2
+    before = holdings(game_state)
+    journal_length = len(game_state['journal'])
+
+    response = client.post(f"/api/game/{token}/orders", json={"orders": [
+        {"action": "buy", "stock_id": first, "amount": 2},
+        {"action": "buy", "stock_id": second, "amount": 1},  # No cash left for it
+    ]})
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("Order 2:")
+    assert holdings(game_state) == before
+    assert len(game_state['journal']) == journal_length
+
+def test_orders_sales_pay_for_later_purchases(client):
+    token, game_state, stocks = orders_game(client)
+    # Sell a share of the pricier stock to pay for one of the other
+    (first, first_price), (second, second_price) = sorted(stocks, key=lambda stock: -stock[1])
+    player = game_state['player']
+    amount = 1
+    player.cash = first_price * amount
+    response = client.post(f"/api/game/{token}/buy", json={"stock_id": first, "amount": amount})
+    assert response.status_code == 200 and player.cash == 0
+
+    buy_first = [{"action": "buy", "stock_id": second, "amount": 1},
+                 {"action": "sell", "stock_id": first, "amount": amount}]
+    response = client.post(f"/api/game/{token}/orders", json={"orders": buy_first})
+    assert response.status_code == 400
+
+    response = client.post(f"/api/game/{token}/orders", json={"orders": buy_first[::-1]})
+    assert response.status_code == 200
+    filled = response.get_json()["orders"]
+    assert [(leg["action"], leg["stock_id"]) for leg in filled] == [("sell", first), ("buy", second)]
+    assert holdings(game_state) == (first_price * amount - second_price, 1, {second: 1})
+
+def test_orders_respect_trade_book_capacity(client):
+    token, game_state, [(first, first_price), (second, second_price)] = orders_game(client)
+    player = game_state['player']
+    player.cash = (first_price + second_price) * player.portfolio_capacity
+    space = player.portfolio_capacity - player.portfolio_used
+    before = holdings(game_state)
+
+    response = client.post(f"/api/game/{token}/orders", json={"orders": [
+        {"action": "buy", "stock_id": first, "amount": space},
+        {"action": "buy", "stock_id": second, "amount": 1},
+    ]})
+    assert response.status_code == 400
+    assert holdings(game_state) == before
+
+    # Selling frees the space for a later purchase of the same batch
+    response = client.post(f"/api/game/{token}/orders", json={"orders": [
+        {"action": "buy", "stock_id": first, "amount": space},
+        {"action": "sell", "stock_id": first, "amount": 1},
+        {"action": "buy", "stock_id": second, "amount": 1},
+    ]})
+    assert response.status_code == 200
+    assert player.portfolio_used == player.portfolio_capacity
+
+def test_orders_batch_size_is_limited(client):
+    token, game_state, [(first, _), _] = orders_game(client)
+    legs = [{"action": "buy", "stock_id": first, "amount": 1}] * (MAX_ORDER_LEGS + 1)
+    response = client.post(f"/api/game/{token}/orders", json={"orders": legs})
+    assert response.status_code == 400
+    assert client.post(f"/api/game/{token}/orders", json={"orders": []}).status_code == 400
+
+def add_scores(scores):
+    """Record final scores on the leaderboard of the app."""
+    leaderboard = get_leaderboard()
+    for number, score in enumerate(scores):
+        leaderboard.add_score(f"P{number}", score, 100, 0)
+
+def test_high_scores_pages(client):
+    scores = [500, 100, 300, 300, 200, 400]
+    add_scores(scores)
+
+    response = client.get("/api/high_scores?window=all&offset=1&limit=3")
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == str(len(scores))
+    assert [(entry["rank"], entry["score"]) for entry in response.get_json()] == [(2, 400), (3, 300), (3, 300)]
+
+    # Scores recorded today are in the daily and weekly rankings too
+    for window in ("daily", "weekly"):
+        response = client.get(f"/api/high_scores?window={window}")
+        assert [entry["score"] for entry in response.get_json()] == sorted(scores, reverse=True)
+    response = client.get("/api/high_scores?offset=10")
+    assert response.get_json() == [] and response.headers["X-Total-Count"] == str(len(scores))
+
+@pytest.mark.parametrize("query", ["window=monthly", "offset=-1", "limit=0", f"limit={MAX_SCORES_LIMIT + 1}"])
+def test_high_scores_rejects_bad_pages(client, query):
+    assert client.get(f"/api/high_scores?{query}").status_code == 400
+
+def test_high_score_rank(client):
+    add_scores([500, 300, 300, 100])
+    response = client.get("/api/high_scores/rank?score=300&window=weekly")
+    assert response.status_code == 200
+    assert response.get_json() == {"window": "weekly", "score": 300, "rank": 2, "total": 4}
+    assert client.get("/api/high_scores/rank?score=1000").get_json()["rank"] == 1
+
+    assert client.get("/api/high_scores/rank").status_code == 400
+    assert client.get("/api/high_scores/rank?score=high").status_code == 400
+    assert client.get("/api/high_scores/rank?score=300&window=monthly").status_code == 400
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the reproducibility of batch simulations.
+"""
+
+import pytest
+
+from game.simulate import run_simulation
+
+@pytest.mark.parametrize("strategy", ["random", "bargain"])
+def test_seeded_simulation_does_not_depend_on_workers(strategy):
+    # Batches of 7 games: the last batch is partial
+    expected = run_simulation(30, strategy, workers=1, seed=2024, batch_size=7)
+    assert expected["games"] == 30
+    assert run_simulation(30, strategy, workers=1, seed=2024, batch_size=7) == expected
+    for workers in (2, 3):
+        assert run_simulation(30, strategy, workers=workers, seed=2024, batch_size=7) == expected
+    assert run_simulation(30, strategy, workers=1, seed=2025, batch_size=7) != expected
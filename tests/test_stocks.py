@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the stock manager's views on the shared ticker catalog.
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from game.stocks import STOCK_DEFINITIONS, StockManager
+
+def test_stock_types_are_built_once_and_read_only():
+    manager = StockManager(np.random.default_rng(3))
+    stock_types = manager.stock_types
+    assert manager.stock_types is stock_types
+    assert manager.stock_types[0] is stock_types[0]
+    assert [stock.ticker for stock in stock_types.values()] == [ticker for _, ticker, _, _, _ in STOCK_DEFINITIONS]
+    with pytest.raises(TypeError):
+        stock_types[0] = None
+
+    # The views follow the game's prices
+    manager.update_prices()
+    assert stock_types[4].current_price == manager.get_market_price(4)
+    stock_types[4].current_price = 4321
+    assert manager.get_market_price(4) == 4321
+
+def test_stock_types_after_unpickling():
+    manager = StockManager(np.random.default_rng(3))
+    manager.stock_types
+    restored = pickle.loads(pickle.dumps(manager))
+    assert [stock.current_price for stock in restored.stock_types.values()] == \
+           [stock.current_price for stock in manager.stock_types.values()]
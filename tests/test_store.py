@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the game stores shared by several worker processes.
+"""
+
+import time
+
+import pytest
+
+from game.player import Player
+from server import eviction
+from server.ids import GameIdAllocator, new_token
+from server.store import SQLiteGameStore, StaleGameError, create_store
+
+def new_game_state(name: str = "Tester"):
+    """Create a minimal game state that the stores can cache and serialize."""
+    game_id = str(GameIdAllocator().next_id())
+    return {'game_id': game_id, 'token': new_token(game_id), 'player': Player(name=name)}
+
+def open_store(path):
+    """Open a write-through SQLite store, like the stores of the workers."""
+    return SQLiteGameStore(str(path), batch_size=1, flush_interval=3600)
+
+def test_sqlite_version_comes_from_database(tmp_path):
+    path = tmp_path / "games.db"
+    first, second = open_store(path), open_store(path)
+    try:
+        game_state = new_game_state()
+        first.put(game_state)
+
+        # The second worker changes the game twice
+        loaded = second.get(game_state['token'])
+        loaded['player'].cash = 1500
+        second.put(loaded)
+        loaded['player'].cash = 1200
+        second.put(loaded)
+
+        # The first worker dropped the game from its cache: it loads the
+        # second worker's version and its write gets a newer one
+        first._cache.clear()
+        reloaded = first.get(game_state['token'])
+        assert reloaded['player'].cash == 1200
+        reloaded['player'].cash = 900
+        first.put(reloaded)
+
+        assert first._cache[game_state['game_id']][0] == 4
+        assert second.get(game_state['token'])['player'].cash == 900
+    finally:
+        first.close()
+        second.close()
+
+def test_sqlite_stale_write_is_rejected(tmp_path):
+    path = tmp_path / "games.db"
+    first, second = open_store(path), open_store(path)
+    try:
+        game_state = new_game_state()
+        first.put(game_state)
+        first_copy = first.get(game_state['game_id'])
+        second_copy = second.get(game_state['game_id'])
+
+        # Both workers change the same version: the later write is refused
+        first_copy['player'].cash = 100
+        first.put(first_copy)
+        second_copy['player'].cash = 200
+        with pytest.raises(StaleGameError):
+            second.put(second_copy)
+        assert second.metrics()['conflicts'] == 1
+
+        # Even once the game left the cache, the stale copy cannot overwrite it
+        second._cache.clear()
+        with pytest.raises(StaleGameError):
+            second.put(second_copy)
+
+        # The second worker reloads the first worker's change and builds on it
+        reloaded = second.get(game_state['token'])
+        assert reloaded['player'].cash == 100
+        reloaded['player'].cash += 50
+        second.put(reloaded)
+        assert first.get(game_state['game_id'])['player'].cash == 150
+
+        # A game ID is only inserted once
+        with pytest.raises(StaleGameError):
+            second.put(dict(new_game_state(), game_id=game_state['game_id']))
+    finally:
+        first.close()
+        second.close()
+
+def test_memory_store_evicts_nothing_unless_configured(monkeypatch):
+    # Evicted in-memory games are lost, so they stay until a TTL is set
+    store = create_store("memory://")
+    game_state = new_game_state()
+    store.put(game_state)
+    later = time.monotonic() + 30 * 24 * 3600
+    monkeypatch.setattr(eviction.time, "monotonic", lambda: later)
+    assert store.residency.expired() == []
+    assert store.get(game_state['token']) is game_state
+
+    store = create_store("memory://?idle_ttl=60&finished_ttl=none")
+    assert (store.residency.idle_ttl, store.residency.finished_ttl) == (60, None)
@@ -27,6 +27,9 @@ from game.darkweb import Darkweb
 from game.broker import Broker
 from game.high_scores import HighScores
 from game.logger import GameLogger
+from game.engine import TERMINAL_RULES, GameEngine
+from game.rng import GameRNG
+from game.trade_menu import buy_stocks, sell_stocks, show_final_sales
 
 def main():
     """Main game function that initializes and runs the game."""
@@ -50,15 +53,18 @@ def main():
         
         break
     
+    # Each game draws from its own random streams
+    rng = GameRNG()
+    
     # Initialize game components
     player = Player(name=player_name)
-    stock_manager = StockManager()
+    stock_manager = StockManager(rng.prices)
     day_manager = DayManager()
-    event_manager = EventManager()
+    event_manager = EventManager(rng.events)
     bank = Bank()
     hospital = Hospital()
     trading_app = TradingApp()
-    darkweb = Darkweb()
+    darkweb = Darkweb(rng.darkweb)
     broker = Broker()
     high_scores = HighScores()
     
@@ -66,6 +72,11 @@ def main():
     logger = GameLogger(player_name)
     logger.log_player_status(player)
     
+    # The engine applies the game rules, with the terminal's own economy;
+    # this loop only handles the screens
+    engine = GameEngine(player, stock_manager, event_manager, bank, logger, high_scores, rng,
+                        rules=TERMINAL_RULES)
+    
     # Show story if player wants (with player status)
     if ui.ask_yes_no("View game backstory?"):
         ui.show_story(player, stock_manager, day_manager)
@@ -87,98 +98,46 @@ def main():
         
         if choice == "next_day":
             # Handle next day
-            player.days_left -= 1
-            
-            # Log travel event
-            logger.log_next_day(player, stock_manager)
-            
-            # Update stock prices
-            stock_manager.update_prices()
-            
-            # Handle random events and show news reports
-            news_reports = event_manager.handle_events(player, stock_manager)
+            day = engine.advance_day()
             
-            # Add debt collector visit in the last 10 days if player has debt
-            if player.days_left <= 10 and player.debt > 0:
-                debt_collector_report = f"A debt collector visits you, demanding payment. The stress affects your mental health. (-10 health)"
-                player.health = max(0, player.health - 10)
-                if not news_reports:
-                    news_reports = [debt_collector_report]
-                else:
-                    news_reports.append(debt_collector_report)
-                
-                # Log debt collector event
-                logger.log_random_event("Debt Collector", debt_collector_report, {})
-            
-            if news_reports:
-                ui.show_news_reports(news_reports, player, stock_manager, day_manager)
-                
-                # Log random events
-                for report in news_reports:
-                    if "debt collector" not in report.lower():  # Skip logging debt collector again
-                        logger.log_random_event("Random Event", report, {})
-            
-            # Update bank interest and debt
-            bank.update_interest(player)
-            
-            # Calculate net worth and profit
-            current_net_worth = player.cash + player.bank_savings - player.debt
-            
-            # Calculate portfolio value
-            portfolio_value = 0
-            for stock_id, stock_info in player.portfolio.items():
-                # Find current market price
-                for market_stock_id, _, _, price in stock_manager.get_available_stocks():
-                    if market_stock_id == stock_id:
-                        portfolio_value += price * stock_info['quantity']
-                        break
-            
-            total_assets = current_net_worth + portfolio_value
-            
-            # Calculate profit (simplified)
-            profit = total_assets - 2000 + 5000  # Starting cash was $2000, debt was $5000
-            
-            # Calculate tax (45% of profit, only if profit is positive)
-            tax = round(max(0, profit * 0.45))
+            if day.news_reports:
+                ui.show_news_reports(day.news_reports, player, stock_manager, day_manager)
             
             # Show day summary with profit and tax information
-            if profit > 0:
-                ui.show_message(f"Day {41 - player.days_left} has begun.\n\nYour current net worth: ${current_net_worth}\nPortfolio value: ${portfolio_value}\nTotal assets: ${total_assets}\n\nEstimated profit: ${profit}\nEstimated tax (45%): ${tax}", player, stock_manager, day_manager)
+            if day.profit > 0:
+                ui.show_message(f"Day {41 - player.days_left} has begun.\n\nYour current net worth: ${day.net_worth}\nPortfolio value: ${day.portfolio_value}\nTotal assets: ${day.total_assets}\n\nEstimated profit: ${day.profit}\nEstimated tax (45%): ${day.tax}", player, stock_manager, day_manager)
             else:
-                ui.show_message(f"Day {41 - player.days_left} has begun.\n\nYour current net worth: ${current_net_worth}\nPortfolio value: ${portfolio_value}\nTotal assets: ${total_assets}\n\nYou are currently at a loss of ${-profit}.", player, stock_manager, day_manager)
+                ui.show_message(f"Day {41 - player.days_left} has begun.\n\nYour current net worth: ${day.net_worth}\nPortfolio value: ${day.portfolio_value}\nTotal assets: ${day.total_assets}\n\nYou are currently at a loss of ${-day.profit}.", player, stock_manager, day_manager)
             
             # Show available stocks
             ui.show_available_stocks(stock_manager, player, day_manager)
             
-            # Log player status after next day
-            logger.log_player_status(player, stock_manager)
-            
         elif choice == "buy":
             while True:
-                result = stock_manager.buy_stocks(player, ui, logger, day_manager)
+                result = buy_stocks(engine, ui, day_manager)
                 if result == "exit":
                     break
             
         elif choice == "sell":
             while True:
-                result = stock_manager.sell_stocks(player, ui, logger, day_manager)
+                result = sell_stocks(engine, ui, day_manager)
                 if result == "exit":
                     break
             
         elif choice == "bank":
-            bank.visit(player, ui, logger)
+            bank.visit(engine, ui)
             
         elif choice == "hospital":
-            hospital.visit(player, ui)
+            hospital.visit(engine, ui)
             
         elif choice == "broker":
-            broker.visit(player, ui)
+            broker.visit(engine, ui)
             
         elif choice == "trading_app":
-            trading_app.visit(player, ui)
+            trading_app.visit(engine, ui)
             
         elif choice == "darkweb":
-            darkweb.visit(player, ui)
+            darkweb.visit(engine, ui)
             
         elif choice == "high_scores":
             high_scores.show(ui)
@@ -191,26 +150,18 @@ def main():
                 game_running = False
         
         # Check if game should end
-        if player.days_left <= 0:
+        game_over_reason = engine.game_over_reason()
+        if game_over_reason == "DAYS_OVER":
             ui.show_message("You've completed your 40 days of trading. Time to see your results.", player, stock_manager, day_manager)
-            # Sell all remaining stocks
-            stock_manager.sell_all_stocks(player, ui, logger, day_manager)
-            # Calculate portfolio value
-            portfolio_value = 0
-            for stock_id, stock_info in player.portfolio.items():
-                # Find current market price
-                for market_stock_id, _, _, price in stock_manager.get_available_stocks():
-                    if market_stock_id == stock_id:
-                        portfolio_value += price * stock_info['quantity']
-                        break
-            
-            # Calculate final score and profit
-            final_score = player.cash + player.bank_savings - player.debt
-            total_assets = final_score + portfolio_value
-            profit = total_assets - 2000 + 5000  # Starting cash was $2000, debt was $5000
-            
-            # Calculate tax (45% of profit, only if profit is positive)
-            tax = round(max(0, profit * 0.45))
+            # Sell all remaining stocks, record the score and log the game end
+            game_result = engine.end_game(game_over_reason)
+            show_final_sales(game_result.sales, ui, player, stock_manager, day_manager)
+            
+            final_score = game_result.final_score
+            portfolio_value = game_result.portfolio_value
+            total_assets = game_result.total_assets
+            profit = game_result.profit
+            tax = game_result.tax
             
             if profit > 0:
                 ui.show_message(f"Your final score is: ${final_score}\nPortfolio value: ${portfolio_value}\nTotal assets: ${total_assets}\n\nYour profit: ${profit}\nTax (45%): ${tax}\nNet profit after tax: ${profit - tax}", player, stock_manager, day_manager)
@@ -223,11 +174,7 @@ def main():
                 else:
                     ui.show_message(f"Your final score is: ${final_score}\nPortfolio value: ${portfolio_value}\nTotal assets: ${total_assets}\n\nYou ended with a loss of ${-profit}, but at least you're not in debt!", player, stock_manager, day_manager)
             
-            # Check if it's a high score
-            high_scores.add_score(player.name, final_score, player.health, player.fame)
             high_scores.show(ui)
-            # Log game end
-            logger.log_game_end(player, "DAYS_OVER", final_score, stock_manager)
             
             # Show net worth chart
             ui.show_net_worth_chart(logger.get_net_worth_history())
@@ -235,12 +182,10 @@ def main():
             game_running = False
         
         # Check if player is dead
-        if player.health <= 0:
+        elif game_over_reason == "HEALTH_ZERO":
             ui.show_message("Your health has dropped to 0. Game over!", player, stock_manager, day_manager)
-            # Calculate final score
-            final_score = player.cash + player.bank_savings - player.debt
             # Log game end
-            logger.log_game_end(player, "HEALTH_ZERO", final_score, stock_manager)
+            engine.end_game(game_over_reason)
             
             # Show net worth chart
             ui.show_net_worth_chart(logger.get_net_worth_history())